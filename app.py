@@ -10,6 +10,18 @@ sys.path.append(str(scripts_dir))
 DATA_DIR = Path(__file__).resolve().parent / "data"
 COUNTIES_DIR = DATA_DIR / "counties"
 STATIONS_DIR = DATA_DIR / "stations"
+DATASET_DIR = DATA_DIR / "dataset"
+AGGREGATES_DIR = DATA_DIR / "aggregates"
+DB_PATH = DATA_DIR / "observations.sqlite"
+
+# Forecast engines offered in the sidebar: the pre-trained county models, or
+# a baseline fitted on the fly to the selected series (see time_series)
+TRAINED_MODEL_ENGINE = "Trained model"
+BASELINE_ENGINES = {
+    "Climatology + trend": "climatology_trend",
+    "Climatology + damped trend": "damped_trend",
+    "Seasonal naive": "seasonal_naive",
+}
 
 import streamlit as st
 import pandas as pd
@@ -31,7 +43,12 @@ warnings.simplefilter(action='ignore', category=FutureWarning)
 # Import backend modules
 from ml.ghcnd_fetch import get_ghcnd_stations, get_ghcnd_data_by_station
 from ml.ghcnd_parse import dly_to_dataframe_from_lines
-from ml.time_series import clean_data, predict_time_series, validate_time_series_data
+from ml.time_series import clean_data, predict_time_series, validate_time_series_data, validate_series_bulk, BaselineForecaster
+from ml import spatial_index
+from ml import station_dataset
+from ml import aggregate_store
+from ml import sqlite_store
+from ml.csv_loader import read_station_csv
 
 
 def get_available_elements(df_station, main_only=False):
@@ -102,14 +119,23 @@ def load_county_boundaries():
         st.error(f"Error loading county boundaries: {str(e)}")
         return None
 
+@st.cache_resource(show_spinner=False)
+def load_station_index():
+    """Load the persisted station spatial index (built on first use)."""
+    return spatial_index.load_station_index()
+
 @st.cache_data(show_spinner=False)
 def get_stations_in_county(county_name):
     """Get all stations within a county."""
     try:
-        # Only handle Dallas county now
-        if county_name.upper() != "DALLAS":
-            st.error("Only Dallas County data is available")
-            return None
+        try:
+            # Point-in-polygon lookup through the spatial index
+            return load_station_index().stations_in_county(county_name)
+        except Exception as e:
+            # Without county boundaries or the station list, fall back to the bundled Dallas metadata
+            if county_name.upper() != "DALLAS":
+                st.error(f"Error looking up stations in {county_name} County: {str(e)}")
+                return None
         
         try:
             # Read from the metadata file
@@ -183,13 +209,79 @@ def create_county_map(selected_station_id=None):
 
 @st.cache_data(show_spinner=False)
 def load_dallas_data():
-    """Load Dallas County station data from CSV."""
+    """Load Dallas County station data from the SQLite store, the Parquet dataset, or the combined CSV."""
     try:
-        return pd.read_csv(DATA_DIR / "dallas_stations_data.csv")
+        # The store is skipped when the dataset was written after it (e.g. by a conversion)
+        if sqlite_store.store_is_current(DB_PATH, DATASET_DIR):
+            # Index range scans over (station_id, element, day)
+            station_ids = list(pd.read_csv(DATA_DIR / "dallas_stations_metadata.csv", usecols=["ID"])["ID"])
+            return pd.concat(
+                [
+                    sqlite_store.query_frame(station_ids, element, db_path=DB_PATH).assign(element=element)
+                    for element in ["TMAX", "TMIN"]
+                ],
+                ignore_index=True,
+            )
+        if station_dataset.dataset_exists(DATASET_DIR):
+            # Only the Dallas stations' TMAX/TMIN partitions and the needed columns are read
+            station_ids = pd.read_csv(DATA_DIR / "dallas_stations_metadata.csv", usecols=["ID"])["ID"]
+            return station_dataset.read_station_dataset(
+                DATASET_DIR,
+                station_ids=station_ids,
+                elements=["TMAX", "TMIN"],
+                columns=["DATE", "value", "element"],
+            )
+        return read_station_csv(
+            DATA_DIR / "dallas_stations_data.csv", columns=["DATE", "value", "element"], elements=["TMAX", "TMIN"]
+        )
     except Exception as e:
         st.error(f"Error loading Dallas data: {str(e)}")
         return None
 
+@st.cache_data(show_spinner=False)
+def load_aggregates(station_ids, element):
+    """
+    Load the precomputed monthly series and yearly means of an element for
+    one or more stations. Returns (None, None) when the aggregate store has
+    not been built, so callers fall back to resampling the daily data.
+    """
+    try:
+        if not aggregate_store.aggregates_exist(aggregates_dir=AGGREGATES_DIR):
+            return None, None
+        monthly = aggregate_store.monthly_series(list(station_ids), element, AGGREGATES_DIR)
+        if monthly.empty:
+            return None, None
+        yearly = aggregate_store.yearly_means(list(station_ids), element, AGGREGATES_DIR)
+        return monthly, yearly
+    except Exception as e:
+        st.error(f"Error loading aggregates: {str(e)}")
+        return None, None
+
+@st.cache_data(show_spinner=False)
+def load_validation_report():
+    """
+    Validation report of every station/element series in the monthly
+    aggregates (see validate_series_bulk), or None when the aggregate store
+    has not been built.
+    """
+    try:
+        if not aggregate_store.aggregates_exist(aggregates_dir=AGGREGATES_DIR):
+            return None
+        monthly = aggregate_store.read_aggregates("monthly", aggregates_dir=AGGREGATES_DIR)
+        return validate_series_bulk(monthly.rename(columns={"mean": "value"}))
+    except Exception as e:
+        st.error(f"Error validating station series: {str(e)}")
+        return None
+
+def yearly_rate_of_change(yearly):
+    """Average change per year between the first and last yearly means."""
+    if len(yearly) < 2:
+        return 0.0
+    years_diff = yearly.index[-1] - yearly.index[0]
+    if years_diff <= 0:
+        return 0.0
+    return float((yearly.iloc[-1] - yearly.iloc[0]) / years_diff)
+
 @st.cache_data(show_spinner=False)
 def load_model(element_type):
     """Load the appropriate model for the given element type."""
@@ -253,26 +345,15 @@ def create_forecast_plot(df, element_type, time_period):
     
     return fig
 
-def display_statistics(df, predictions, element_type):
+def display_statistics(df, predictions, element_type, yearly=None):
     """Display statistics for the given data and element type."""
     col1, col2, col3 = st.columns(3)
     
-    # Calculate rate of change in average per year
-    if len(df) > 1:
-        # Get first and last year's average
-        first_year = df.index[0].year
-        last_year = df.index[-1].year
-        first_year_avg = df[df.index.year == first_year]['value'].mean()
-        last_year_avg = df[df.index.year == last_year]['value'].mean()
-        
-        # Calculate rate of change per year
-        years_diff = last_year - first_year
-        if years_diff > 0:
-            rate_per_year = float((last_year_avg - first_year_avg) / years_diff)
-        else:
-            rate_per_year = 0.0
-    else:
-        rate_per_year = 0.0
+    # Calculate rate of change in average per year, from the precomputed
+    # yearly means when available
+    if yearly is None:
+        yearly = df['value'].groupby(df.index.year).mean()
+    rate_per_year = yearly_rate_of_change(yearly)
     
     # Calculate max and min
     max_value = float(df['value'].max())
@@ -344,7 +425,7 @@ def display_statistics(df, predictions, element_type):
                 f"{min_value:.1f}"
             )
 
-def display_predictions(cleaned_df, predictions, element_type, forecast_type, y_axis_label):
+def display_predictions(cleaned_df, predictions, element_type, forecast_type, y_axis_label, yearly=None):
     """Display predictions with visualization and statistics."""
     if predictions is not None:
         # Get last 5 years of data
@@ -393,34 +474,12 @@ def display_predictions(cleaned_df, predictions, element_type, forecast_type, y_
         col1, col2, col3 = st.columns(3)
         
         # Calculate rate of change in average per year for forecasted data
-        if len(predictions) > 1:
-            first_year = predictions.index[0].year
-            last_year = predictions.index[-1].year
-            first_year_avg = predictions[predictions.index.year == first_year].mean()
-            last_year_avg = predictions[predictions.index.year == last_year].mean()
-            
-            years_diff = last_year - first_year
-            if years_diff > 0:
-                forecast_rate_per_year = float((last_year_avg - first_year_avg) / years_diff)
-            else:
-                forecast_rate_per_year = 0.0
-        else:
-            forecast_rate_per_year = 0.0
+        forecast_rate_per_year = yearly_rate_of_change(predictions.groupby(predictions.index.year).mean())
         
         # Calculate historical rate of change in average per year
-        if len(cleaned_df) > 1:
-            first_year = cleaned_df.index[0].year
-            last_year = cleaned_df.index[-1].year
-            first_year_avg = cleaned_df[cleaned_df.index.year == first_year]['value'].mean()
-            last_year_avg = cleaned_df[cleaned_df.index.year == last_year]['value'].mean()
-            
-            years_diff = last_year - first_year
-            if years_diff > 0:
-                historical_rate_per_year = float((last_year_avg - first_year_avg) / years_diff)
-            else:
-                historical_rate_per_year = 0.0
-        else:
-            historical_rate_per_year = 0.0
+        if yearly is None:
+            yearly = cleaned_df['value'].groupby(cleaned_df.index.year).mean()
+        historical_rate_per_year = yearly_rate_of_change(yearly)
         
         # Calculate max and min for forecasted data
         forecast_max = float(predictions.max())
@@ -552,6 +611,22 @@ def main():
             key="time_period"
         )
 
+        # Forecast engine selection
+        forecast_engine = st.selectbox(
+            "Forecast Engine",
+            [TRAINED_MODEL_ENGINE] + list(BASELINE_ENGINES),
+            key="forecast_engine",
+            help="Baselines are fitted instantly to any station and element; trained models cover county TMAX/TMIN",
+        )
+
+        # Which station series are usable for forecasting, checked in bulk once
+        validation_report = load_validation_report()
+        if validation_report is not None:
+            st.caption(
+                f"{int(validation_report['valid'].sum())} of {len(validation_report)} station series "
+                "pass validation for forecasting"
+            )
+
         # Load Dallas stations with caching
         @st.cache_data(show_spinner=True)
         def load_dallas_stations():
@@ -567,18 +642,22 @@ def main():
             try:
                 # Try to load from local file first
                 try:
-                    data = pd.read_csv(STATIONS_DIR / f"{station_id}_data.csv")
+                    if station_dataset.dataset_exists(DATASET_DIR):
+                        # Typed DATE/value columns from the station's partitions only
+                        data = station_dataset.read_station_dataset(
+                            DATASET_DIR, station_ids=[station_id], columns=["DATE", "value", "element"]
+                        )
+                    else:
+                        # Typed read: ISO dates, float values, categorical elements
+                        data = read_station_csv(
+                            STATIONS_DIR / f"{station_id}_data.csv", columns=["DATE", "value", "element"]
+                        )
                     if data is None or data.empty:
                         st.error(f"No data found for station {station_id}")
                         return None
                     
-                    # Convert date to datetime if it's not already
-                    date_col = 'DATE' if 'DATE' in data.columns else 'date'
-                    if not pd.api.types.is_datetime64_any_dtype(data[date_col]):
-                        data[date_col] = pd.to_datetime(data[date_col], errors='coerce')
-                    
                     # Set date as index and keep value and element columns
-                    data = data.set_index(date_col)[['value', 'element']]
+                    data = data.set_index('DATE')[['value', 'element']]
                     
                     return data
                     
@@ -699,8 +778,15 @@ def main():
             st.error(f"No data available for {selected_element}")
             st.stop()
         
-        # Clean and prepare data
-        cleaned_df = clean_data(df_filtered)
+        # Monthly series from the precomputed aggregates; resample the daily
+        # data only when the aggregate store has not been built
+        aggregate_ids = tuple(df_stations['ID']) if station_id == "ENTIRE_COUNTY" else (station_id,)
+        cleaned_df, yearly = load_aggregates(aggregate_ids, selected_element)
+        if cleaned_df is None:
+            cleaned_df = clean_data(df_filtered)
+            # Same statistic as the aggregate store's yearly means: the mean of
+            # each year's daily values, not of the forward-filled months
+            yearly = aggregate_store.yearly_means_from_daily(df_filtered)
         if cleaned_df is None or cleaned_df.empty:
             st.error("Failed to process data")
             st.stop()
@@ -712,58 +798,84 @@ def main():
         
         # Display statistics
         st.subheader("Statistics")
-        display_statistics(cleaned_df, cleaned_df, selected_element)
+        display_statistics(cleaned_df, cleaned_df, selected_element, yearly)
 
-        # Check if 'ENTIRE_COUNTY' is the selected option and element is TMAX or TMIN
-        if station_id != "ENTIRE_COUNTY" or selected_element not in ["TMAX", "TMIN"]:
+        # Trained models only exist for 'ENTIRE_COUNTY' TMAX and TMIN
+        use_trained_model = forecast_engine == TRAINED_MODEL_ENGINE
+        if use_trained_model and (station_id != "ENTIRE_COUNTY" or selected_element not in ["TMAX", "TMIN"]):
             st.stop()
             
-        # Validate the data before making predictions
-        if not validate_time_series_data(cleaned_df, station_id, selected_element):
+        # Validate the data before making predictions; single stations are
+        # looked up in the bulk report, which also says why a series fails
+        report_row = None
+        if station_id != "ENTIRE_COUNTY" and validation_report is not None:
+            report_row = validation_report[
+                (validation_report["STATION_ID"] == station_id) & (validation_report["element"] == selected_element)
+            ]
+        if report_row is not None and not report_row.empty:
+            is_valid = bool(report_row["valid"].iloc[0])
+            if not is_valid:
+                st.error(f"Not suitable for prediction: {report_row['reasons'].iloc[0]}.")
+        else:
+            is_valid = validate_time_series_data(cleaned_df, station_id, selected_element)
+        if not is_valid:
             st.error("The data for this station and element is not suitable for prediction. Please select a different station or element.")
             st.stop()
         
-        # Load and apply model if available
-        model = load_model(selected_element)
-        if model:
-            try:
-                # Prepare data for prediction
-                prediction_data = cleaned_df
-                if prediction_data is None or prediction_data.empty:
-                    st.error("Failed to prepare data for prediction")
-                    st.stop()
+        if not use_trained_model:
+            # Baseline fitted to the displayed monthly series (one vectorized pass)
+            n_periods = max(1, int(time_period)) * 12
+            baseline = BaselineForecaster(BASELINE_ENGINES[forecast_engine]).fit(cleaned_df['value'])
+            prediction_dates = pd.date_range(
+                start=cleaned_df.index[-1] + pd.DateOffset(months=1),
+                periods=n_periods,
+                freq="ME"
+            )
+            predictions = pd.Series(baseline.predict(n_periods=n_periods), index=prediction_dates)
+            st.subheader(f"{forecast_engine} Predictions")
+            display_predictions(cleaned_df, predictions, selected_element, forecast_type, cleaned_df['value'].mean(), yearly)
+        else:
+            # Load and apply model if available
+            model = load_model(selected_element)
+            if model:
+                try:
+                    # Prepare data for prediction
+                    prediction_data = cleaned_df
+                    if prediction_data is None or prediction_data.empty:
+                        st.error("Failed to prepare data for prediction")
+                        st.stop()
                 
-                # Convert time_period to integer and ensure it's positive
-                n_periods = max(1, int(time_period)) * 12
+                    # Convert time_period to integer and ensure it's positive
+                    n_periods = max(1, int(time_period)) * 12
                 
-                # Generate predictions using the loaded model
-                predictions_array = model.predict(n_periods=n_periods)
+                    # Generate predictions using the loaded model
+                    predictions_array = model.predict(n_periods=n_periods)
                 
-                # Create datetime index for predictions
-                last_date = prediction_data.index[-1]
-                prediction_dates = pd.date_range(
-                    start=last_date + pd.DateOffset(months=1),
-                    periods=n_periods,
-                    freq="ME"
-                )
+                    # Create datetime index for predictions
+                    last_date = prediction_data.index[-1]
+                    prediction_dates = pd.date_range(
+                        start=last_date + pd.DateOffset(months=1),
+                        periods=n_periods,
+                        freq="ME"
+                    )
                 
-                # Convert predictions array to pandas Series with datetime index
-                if isinstance(predictions_array, pd.Series):
-                    # If it's already a Series, just update the index
-                    predictions = predictions_array.copy()
-                    predictions.index = prediction_dates
-                else:
-                    # If it's a numpy array, create a new Series
-                    predictions = pd.Series(predictions_array, index=prediction_dates)
+                    # Convert predictions array to pandas Series with datetime index
+                    if isinstance(predictions_array, pd.Series):
+                        # If it's already a Series, just update the index
+                        predictions = predictions_array.copy()
+                        predictions.index = prediction_dates
+                    else:
+                        # If it's a numpy array, create a new Series
+                        predictions = pd.Series(predictions_array, index=prediction_dates)
                 
-                # Display predictions
-                st.subheader("Model Predictions")
-                display_predictions(cleaned_df, predictions, selected_element, forecast_type, cleaned_df['value'].mean())
+                    # Display predictions
+                    st.subheader("Model Predictions")
+                    display_predictions(cleaned_df, predictions, selected_element, forecast_type, cleaned_df['value'].mean(), yearly)
                 
-            except Exception as e:
-                st.error(f"Error making predictions with loaded model: {str(e)}")
-        else:
-            st.error("No pre-trained model found for this element type.")
+                except Exception as e:
+                    st.error(f"Error making predictions with loaded model: {str(e)}")
+            else:
+                st.error("No pre-trained model found for this element type.")
     
     with tab2:
         # About Section
@@ -0,0 +1,57 @@
+"""
+Benchmark the grouped multi-series cleaner against a per-series clean_data loop.
+
+Usage:
+    python scripts/benchmarks/bench_clean_data.py
+
+Every bundled data/stations/<ID>_data.csv file is combined into one long
+frame and cleaned per (station, element).
+"""
+import time
+import warnings
+
+import pandas as pd
+
+from common import STATIONS_DIR
+from ml.csv_loader import read_station_csv
+from ml.time_series import clean_data, clean_data_multi
+
+# clean_data's fillna(method=...) calls warn on every series
+warnings.simplefilter("ignore", FutureWarning)
+
+
+def clean_loop(data):
+    # What callers did before: one clean_data call per station and element
+    parts = []
+    for (station_id, element), group in data.groupby(["STATION_ID", "element"], sort=True):
+        cleaned = clean_data(group[["DATE", "value"]])
+        if cleaned is not None and not cleaned.empty:
+            parts.append(cleaned.reset_index().assign(STATION_ID=station_id, element=element))
+    return pd.concat(parts, ignore_index=True)[["STATION_ID", "element", "DATE", "value"]]
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<28} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    paths = sorted(STATIONS_DIR.glob("*_data.csv"))
+    data = pd.concat(
+        [read_station_csv(path).astype({"element": str, "STATION_ID": str}) for path in paths],
+        ignore_index=True,
+    )
+    n_series = data.groupby(["STATION_ID", "element"]).ngroups
+    print(f"Cleaning {n_series} series ({len(data)} daily rows) from {len(paths)} station files")
+
+    reference = timed("clean_data per series", clean_loop, data)
+    grouped = timed("clean_data_multi", clean_data_multi, data)
+
+    pd.testing.assert_frame_equal(reference, grouped)
+    print(f"{len(grouped)} monthly rows, outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the schema-aware station CSV loader against pandas type inference.
+
+Usage:
+    python scripts/benchmarks/bench_csv_loader.py [path/to/station_data.csv ...]
+
+Without arguments every bundled data/stations/<ID>_data.csv file is read.
+"""
+import sys
+import time
+
+import pandas as pd
+
+from common import STATIONS_DIR
+from ml.csv_loader import read_station_csv
+
+
+def read_inferred(path):
+    # What the app and trainer did before: infer every column, then parse dates
+    data = pd.read_csv(path)
+    data["DATE"] = pd.to_datetime(data["DATE"], errors="coerce")
+    return data
+
+
+def read_all(paths, func, **kwargs):
+    return [func(path, **kwargs) for path in paths]
+
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    frames = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    # Measured per file: concatenating categoricals with different categories yields object columns
+    memory = sum(frame.memory_usage(deep=True).sum() for frame in frames) / 2**20
+    print(f"{label:<32} {elapsed:8.3f}s {memory:8.1f} MiB")
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    paths = sys.argv[1:] or sorted(STATIONS_DIR.glob("*_data.csv"))
+    print(f"Reading {len(paths)} station files")
+    reference = timed("read_csv + to_datetime", read_all, paths, read_inferred)
+    typed_pandas = timed("loader (pandas engine)", read_all, paths, read_station_csv, engine="pandas")
+    typed = timed("loader (pyarrow engine)", read_all, paths, read_station_csv, engine="pyarrow")
+    filtered = timed(
+        "loader, TMAX/TMIN, 3 columns",
+        read_all,
+        paths,
+        read_station_csv,
+        columns=["DATE", "value", "element"],
+        elements=["TMAX", "TMIN"],
+    )
+
+    as_str = {"element": str, "STATION_ID": str}
+    pd.testing.assert_frame_equal(reference.astype(as_str), typed_pandas.astype(as_str))
+    pd.testing.assert_frame_equal(reference.astype(as_str), typed.astype(as_str))
+    expected = reference[reference["element"].isin(["TMAX", "TMIN"])][["DATE", "value", "element"]]
+    pd.testing.assert_frame_equal(
+        expected.reset_index(drop=True).astype({"element": str}), filtered.astype({"element": str})
+    )
+    print(f"{len(reference)} rows, outputs identical")
+
+
+if __name__ == "__main__":
+    main()
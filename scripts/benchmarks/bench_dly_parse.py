@@ -0,0 +1,62 @@
+"""
+Compare the python and numpy .dly parsing engines.
+
+Usage:
+    python scripts/benchmarks/bench_dly_parse.py [path/to/station.dly ...]
+
+Without arguments the bundled station CSVs are converted back into .dly
+records and parsed with both engines.
+"""
+import sys
+import time
+
+import pandas as pd
+
+from common import load_bundled_dly_lines
+from ml.ghcnd_parse import dly_to_dataframe_from_lines
+
+
+def time_engine(lines, engine, repeat=3, **filters):
+    best = float("inf")
+    df = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = dly_to_dataframe_from_lines(lines, engine=engine, **filters)
+        best = min(best, time.perf_counter() - start)
+    return best, df
+
+
+def main():
+    if len(sys.argv) > 1:
+        datasets = {}
+        for path in sys.argv[1:]:
+            with open(path, "r", encoding="latin-1") as f:
+                datasets[path] = f.read().splitlines()
+    else:
+        datasets = load_bundled_dly_lines()
+
+    lines = [line for station_lines in datasets.values() for line in station_lines]
+    print(f"Parsing {len(lines)} records from {len(datasets)} stations")
+
+    python_time, python_df = time_engine(lines, "python", repeat=1)
+    numpy_time, numpy_df = time_engine(lines, "numpy")
+
+    pd.testing.assert_frame_equal(python_df, numpy_df)
+    print(f"python engine: {python_time:.3f}s ({len(python_df)} rows)")
+    print(f"numpy engine:  {numpy_time:.3f}s ({len(numpy_df)} rows)")
+    print(f"speedup:       {python_time / numpy_time:.1f}x")
+
+    # Predicate pushdown: only the elements the app and trainer use
+    filtered_time, filtered_df = time_engine(
+        lines, "numpy", elements=["TMAX", "TMIN"], drop_qflagged=True
+    )
+    print(
+        f"numpy engine, TMAX/TMIN without QFLAG: {filtered_time:.3f}s "
+        f"({len(filtered_df)} rows, "
+        f"{filtered_df.memory_usage(deep=True).sum() / 1e6:.1f} MB vs "
+        f"{numpy_df.memory_usage(deep=True).sum() / 1e6:.1f} MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark the fixed-width metadata parser and its sidecar cache.
+
+Usage:
+    python scripts/benchmarks/bench_metadata_parse.py [path/to/ghcnd-inventory.txt]
+
+Without arguments a synthetic ~750k line inventory is generated from the
+bundled Dallas station metadata.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from common import DATA_DIR
+from ml.ghcnd_parse import parse_inventory_file
+
+
+def parse_inventory_loop(input_path):
+    # Reference per-line implementation the vectorized parser replaced
+    inventory_data = []
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                inventory_data.append(
+                    [
+                        line[0:11].strip(),
+                        float(line[12:20].strip()),
+                        float(line[21:30].strip()),
+                        line[31:35].strip(),
+                        int(line[36:40].strip()),
+                        int(line[41:45].strip()),
+                    ]
+                )
+    return pd.DataFrame(
+        inventory_data,
+        columns=["id", "latitude", "longitude", "element", "first_year", "last_year"],
+    )
+
+
+def write_synthetic_inventory(path, n_lines=750_000):
+    stations = pd.read_csv(DATA_DIR / "dallas_stations_metadata.csv")
+    elements = ["TMAX", "TMIN", "PRCP", "SNOW", "SNWD", "TAVG", "AWND", "WT01"]
+    lines = []
+    i = 0
+    while len(lines) < n_lines:
+        station = stations.iloc[i % len(stations)]
+        station_id = f"{station['ID'][:7]}{i % 10000:04d}"
+        for element in elements:
+            lines.append(
+                f"{station_id:<11} {station['LATITUDE']:8.4f} {station['LONGITUDE']:9.4f} "
+                f"{element:<4} {1900 + i % 100:4d} {2025:4d}\n"
+            )
+        i += 1
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines[:n_lines])
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<28} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        if len(sys.argv) > 1:
+            path = sys.argv[1]
+        else:
+            path = os.path.join(tmp, "ghcnd-inventory.txt")
+            write_synthetic_inventory(path)
+
+        print(f"Parsing {path}")
+        reference = timed("per-line loop", parse_inventory_loop, path)
+        if os.path.exists(f"{path}.parsed.parquet"):
+            os.remove(f"{path}.parsed.parquet")
+        cold = timed("vectorized (cold)", parse_inventory_file, path)
+        warm = timed("vectorized (sidecar cache)", parse_inventory_file, path)
+
+        pd.testing.assert_frame_equal(reference, cold)
+        pd.testing.assert_frame_equal(reference, warm)
+        print(f"{len(reference)} rows, outputs identical")
+
+
+if __name__ == "__main__":
+    main()
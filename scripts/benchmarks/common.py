@@ -0,0 +1,56 @@
+"""Shared helpers for the benchmark scripts."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the scripts directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir.parent))
+
+DATA_DIR = current_dir.parent.parent / "data"
+STATIONS_DIR = DATA_DIR / "stations"
+
+# Elements stored in degrees C in the station CSVs but in tenths in .dly files
+TENTHS_ELEMENTS = ["TMAX", "TMIN"]
+
+
+def station_csv_to_dly_lines(csv_path):
+    """
+    Rebuild GHCN-Daily .dly lines from one of the bundled station CSVs so the
+    parsers can be benchmarked on realistic records without network access.
+    """
+    data = pd.read_csv(csv_path)
+    data["DATE"] = pd.to_datetime(data["DATE"])
+    values = data["value"].where(
+        ~data["element"].isin(TENTHS_ELEMENTS), data["value"] * 10
+    )
+    data["raw"] = values.round().astype(int)
+    data["year"] = data["DATE"].dt.year
+    data["month"] = data["DATE"].dt.month
+    data["day"] = data["DATE"].dt.day
+
+    lines = []
+    for (station_id, element, year, month), group in data.groupby(
+        ["STATION_ID", "element", "year", "month"], sort=True
+    ):
+        days = np.full(31, -9999)
+        days[group["day"].to_numpy() - 1] = group["raw"].to_numpy()
+        slots = "".join(
+            f"{v:5d}   " if v == -9999 else f"{v:5d}  0" for v in days
+        )
+        lines.append(f"{station_id:<11}{year:04d}{month:02d}{element:<4}{slots}")
+    return lines
+
+
+def load_bundled_dly_lines(station_ids=None):
+    """Return synthetic .dly lines for the bundled stations, keyed by station ID."""
+    paths = sorted(STATIONS_DIR.glob("*_data.csv"))
+    result = {}
+    for path in paths:
+        station_id = path.name.replace("_data.csv", "")
+        if station_ids is not None and station_id not in station_ids:
+            continue
+        result[station_id] = station_csv_to_dly_lines(path)
+    return result
@@ -0,0 +1,59 @@
+"""
+Report the memory used by the default and compact .dly parse schemas.
+
+Usage:
+    python scripts/benchmarks/compact_memory_report.py
+
+Each bundled station CSV is converted back into .dly records and parsed
+with compact=False and compact=True.
+"""
+import pandas as pd
+
+from common import load_bundled_dly_lines
+from ml.ghcnd_parse import dly_to_dataframe_from_lines
+from ml.time_series import clean_data
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def main():
+    datasets = load_bundled_dly_lines()
+
+    rows = []
+    for station_id, lines in datasets.items():
+        default_df = dly_to_dataframe_from_lines(lines)
+        compact_df = dly_to_dataframe_from_lines(lines, compact=True)
+        rows.append(
+            {
+                "station_id": station_id,
+                "rows": len(default_df),
+                "default_MB": frame_bytes(default_df) / 1e6,
+                "compact_MB": frame_bytes(compact_df) / 1e6,
+            }
+        )
+
+    report = pd.DataFrame(rows)
+    report["reduction"] = report["default_MB"] / report["compact_MB"]
+    print(report.to_string(index=False, float_format="{:.2f}".format))
+
+    total_default = report["default_MB"].sum()
+    total_compact = report["compact_MB"].sum()
+    print(
+        f"\nTotal: {total_default:.1f} MB -> {total_compact:.1f} MB "
+        f"({total_default / total_compact:.1f}x smaller, "
+        f"{total_default * 1e6 / report['rows'].sum():.0f} -> "
+        f"{total_compact * 1e6 / report['rows'].sum():.0f} bytes per observation)"
+    )
+
+    # Both schemas clean to the same monthly series
+    lines = datasets.get("USW00013907") or next(iter(datasets.values()))
+    default_df = dly_to_dataframe_from_lines(lines, elements=["TMAX"])
+    compact_df = dly_to_dataframe_from_lines(lines, elements=["TMAX"], compact=True)
+    pd.testing.assert_frame_equal(clean_data(default_df), clean_data(compact_df))
+    print("clean_data output matches for both schemas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import os
+import sys
+import time
+import tarfile
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir.parent))
+sys.path.append(str(current_dir))
+
+# Define data directory paths
+DATA_DIR = current_dir.parent / "data"
+BULK_DIR = DATA_DIR / "bulk"
+
+from ml.ghcnd_parse import dly_to_dataframe_from_lines
+from tqdm import tqdm
+
+
+def iter_dly_sources(source):
+    """
+    Yield (station_id, payload) for every .dly file in a directory or tarball.
+
+    For directories the payload is the file path, so workers read the file
+    themselves. Tarballs (e.g. NOAA's ghcnd_all.tar.gz) are streamed member by
+    member and the payload is the member's bytes; nothing is extracted to disk.
+    """
+    source = Path(source)
+    if source.is_dir():
+        for path in sorted(source.rglob("*.dly")):
+            yield path.stem, path
+        return
+
+    with tarfile.open(source, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile() or not member.name.endswith(".dly"):
+                continue
+            f = archive.extractfile(member)
+            if f is None:
+                continue
+            yield Path(member.name).stem, f.read()
+
+
+def ingest_station(station_id, payload, output_dir, output_format, filters):
+    """
+    Parse one station's .dly data and write it to output_dir.
+    Runs in a worker process; returns (station_id, input_bytes, rows).
+    """
+    if isinstance(payload, (str, os.PathLike)):
+        with open(payload, "rb") as f:
+            payload = f.read()
+
+    df = dly_to_dataframe_from_lines(payload.splitlines(), compact=True, **filters)
+    if output_format == "pickle":
+        df.to_pickle(Path(output_dir) / f"{station_id}.pkl")
+    else:
+        df.to_csv(Path(output_dir) / f"{station_id}.csv.gz", index=False)
+    return station_id, len(payload), len(df)
+
+
+def bulk_ingest(source, output_dir=BULK_DIR, workers=None, output_format="csv", **filters):
+    """
+    Parse every station in a directory or tarball of .dly files across a
+    process pool and write one output file per station.
+
+    Args:
+        source (str or Path): Directory containing .dly files, or a .tar/.tar.gz
+        output_dir (str or Path): Directory for the per-station outputs
+        workers (int, optional): Number of worker processes (default: all cores)
+        output_format (str): "csv" (gzip-compressed) or "pickle"
+        **filters: Record filters passed to dly_to_dataframe_from_lines
+            (elements, start_year, end_year, drop_qflagged)
+
+    Returns:
+        dict: Summary with station, byte and row counts, failures and elapsed
+        time; "failed" lists the (station_id, error message) of each failure
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Bound the number of in-flight stations so that reading a tarball faster
+    # than it can be parsed does not buffer the whole archive in memory
+    max_pending = workers * 4
+    pending = {}
+    stations = 0
+    total_bytes = 0
+    total_rows = 0
+    failures = []
+    start = time.perf_counter()
+
+    def collect(done, progress):
+        nonlocal stations, total_bytes, total_rows
+        for future in done:
+            station_id = pending.pop(future)
+            try:
+                _, n_bytes, n_rows = future.result()
+            except Exception as e:
+                failures.append((station_id, str(e)))
+                print(f"Error ingesting station {station_id}: {e}")
+                continue
+            stations += 1
+            total_bytes += n_bytes
+            total_rows += n_rows
+            elapsed = time.perf_counter() - start
+            progress.update(1)
+            progress.set_postfix(
+                stations_per_s=f"{stations / elapsed:.1f}",
+                mb_per_s=f"{total_bytes / 1e6 / elapsed:.1f}",
+            )
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, tqdm(unit="station") as progress:
+        for station_id, payload in iter_dly_sources(source):
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done, progress)
+            future = pool.submit(
+                ingest_station, station_id, payload, output_dir, output_format, filters
+            )
+            pending[future] = station_id
+        done, _ = wait(pending)
+        collect(done, progress)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "stations": stations,
+        "bytes": total_bytes,
+        "rows": total_rows,
+        "failures": len(failures),
+        "failed": failures,
+        "seconds": elapsed,
+    }
+    print(
+        f"Ingested {stations} stations ({total_bytes / 1e6:.1f} MB, {total_rows} rows) "
+        f"in {elapsed:.1f}s with {workers} workers: "
+        f"{stations / elapsed:.1f} stations/s, {total_bytes / 1e6 / elapsed:.1f} MB/s"
+    )
+    if failures:
+        print(f"{len(failures)} stations failed:")
+        for station_id, error in failures:
+            print(f"  {station_id}: {error}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parse a directory or tarball of GHCN-Daily .dly files in parallel."
+    )
+    parser.add_argument("source", help="Directory of .dly files or ghcnd_all.tar.gz")
+    parser.add_argument("--output-dir", default=str(BULK_DIR), help="Per-station output directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--format", choices=["csv", "pickle"], default="csv", dest="output_format")
+    parser.add_argument("--elements", nargs="+", default=None, help="Only keep these elements, e.g. TMAX TMIN")
+    parser.add_argument("--start-year", type=int, default=None)
+    parser.add_argument("--end-year", type=int, default=None)
+    parser.add_argument("--drop-qflagged", action="store_true", help="Drop days with a quality flag")
+    args = parser.parse_args()
+
+    bulk_ingest(
+        args.source,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        output_format=args.output_format,
+        elements=args.elements,
+        start_year=args.start_year,
+        end_year=args.end_year,
+        drop_qflagged=args.drop_qflagged,
+    )
+
+
+if __name__ == "__main__":
+    main()
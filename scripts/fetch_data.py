@@ -1,5 +1,7 @@
 import os
 import sys
+import time
+import argparse
 from pathlib import Path
 
 # Add the parent directory to the Python path
@@ -9,25 +11,73 @@ sys.path.append(str(current_dir.parent))
 # Define data directory paths
 DATA_DIR = current_dir.parent / "data"
 STATIONS_DIR = DATA_DIR / "stations"
+DATASET_DIR = DATA_DIR / "dataset"
+AGGREGATES_DIR = DATA_DIR / "aggregates"
+DB_PATH = DATA_DIR / "observations.sqlite"
 
 # Enable dry-run mode
 DRY_RUN = True
 
+# Elements used by the app; other records are skipped while parsing
+ELEMENTS = ["TMAX", "TMIN", "PRCP", "SNOW", "SNWD"]
+
+# Inventory requirements for a station to be downloaded at all
+# (same thresholds as validate_time_series_data)
+MIN_YEARS = 3
+MAX_YEARS_SINCE_LAST = 3
+
+# Concurrent station downloads and per-host request rate limit
+MAX_DOWNLOADS = 8
+REQUESTS_PER_SECOND = 10
+
 import pandas as pd
-from ml.ghcnd_fetch import get_ghcnd_stations, get_ghcnd_data_by_station
-from ml.time_series import clean_data
+from ml.ghcnd_fetch import get_ghcnd_stations, get_ghcnd_inventory, download_station, RateLimiter
+from ml.inventory_planner import plan_station_downloads, print_plan
+from ml import station_store
+from ml import sqlite_store
+from ml.station_pipeline import run_station_pipeline, STAGES
 from app import get_stations_in_county
 from tqdm import tqdm
 
-def fetch_and_combine_dallas_data():
-    # Get Dallas stations
-    print("Fetching Dallas stations...")
-    dallas_stations = get_stations_in_county("Dallas")
-    if dallas_stations is None or dallas_stations.empty:
-        print("No stations found for Dallas County")
+def fetch_and_combine_dallas_data(incremental=False, county="Dallas", elements=ELEMENTS, workers=None, resume=False):
+    """
+    Download and store daily data for every station in a Texas county
+    (Dallas by default). Daily records go to the Parquet dataset in
+    data/dataset, partitioned by element and station, and their monthly,
+    yearly and climatology aggregates to data/aggregates. The daily records are
+    also bulk-loaded into the indexed SQLite store (data/observations.sqlite).
+    The station metadata file is prefixed with the county name.
+
+    With incremental=True, each station only parses records from the last
+    month recorded in data/stations/ingest_state.json on; the new days are
+    appended as new dataset files and only the touched monthly aggregates are
+    recomputed (yearly and climatology tables are rolled up from them). The
+    watermark month itself is read again and replaces the stored rows, since
+    GHCN-D days arrive with a reporting lag and quality flags are revised
+    later. The month in progress is never ingested.
+
+    Before any station is downloaded, the GHCN-D inventory is used to skip
+    stations that never reported the requested elements, cover fewer than
+    MIN_YEARS years or stopped reporting more than MAX_YEARS_SINCE_LAST years
+    ago; only the usable elements of each remaining station are parsed.
+
+    Downloads run on MAX_DOWNLOADS threads while `workers` processes (default:
+    one per CPU) parse, clean and write the stations as they arrive.
+
+    Each station's output is committed to the dataset as soon as it finishes,
+    and the station is recorded in data/stations/fetch_manifest.jsonl. With
+    resume=True, an interrupted run with the same parameters skips the
+    stations it already completed. Only one station per worker is ever held
+    in memory.
+    """
+    # Get the county's stations
+    print(f"Fetching {county} County stations...")
+    county_stations = get_stations_in_county(county)
+    if county_stations is None or county_stations.empty:
+        print(f"No stations found for {county} County")
         return
     
-    print(f"Found {len(dallas_stations)} stations in Dallas County")
+    print(f"Found {len(county_stations)} stations in {county} County")
     
     if not DRY_RUN:
         # Create directories for the data if they don't exist
@@ -37,65 +87,155 @@ def fetch_and_combine_dallas_data():
         print("[DRY RUN] Would create data directories")
     
     # Save station metadata
-    stations_file = DATA_DIR / "dallas_stations_metadata.csv"
+    prefix = county.lower().replace(" ", "_")
+    stations_file = DATA_DIR / f"{prefix}_stations_metadata.csv"
     if not DRY_RUN:
-        dallas_stations.to_csv(stations_file, index=False)
+        county_stations.to_csv(stations_file, index=False)
         print(f"Saved station metadata to {stations_file}")
     else:
         print(f"[DRY RUN] Would save station metadata to {stations_file}")
     
-    # Initialize an empty list to store all station data
-    all_station_data = []
+    # Plan the downloads from the inventory so unusable stations are never fetched
+    station_ids = list(county_stations['ID'])
+    station_filters = {}
+    try:
+        plan = plan_station_downloads(
+            station_ids,
+            get_ghcnd_inventory(),
+            elements,
+            min_years=MIN_YEARS,
+            max_years_since_last=MAX_YEARS_SINCE_LAST,
+        )
+        print_plan(plan)
+        plan = plan[plan['selected']]
+        station_ids = list(plan['station_id'])
+        for station_id, station_elements in zip(plan['station_id'], plan['elements']):
+            station_filters[station_id] = {"elements": station_elements}
+    except Exception as e:
+        print(f"Error planning downloads from the inventory, fetching all stations: {str(e)}")
+
+    # Skip the stations an interrupted run with the same parameters already completed
+    run = {
+        "county": county,
+        "elements": sorted(elements),
+        "incremental": incremental,
+        "before": list(station_store.current_month()),
+    }
+    completed = station_store.load_run_manifest(run, STATIONS_DIR) if resume else None
+    if completed:
+        station_ids = [sid for sid in station_ids if sid not in completed]
+        print(f"Resuming: {len(completed)} stations already completed, {len(station_ids)} remaining")
+    elif resume:
+        print("No interrupted run to resume; starting a new run")
+    if not DRY_RUN and completed is None:
+        station_store.start_run_manifest(run, STATIONS_DIR)
+
+    # Per-station watermarks of the last ingested month per element
+    state = station_store.load_ingest_state(STATIONS_DIR)
+    if incremental:
+        ingested = 0
+        for station_id in station_ids:
+            since = station_store.station_since(state, station_id, STATIONS_DIR, DATASET_DIR)
+            if since:
+                station_filters.setdefault(station_id, {})["since"] = since
+                ingested += 1
+        print(f"Incremental refresh: {ingested} stations already ingested")
     
-    # Fetch data for each station
+    # Download on a thread pool while worker processes parse, clean and write each station
     print("Fetching data for each station...")
-    for _, station in tqdm(dallas_stations.iterrows(), total=len(dallas_stations)):
-        station_id = station['ID']
-        try:
-            # Fetch data for the station
-            station_data = get_ghcnd_data_by_station(station_id)
-            if station_data is not None and not station_data.empty:
-                # Add station ID as a column
-                station_data['STATION_ID'] = station_id
-                
-                # Clean the data
-                cleaned_data = clean_data(station_data)
-                if cleaned_data is not None and not cleaned_data.empty:
-                    # Reset index to get DATE back as a column
-                    cleaned_data = cleaned_data.reset_index()
-                    # Add station ID back
-                    cleaned_data['STATION_ID'] = station_id
-                    
-                    # Save individual station data
-                    station_file = STATIONS_DIR / f"{station_id}_data.csv"
-                    if not DRY_RUN:
-                        cleaned_data.to_csv(station_file, index=False)
-                        print(f"Saved cleaned data for station {station_id} to {station_file}")
-                    else:
-                        print(f"[DRY RUN] Would save cleaned data for station {station_id} to {station_file}")
-                    
-                    all_station_data.append(cleaned_data)
-        except Exception as e:
-            print(f"Error fetching data for station {station_id}: {str(e)}")
+    rate_limiter = RateLimiter(REQUESTS_PER_SECOND) if REQUESTS_PER_SECOND else None
+    append_ids = [sid for sid in station_ids if "since" in station_filters.get(sid, {})]
+    if not DRY_RUN:
+        sqlite_store.create_store(DB_PATH)
+    station_results = run_station_pipeline(
+        station_ids,
+        lambda station_id: download_station(station_id, rate_limiter=rate_limiter),
+        stations_dir=STATIONS_DIR,
+        dataset_dir=DATASET_DIR,
+        aggregates_dir=AGGREGATES_DIR,
+        db_path=DB_PATH,
+        station_filters=station_filters,
+        append_ids=append_ids,
+        dry_run=DRY_RUN,
+        workers=workers,
+        download_workers=MAX_DOWNLOADS,
+        elements=elements,
+        drop_qflagged=True,
+        before=station_store.current_month(),
+    )
+    stage_seconds = dict.fromkeys(STAGES, 0.0)
+    started = time.perf_counter()
+    stored_stations = 0
+    total_records = 0
+    for station_id, summary, error, timings in tqdm(station_results, total=len(station_ids)):
+        for stage, seconds in timings.items():
+            stage_seconds[stage] += seconds
+        if error is not None:
+            print(f"Error processing station {station_id}: {str(error)}")
             continue
-    
-    if not all_station_data:
+        if summary is None or summary["rows"] == 0:
+            if not DRY_RUN:
+                station_store.mark_station_done(station_id, 0, STATIONS_DIR)
+            continue
+
+        if not DRY_RUN:
+            if station_id in append_ids:
+                print(f"Appended {summary['rows']} new records for station {station_id} to {DATASET_DIR}")
+            else:
+                print(f"Saved {summary['rows']} records for station {station_id} to {DATASET_DIR}")
+            since = dict(station_filters.get(station_id, {}).get("since", {}))
+            since.update(summary["last_months"])
+            state[station_id] = {element: list(month) for element, month in since.items()}
+            # Commit progress per station so an interrupted run loses nothing
+            station_store.save_ingest_state(state, STATIONS_DIR)
+            station_store.mark_station_done(station_id, summary["rows"], STATIONS_DIR)
+        else:
+            action = "append" if station_id in append_ids else "save"
+            print(f"[DRY RUN] Would {action} {summary['rows']} records for station {station_id} to {DATASET_DIR}")
+
+        stored_stations += 1
+        total_records += summary["rows"]
+
+    # Stage times are summed over threads/processes, so they can exceed the wall time
+    print(f"Processed {len(station_ids)} stations in {time.perf_counter() - started:.1f}s "
+          + ", ".join(f"{stage} {stage_seconds[stage]:.1f}s" for stage in STAGES))
+
+    if not stored_stations:
         print("No data was fetched for any stations")
         return
     
-    # Combine all station data
-    print("Combining station data...")
-    combined_data = pd.concat(all_station_data, ignore_index=True)
-    
-    # Save to CSV
-    output_file = DATA_DIR / "dallas_stations_data.csv"
-    if not DRY_RUN:
-        combined_data.to_csv(output_file, index=False)
-        print(f"Saved combined cleaned data for {len(all_station_data)} stations to {output_file}")
-        print(f"Total records: {len(combined_data)}")
-    else:
-        print(f"[DRY RUN] Would save combined cleaned data for {len(all_station_data)} stations to {output_file}")
-        print(f"Total records: {len(combined_data)}")
+    # The dataset partitions replace the old combined CSV; readers select the
+    # county's stations from the metadata file
+    print(f"Stored data for {stored_stations} stations in {DATASET_DIR}")
+    print(f"Total records: {total_records}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch and store GHCN-D data for a Texas county's stations.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only ingest months from each station's last ingested month on",
+    )
+    parser.add_argument(
+        "--elements",
+        nargs="+",
+        default=ELEMENTS,
+        help="Elements to download; stations reporting none of them are skipped",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes parsing and writing stations (default: CPU count)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip stations completed by an interrupted run with the same options",
+    )
+    parser.add_argument("--county", default="Dallas", help="Texas county to fetch (default: Dallas)")
+    args = parser.parse_args()
+    fetch_and_combine_dallas_data(incremental=args.incremental, county=args.county, elements=args.elements, workers=args.workers, resume=args.resume)
 
 if __name__ == "__main__":
-    fetch_and_combine_dallas_data() 
\ No newline at end of file
+    main()
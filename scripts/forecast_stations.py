@@ -0,0 +1,130 @@
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir.parent))
+
+# Define data directory paths
+DATA_DIR = current_dir.parent / "data"
+AGGREGATES_DIR = DATA_DIR / "aggregates"
+FORECASTS_DIR = DATA_DIR / "forecasts"
+
+# Elements forecast by default and years ahead
+ELEMENTS = ["TMAX", "TMIN"]
+N_PERIODS = 12
+
+# Seconds allowed for one series' model search before it is abandoned
+TIMEOUT = 600
+
+import pandas as pd
+from ml import aggregate_store
+from ml.time_series import forecast_batch, baseline_batch, validate_series_bulk, BASELINE_METHODS
+from tqdm import tqdm
+
+
+def load_monthly_table(station_ids, elements, aggregates_dir=AGGREGATES_DIR):
+    """Monthly mean of each (station, element) from the aggregate store, as forecast_batch input."""
+    monthly = aggregate_store.read_aggregates("monthly", station_ids, elements, aggregates_dir)
+    return monthly.rename(columns={"mean": "value"})[["STATION_ID", "element", "DATE", "value"]]
+
+
+def forecast_stations(station_ids, elements=ELEMENTS, n_periods=N_PERIODS, workers=None, timeout=TIMEOUT,
+                      aggregates_dir=AGGREGATES_DIR, output_dir=FORECASTS_DIR, engine="arima"):
+    """
+    Forecast every station/element series and write the forecast table.
+
+    engine is "arima" (forecast_batch, one process per series) or one of
+    BASELINE_METHODS (baseline_batch, all series in one vectorized fit).
+
+    Writes output_dir/forecasts.parquet (STATION_ID, element, DATE, value),
+    output_dir/forecast_status.parquet (one row per series with its outcome)
+    and output_dir/validation.parquet (the validate_series_bulk report).
+
+    Returns:
+        tuple: (forecasts, status) DataFrames
+    """
+    if not aggregate_store.aggregates_exist(aggregates_dir=aggregates_dir):
+        print(f"No monthly aggregates in {aggregates_dir}; run scripts/fetch_data.py or ml/station_dataset.py first")
+        return None, None
+    monthly = load_monthly_table(station_ids, elements, aggregates_dir)
+    n_series = monthly.groupby(["STATION_ID", "element"], observed=True).ngroups
+
+    # Gate the job on the bulk validation report (the same checks forecast_batch applies)
+    report = validate_series_bulk(monthly)
+    os.makedirs(output_dir, exist_ok=True)
+    report.astype({"STATION_ID": str, "element": str}).to_parquet(Path(output_dir) / "validation.parquet", index=False)
+    for reason, count in report["reason"].value_counts().items():
+        print(f"  {count} series skipped: {reason}")
+    if not report["valid"].any():
+        print("No series pass validation; nothing to forecast")
+        return None, report
+    print(f"Forecasting {n_series} series from {len(station_ids)} stations, {n_periods} years ahead")
+
+    start = time.perf_counter()
+    if engine in BASELINE_METHODS:
+        forecasts = baseline_batch(monthly, n_periods=n_periods, method=engine)
+        status = report.assign(status=report["valid"].map({True: "ok", False: "skipped"}))
+        status = status[["STATION_ID", "element", "status", "reason"]]
+    else:
+        with tqdm(total=n_series, unit="series") as progress:
+            forecasts, status = forecast_batch(
+                monthly,
+                n_periods=n_periods,
+                workers=workers,
+                timeout=timeout,
+                progress=lambda row: progress.update(1),
+            )
+    elapsed = time.perf_counter() - start
+
+    forecasts.astype({"STATION_ID": str, "element": str}).to_parquet(Path(output_dir) / "forecasts.parquet", index=False)
+    status.astype({"STATION_ID": str, "element": str}).to_parquet(Path(output_dir) / "forecast_status.parquet", index=False)
+
+    counts = status["status"].value_counts()
+    fitted = int(counts.get("ok", 0))
+    print(
+        f"Forecast {fitted} series in {elapsed:.1f}s ({fitted / elapsed * 60:.1f} series/minute); "
+        f"skipped {int(counts.get('skipped', 0))}, failed {int(counts.get('failed', 0))}, "
+        f"timed out {int(counts.get('timeout', 0))}"
+    )
+    print(f"Forecast table written to {output_dir}")
+    return forecasts, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast every station and element of a county in parallel.")
+    parser.add_argument(
+        "--metadata",
+        default=str(DATA_DIR / "dallas_stations_metadata.csv"),
+        help="Station metadata CSV whose ID column lists the stations to forecast",
+    )
+    parser.add_argument("--elements", nargs="+", default=ELEMENTS, help="Elements to forecast")
+    parser.add_argument("--years", type=int, default=N_PERIODS, help="Years to forecast")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent model fits (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Seconds allowed per series")
+    parser.add_argument("--output-dir", default=str(FORECASTS_DIR), help="Forecast table directory")
+    parser.add_argument(
+        "--engine",
+        choices=["arima"] + BASELINE_METHODS,
+        default="arima",
+        help="auto_arima per series, or a vectorized baseline over all series",
+    )
+    args = parser.parse_args()
+
+    station_ids = list(pd.read_csv(args.metadata, usecols=["ID"])["ID"])
+    forecast_stations(
+        station_ids,
+        elements=args.elements,
+        n_periods=args.years,
+        workers=args.workers,
+        timeout=args.timeout,
+        output_dir=args.output_dir,
+        engine=args.engine,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import os
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Default location: <repo>/data/aggregates/<level>/STATION_ID=<ID>/part-0.parquet
+DEFAULT_AGGREGATES_DIR = Path(__file__).resolve().parents[2] / "data" / "aggregates"
+
+PARTITIONING = ds.partitioning(pa.schema([("STATION_ID", pa.string())]), flavor="hive")
+
+# Aggregate levels and their columns (STATION_ID comes from the partition path).
+# monthly: DATE is the month-end timestamp, matching clean_data's resampling
+# yearly: statistics of the daily values in each calendar year
+# climatology: statistics of the monthly means for each calendar month (1-12)
+LEVEL_COLUMNS = {
+    "monthly": ["DATE", "element", "mean", "min", "max", "count"],
+    "yearly": ["year", "element", "mean", "min", "max", "count"],
+    "climatology": ["month", "element", "mean", "min", "max", "count"],
+}
+LEVELS = list(LEVEL_COLUMNS)
+
+
+def monthly_aggregates(records):
+    """
+    Aggregate daily station records to monthly mean/min/max/count per element.
+
+    Args:
+        records (pd.DataFrame): Daily records with DATE, value and element columns
+
+    Returns:
+        pd.DataFrame: LEVEL_COLUMNS["monthly"], sorted by element and DATE
+    """
+    if records.empty:
+        return pd.DataFrame(columns=LEVEL_COLUMNS["monthly"])
+    month_end = pd.to_datetime(records["DATE"]) + pd.offsets.MonthEnd(0)
+    element = records["element"].astype(str)
+    grouped = records["value"].groupby([element, month_end.rename("DATE")])
+    monthly = grouped.agg(["mean", "min", "max", "count"]).reset_index()
+    return monthly[LEVEL_COLUMNS["monthly"]]
+
+
+def yearly_aggregates(monthly):
+    """
+    Roll monthly aggregates up to calendar years. The mean is weighted by the
+    daily counts, so it equals the mean of the year's daily values.
+    """
+    if monthly.empty:
+        return pd.DataFrame(columns=LEVEL_COLUMNS["yearly"])
+    data = monthly.assign(year=monthly["DATE"].dt.year, total=monthly["mean"] * monthly["count"])
+    grouped = data.groupby(["element", "year"])
+    yearly = grouped.agg(total=("total", "sum"), min=("min", "min"), max=("max", "max"), count=("count", "sum"))
+    yearly["mean"] = yearly["total"] / yearly["count"]
+    return yearly.reset_index()[LEVEL_COLUMNS["yearly"]]
+
+
+def climatology(monthly):
+    """Mean/min/max/count of the monthly means for each element and calendar month."""
+    if monthly.empty:
+        return pd.DataFrame(columns=LEVEL_COLUMNS["climatology"])
+    data = monthly.assign(month=monthly["DATE"].dt.month)
+    grouped = data.groupby(["element", "month"])["mean"]
+    clim = grouped.agg(["mean", "min", "max", "count"]).reset_index()
+    return clim[LEVEL_COLUMNS["climatology"]]
+
+
+def _level_path(level, station_id, aggregates_dir):
+    return Path(aggregates_dir) / level / f"STATION_ID={station_id}" / "part-0.parquet"
+
+
+def _write_level(table, level, station_id, aggregates_dir):
+    path = _level_path(level, station_id, aggregates_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # "." prefix: dataset discovery in read_aggregates skips the temp file
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    table = table.astype({"element": str, "count": "int64"})
+    try:
+        pq.write_table(pa.Table.from_pandas(table, preserve_index=False), tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def write_station_aggregates(records, station_id, aggregates_dir=DEFAULT_AGGREGATES_DIR, append=False):
+    """
+    Materialize a station's monthly, yearly and climatology tables.
+
+    Args:
+        records (pd.DataFrame): The station's daily records
+        station_id (str): GHCN-D station identifier
+        aggregates_dir (str or Path): Aggregate store root
+        append (bool): records only hold new days; the months they touch are
+            replaced in the existing monthly table and the yearly and
+            climatology tables are rebuilt from it, without rereading any
+            daily data
+    """
+    monthly = monthly_aggregates(records)
+    if append:
+        existing = read_aggregates("monthly", [station_id], aggregates_dir=aggregates_dir)
+        if not existing.empty:
+            existing = existing.drop(columns="STATION_ID")
+            existing["element"] = existing["element"].astype(str)
+            keys = ["element", "DATE"]
+            touched = existing.set_index(keys).index.isin(monthly.set_index(keys).index)
+            monthly = pd.concat([existing[~touched], monthly], ignore_index=True)
+            monthly = monthly.sort_values(keys).reset_index(drop=True)
+
+    _write_level(monthly, "monthly", station_id, aggregates_dir)
+    _write_level(yearly_aggregates(monthly), "yearly", station_id, aggregates_dir)
+    _write_level(climatology(monthly), "climatology", station_id, aggregates_dir)
+
+
+def aggregates_exist(level="monthly", aggregates_dir=DEFAULT_AGGREGATES_DIR):
+    return any((Path(aggregates_dir) / level).glob("STATION_ID=*"))
+
+
+def read_aggregates(level, station_ids=None, elements=None, aggregates_dir=DEFAULT_AGGREGATES_DIR):
+    """
+    Read one level of the aggregate store.
+
+    Args:
+        level (str): "monthly", "yearly" or "climatology"
+        station_ids (list, optional): Stations to read (default: all)
+        elements (list, optional): Elements to read (default: all)
+        aggregates_dir (str or Path): Aggregate store root
+
+    Returns:
+        pd.DataFrame: LEVEL_COLUMNS[level] plus STATION_ID
+    """
+    if level not in LEVEL_COLUMNS:
+        raise ValueError(f"Unknown aggregate level: {level}")
+    columns = LEVEL_COLUMNS[level] + ["STATION_ID"]
+    path = Path(aggregates_dir) / level
+    if station_ids is not None:
+        paths = [_level_path(level, sid, aggregates_dir) for sid in station_ids]
+        paths = [str(p) for p in paths if p.exists()]
+        if not paths:
+            return pd.DataFrame(columns=columns)
+        dataset = ds.dataset(paths, format="parquet", partitioning=PARTITIONING, partition_base_dir=str(path))
+    else:
+        if not path.exists():
+            return pd.DataFrame(columns=columns)
+        dataset = ds.dataset(str(path), format="parquet", partitioning=PARTITIONING)
+    filter_ = ds.field("element").isin(list(elements)) if elements is not None else None
+    df = dataset.to_table(filter=filter_).to_pandas()
+    if "DATE" in df.columns:
+        df["DATE"] = df["DATE"].astype("datetime64[ns]")
+    return df[columns]
+
+
+def monthly_series(station_ids, element, aggregates_dir=DEFAULT_AGGREGATES_DIR):
+    """
+    Monthly mean series of one element over one or more stations, in the
+    shape clean_data returns (month-end DatetimeIndex, 'value' column, gaps
+    filled forward then backward).
+
+    Several stations are combined with count-weighted means, which equals
+    the monthly mean of all their daily values.
+    """
+    monthly = read_aggregates("monthly", station_ids, [element], aggregates_dir)
+    if monthly.empty:
+        return pd.DataFrame(columns=["value"], index=pd.DatetimeIndex([], name="DATE"))
+    total = (monthly["mean"] * monthly["count"]).groupby(monthly["DATE"]).sum()
+    count = monthly["count"].groupby(monthly["DATE"]).sum()
+    series = (total / count).sort_index().asfreq("ME")
+    return series.ffill().bfill().to_frame("value").rename_axis("DATE")
+
+
+def yearly_means(station_ids, element, aggregates_dir=DEFAULT_AGGREGATES_DIR):
+    """Count-weighted yearly mean of one element over one or more stations, indexed by year."""
+    yearly = read_aggregates("yearly", station_ids, [element], aggregates_dir)
+    total = (yearly["mean"] * yearly["count"]).groupby(yearly["year"]).sum()
+    count = yearly["count"].groupby(yearly["year"]).sum()
+    return (total / count).astype("float64").sort_index()
+
+
+def yearly_means_from_daily(records):
+    """
+    Yearly mean of daily records, the statistic yearly_means reads from the
+    store, for when the store has not been built.
+
+    Args:
+        records (pd.DataFrame): Daily values with a DATE column or a
+            DatetimeIndex (as the app's station frames have)
+
+    Returns:
+        pd.Series: Mean value indexed by year
+    """
+    if "DATE" in records.columns:
+        years = pd.to_datetime(records["DATE"]).dt.year
+    else:
+        years = pd.DatetimeIndex(records.index).year
+    return records["value"].groupby(years).mean().astype("float64").rename_axis("year")
+
+
+def build_from_dataset(dataset_dir, aggregates_dir=DEFAULT_AGGREGATES_DIR):
+    """Materialize the aggregates of every station in a station dataset."""
+    import station_dataset
+
+    station_ids = sorted(
+        {p.name.split("=", 1)[1] for p in Path(dataset_dir).glob("element=*/STATION_ID=*")}
+    )
+    for station_id in station_ids:
+        records = station_dataset.read_station_dataset(
+            dataset_dir, station_ids=[station_id], columns=["DATE", "value", "element"]
+        )
+        write_station_aggregates(records, station_id, aggregates_dir)
+    print(f"Built aggregates for {len(station_ids)} stations in {aggregates_dir}")
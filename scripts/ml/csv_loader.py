@@ -0,0 +1,111 @@
+import os
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # pragma: no cover - pandas fallback below
+    pa = None
+
+# Schema of the station CSVs (data/stations/<ID>_data.csv and the combined
+# <county>_stations_data.csv): DATE is ISO formatted, the rest is fixed
+STATION_CSV_DTYPES = {
+    "value": "float64",
+    "element": "category",
+    "STATION_ID": "category",
+}
+STATION_CSV_COLUMNS = ["DATE", "value", "element", "STATION_ID"]
+DATE_FORMAT = "%Y-%m-%d"
+
+# Older files used a lowercase date column
+_COLUMN_ALIASES = {"date": "DATE"}
+
+
+def _header(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.readline().strip().split(",")
+
+
+def _read_with_pyarrow(path, columns, names, elements):
+    types = {
+        names["DATE"]: pa.date32(),
+        names["value"]: pa.float64(),
+        names["element"]: pa.dictionary(pa.int32(), pa.string()),
+        names["STATION_ID"]: pa.dictionary(pa.int32(), pa.string()),
+    }
+    read_columns = list(dict.fromkeys(columns + (["element"] if elements is not None else [])))
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: types[name] for name in types if name in names.values()},
+            include_columns=[names[c] for c in read_columns],
+        ),
+    )
+    if elements is not None:
+        # Filter on the dictionary-encoded column before anything reaches pandas
+        element_column = table.column(names["element"]).cast(pa.string())
+        table = table.filter(pc.is_in(element_column, value_set=pa.array(list(elements))))
+    table = table.rename_columns([_COLUMN_ALIASES.get(name, name) for name in table.column_names])
+    df = table.select(columns).to_pandas(date_as_object=False)
+    if "DATE" in df.columns:
+        df["DATE"] = df["DATE"].astype("datetime64[ns]")
+    return df
+
+
+def _read_with_pandas(path, columns, names, elements):
+    read_columns = list(dict.fromkeys(columns + (["element"] if elements is not None else [])))
+    df = pd.read_csv(
+        path,
+        usecols=[names[c] for c in read_columns],
+        dtype={names[c]: STATION_CSV_DTYPES[c] for c in read_columns if c in STATION_CSV_DTYPES},
+    ).rename(columns=_COLUMN_ALIASES)
+    if elements is not None:
+        df = df[df["element"].isin(list(elements))]
+    if "DATE" in df.columns:
+        df["DATE"] = pd.to_datetime(df["DATE"], format=DATE_FORMAT, errors="coerce")
+    return df[columns].reset_index(drop=True)
+
+
+def read_station_csv(path, columns=None, elements=None, engine=None):
+    """
+    Read a station CSV with its known schema instead of pandas inference.
+
+    Args:
+        path (str or Path): data/stations/<ID>_data.csv or a combined county CSV
+        columns (list, optional): Subset of DATE, value, element, STATION_ID to
+            return (default: those present in the file)
+        elements (list, optional): Keep only these elements; applied while
+            reading with the pyarrow engine
+        engine (str, optional): "pyarrow" or "pandas"; defaults to pyarrow
+            when it is installed
+
+    Returns:
+        pd.DataFrame: DATE as datetime64[ns], value as float64, and element /
+        STATION_ID as categoricals
+    """
+    header = _header(path)
+    names = {_COLUMN_ALIASES.get(name, name): name for name in header}
+    if columns is None:
+        columns = [c for c in STATION_CSV_COLUMNS if c in names]
+    missing = [c for c in columns if c not in names]
+    if missing:
+        raise ValueError(f"{path} has no column(s) {missing}")
+
+    if engine is None:
+        engine = "pyarrow" if pa is not None else "pandas"
+    if engine == "pyarrow":
+        df = _read_with_pyarrow(path, list(columns), names, elements)
+    else:
+        df = _read_with_pandas(path, list(columns), names, elements)
+    for column in ("element", "STATION_ID"):
+        if column in df.columns and df[column].dtype != "category":
+            df[column] = df[column].astype("category")
+    return df
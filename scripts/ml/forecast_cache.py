@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+# Default cache location: <repo>/data/forecast_cache
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "forecast_cache"
+
+# Eviction limits: total pickled size on disk and fitted models kept in memory
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+DEFAULT_MAX_MODELS = 32
+
+
+def series_fingerprint(series, config):
+    """
+    Hash a series (index and values) together with the model configuration.
+
+    Args:
+        series (pd.Series): Series with a DatetimeIndex
+        config (dict): JSON-serializable model settings
+
+    Returns:
+        str: Hex digest identifying the fitted model
+    """
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(series.index.asi8).tobytes())
+    digest.update(np.ascontiguousarray(series.to_numpy(dtype="float64")).tobytes())
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ForecastCache:
+    """
+    Two-level cache of fitted forecasting models keyed by series_fingerprint.
+
+    Fitted models are pickled to disk and the most recently used ones are
+    also kept in memory together with the forecasts already computed from
+    them, so a repeated request is a dictionary lookup and a new horizon for
+    an unchanged series only calls predict() on the cached model.
+
+    Disk entries are evicted least-recently-used first once they exceed
+    max_bytes; memory holds at most max_models entries.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, max_models=DEFAULT_MAX_MODELS):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_models = max_models
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key):
+        """
+        Return the cached entry for key, or None.
+
+        Returns:
+            dict: {"model": fitted model, "rmse": in-sample RMSE,
+            "forecasts": {n_periods: ndarray}}
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                stored = pickle.load(f)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        entry = {"model": stored["model"], "rmse": stored["rmse"], "forecasts": {}}
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key, model, rmse):
+        """Store a freshly fitted model and return its entry."""
+        entry = {"model": model, "rmse": rmse, "forecasts": {}}
+        self._remember(key, entry)
+
+        # Write to a temp file and rename so concurrent readers never see a partial pickle
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({"model": model, "rmse": rmse, "stored_at": time.time()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_models:
+                self._memory.popitem(last=False)
+
+    def evict(self):
+        """Drop least recently used disk entries until under max_bytes."""
+        with self._lock:
+            try:
+                entries = [
+                    (path.stat().st_mtime, path.stat().st_size, path)
+                    for path in self.cache_dir.glob("*.pkl")
+                ]
+            except OSError:
+                return
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                self._memory.pop(path.stem, None)
+                total -= size
+
+    def clear(self):
+        """Remove every cached model, in memory and on disk."""
+        with self._lock:
+            self._memory.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -6,77 +6,223 @@ from pathlib import Path
 current_dir = Path(__file__).resolve().parent
 sys.path.append(str(current_dir))
 
+import time
+import threading
 import requests
 import ghcnd_parse
+from http_cache import HttpCache, DEFAULT_CACHE_DIR
 import csv
 import pandas as pd
-from io import StringIO
+from urllib.parse import urlparse
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 
+# Root of the GHCN-D distribution; point it at a local server for testing
+BASE_URL = "https://www.ncei.noaa.gov/pub/data/ghcn/daily"
 
-def get_ghcnd_countries():
-    # Fetch data from the GHCN-D countries dataset
-    url = "https://www.ncei.noaa.gov/pub/data/ghcn/daily/ghcnd-countries.txt"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.text
-        # Create a StringIO object to simulate a file
-        data_io = StringIO(data)
-        df = ghcnd_parse.parse_countries_file(data_io)
-        return df
-    else:
+# Columns of ghcnd-stations.csv
+STATION_COLUMNS = [
+    "ID",
+    "LATITUDE",
+    "LONGITUDE",
+    "ELEVATION",
+    "STATE",
+    "NAME",
+    "GSN FLAG",
+    "HCN/CRN FLAG",
+    "WMO ID",
+]
+
+# HTTP statuses worth retrying (rate limited or transient server errors)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Longest Retry-After delay honored, in seconds
+MAX_RETRY_AFTER = 60
+
+# Serve every download from the on-disk cache only, without network access
+OFFLINE = os.environ.get("NEURALCLIMATE_OFFLINE", "").lower() in ("1", "true", "yes")
+HTTP_CACHE_DIR = os.environ.get("NEURALCLIMATE_HTTP_CACHE", str(DEFAULT_CACHE_DIR))
+
+_session = None
+_session_lock = threading.Lock()
+_http_cache = None
+
+
+def get_session(pool_size=16):
+    """
+    Return the shared requests.Session used for all GHCN-D downloads.
+    Connections (and their TLS handshakes) are kept alive and reused across
+    calls and threads instead of being reopened for every station.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+class RateLimiter:
+    """
+    Thread-safe per-host rate limiter: consecutive requests to the same host
+    are spaced at least 1 / requests_per_second apart.
+    """
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def retry_delay(headers, backoff, attempt):
+    """
+    Seconds to wait before retrying: the server's Retry-After (seconds or an
+    HTTP date, capped at MAX_RETRY_AFTER) when present, else exponential
+    backoff (backoff, 2*backoff, ...).
+    """
+    retry_after = headers.get("Retry-After") if headers is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), MAX_RETRY_AFTER)
+    return backoff * 2 ** attempt
+
+
+def request_with_retry(url, retries=3, backoff=0.5, rate_limiter=None, session=None, **kwargs):
+    """
+    GET a URL through the shared session, retrying connection errors and
+    retryable HTTP statuses with exponential backoff (backoff, 2*backoff, ...),
+    or after the server's Retry-After delay when it sends one.
+    Raises requests.HTTPError for non-retryable or exhausted failures.
+    """
+    session = session or get_session()
+    for attempt in range(retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait(url)
+        headers = None
+        try:
+            response = session.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                response.raise_for_status()
+                return response
+            headers = response.headers
+            response.close()
+        time.sleep(retry_delay(headers, backoff, attempt))
+
+
+def get_http_cache():
+    """Return the shared HttpCache that all downloads in this module go through."""
+    global _http_cache
+    with _session_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(HTTP_CACHE_DIR, offline=OFFLINE)
+        return _http_cache
+
+
+def set_offline(offline=True):
+    """Serve all GHCN-D files purely from the HTTP cache (no network requests)."""
+    get_http_cache().offline = offline
+
+
+def open_cached(url, **request_kwargs):
+    """
+    Open url through the HTTP cache, revalidating a cached copy with a
+    conditional GET. Returns a binary file object over the body.
+    request_kwargs (retries, backoff, rate_limiter) go to request_with_retry.
+    """
+    def request(url, headers):
+        return request_with_retry(url, headers=headers, stream=True, **request_kwargs)
+
+    return get_http_cache().open(url, request)
+
+
+def download_cached(url, **request_kwargs):
+    """
+    Download or revalidate url into the HTTP cache without reading it.
+    Returns the path of the gzip-compressed body (see open_cached).
+    """
+    def request(url, headers):
+        return request_with_retry(url, headers=headers, stream=True, **request_kwargs)
+
+    return get_http_cache().fetch(url, request)
+
+
+def cache_version(url):
+    """
+    Version of url's cached copy, for keying files derived from it (see
+    HttpCache.entry); unchanged by 304 revalidations.
+    """
+    meta = get_http_cache().entry(url)
+    if meta is None:
+        return None
+    return [meta.get("stored_at"), meta.get("size"), meta.get("etag")]
+
+
+def parse_cached_metadata(url, parse):
+    """
+    Parse a metadata file straight from its HTTP cache body. The parser's
+    Parquet sidecar is keyed on the cached version, so an unchanged file is
+    read back from the sidecar instead of being decompressed and re-parsed.
+    """
+    return parse(get_http_cache().body_path(url), cache_key=cache_version(url))
+
+
+def _parse_metadata(url, parse):
+    # Download or revalidate a metadata text file, then parse it from the cache
+    try:
+        download_cached(url)
+    except requests.HTTPError as e:
         raise Exception(
-            f"Failed to fetch data. HTTP Status Code: {response.status_code}"
+            f"Failed to fetch data. HTTP Status Code: {e.response.status_code}"
         )
+    return parse_cached_metadata(url, parse)
+
+
+def get_ghcnd_countries():
+    # Fetch data from the GHCN-D countries dataset
+    return _parse_metadata(f"{BASE_URL}/ghcnd-countries.txt", ghcnd_parse.parse_countries_file)
 
 
 def get_ghcnd_inventory():
     # Fetch data from the GHCN-D inventory dataset
-    url = "https://www.ncei.noaa.gov/pub/data/ghcn/daily/ghcnd-inventory.txt"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.text
-        # Create a StringIO object to simulate a file
-        data_io = StringIO(data)
-        df = ghcnd_parse.parse_inventory_file(data_io)
-        return df
-    else:
-        raise Exception(
-            f"Failed to fetch data. HTTP Status Code: {response.status_code}"
-        )
+    return _parse_metadata(f"{BASE_URL}/ghcnd-inventory.txt", ghcnd_parse.parse_inventory_file)
 
 
 def get_ghcnd_states():
     # Fetch data from the GHCN-D states dataset
-    url = "https://www.ncei.noaa.gov/pub/data/ghcn/daily/ghcnd-states.txt"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.text
-        # Create a StringIO object to simulate a file
-        data_io = StringIO(data)
-        df = ghcnd_parse.parse_states_file(data_io)
-        return df
-    else:
-        raise Exception(
-            f"Failed to fetch data. HTTP Status Code: {response.status_code}"
-        )
+    return _parse_metadata(f"{BASE_URL}/ghcnd-states.txt", ghcnd_parse.parse_states_file)
 
 
 def get_ghcnd_stations():
     # Fetch data from the GHCN-D stations dataset
-    url = "https://www.ncei.noaa.gov/pub/data/ghcn/daily/ghcnd-stations.csv"
-    column_names = [
-        "ID",
-        "LATITUDE",
-        "LONGITUDE",
-        "ELEVATION",
-        "STATE",
-        "NAME",
-        "GSN FLAG",
-        "HCN/CRN FLAG",
-        "WMO ID",
-    ]
+    url = f"{BASE_URL}/ghcnd-stations.csv"
     try:
-        stations_df = pd.read_csv(url, names=column_names, on_bad_lines="skip")
+        with open_cached(url) as f:
+            stations_df = pd.read_csv(f, names=STATION_COLUMNS, on_bad_lines="skip")
         return stations_df
     except requests.exceptions.RequestException as e:
         raise Exception(f"Failed to fetch data from {url}. Error: {e}")
@@ -86,19 +232,86 @@ def get_ghcnd_stations():
         raise Exception(f"An unexpected error occurred. Error: {e}")
 
 
-def get_ghcnd_data_by_station(station_id):
-    # Construct the URL for the .dly file.
-    url = f"https://www.ncei.noaa.gov/pub/data/ghcn/daily/all/{station_id}.dly"
+def _open_station_stream(station_id, **request_kwargs):
+    # Open the station's .dly file through the HTTP cache as a line stream.
+    url = f"{BASE_URL}/all/{station_id}.dly"
+    print(f"Downloading data from: {url}")
+    return open_cached(url, **request_kwargs)
+
+
+def download_station(station_id, **request_kwargs):
+    # Fetch the station's .dly file into the HTTP cache; returns the gzip body path
+    url = f"{BASE_URL}/all/{station_id}.dly"
     print(f"Downloading data from: {url}")
+    return download_cached(url, **request_kwargs)
 
+
+def get_ghcnd_data_by_station(station_id, **filters):
+    # filters (elements, start_year, end_year, since, before, drop_qflagged) are pushed down
+    # into the parser so unwanted records are skipped before decoding.
     try:
-        response = requests.get(url)
-        response.raise_for_status()
+        stream = _open_station_stream(station_id)
     except Exception as e:
         print(f"Error downloading file: {e}")
         return
 
-    # Split the downloaded text into lines and parse it.
-    lines = response.text.splitlines()
-    df = ghcnd_parse.dly_to_dataframe_from_lines(lines)
+    # Parse the records straight from the stream instead of holding the
+    # whole body as text and a list of lines.
+    with stream:
+        df = ghcnd_parse.dly_to_dataframe_from_lines(stream, **filters)
     return df
+
+
+def iter_ghcnd_data_by_station(station_id, chunk_rows=500_000, **filters):
+    """
+    Stream a station's .dly file and yield parsed DataFrame chunks of at most
+    chunk_rows rows, keeping peak memory bounded for long-record stations.
+    Keyword filters are passed to ghcnd_parse.iter_dly_dataframes.
+    """
+    with _open_station_stream(station_id) as stream:
+        yield from ghcnd_parse.iter_dly_dataframes(stream, chunk_rows=chunk_rows, **filters)
+
+def fetch_stations(
+    station_ids,
+    max_workers=8,
+    requests_per_second=None,
+    retries=3,
+    backoff=0.5,
+    station_filters=None,
+    **filters,
+):
+    """
+    Download and parse many stations concurrently over the shared session.
+
+    Args:
+        station_ids (iterable of str): GHCN-D station identifiers
+        max_workers (int): Maximum number of concurrent downloads
+        requests_per_second (float, optional): Per-host request rate limit
+        retries (int): Retries per station for connection errors and 429/5xx
+        backoff (float): Initial retry delay in seconds, doubled on each retry
+        station_filters (dict, optional): {station_id: {filter: value}} merged
+            over filters for individual stations (e.g. per-station since)
+        **filters: Record filters passed to the .dly parser
+
+    Yields:
+        tuple: (station_id, DataFrame or None, exception or None), in the
+        order the stations complete
+    """
+    rate_limiter = RateLimiter(requests_per_second) if requests_per_second else None
+
+    def fetch_one(station_id):
+        stream = _open_station_stream(
+            station_id, retries=retries, backoff=backoff, rate_limiter=rate_limiter
+        )
+        station_filter = {**filters, **(station_filters or {}).get(station_id, {})}
+        with stream:
+            return ghcnd_parse.dly_to_dataframe_from_lines(stream, **station_filter)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(fetch_one, station_id): station_id for station_id in station_ids}
+        for future in as_completed(futures):
+            station_id = futures[future]
+            try:
+                yield station_id, future.result(), None
+            except Exception as e:
+                yield station_id, None, e
@@ -0,0 +1,246 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import asyncio
+import aiohttp
+from functools import partial
+from contextlib import asynccontextmanager, nullcontext
+import pandas as pd
+from io import StringIO
+import ghcnd_fetch
+import ghcnd_parse
+
+# Default number of concurrent requests for a refresh
+MAX_CONCURRENCY = 16
+
+# Number of .dly records parsed per chunk while a station body streams in
+STREAM_CHUNK_RECORDS = 2000
+
+# Retries per request for connection errors and 429/5xx, and the initial
+# retry delay in seconds (doubled on each retry unless the server sends Retry-After)
+RETRIES = 3
+BACKOFF = 0.5
+
+
+def _session_or_new(session):
+    # Use the caller's session without closing it, or open a one-off session
+    if session is not None:
+        return nullcontext(session)
+    return aiohttp.ClientSession()
+
+
+@asynccontextmanager
+async def _open(session, url, retries=RETRIES, backoff=BACKOFF, request_headers=None):
+    """
+    GET url, retrying connection errors and ghcnd_fetch.RETRY_STATUS_CODES
+    like ghcnd_fetch.request_with_retry. Yields the final response, whatever
+    its status, and releases it afterwards.
+    """
+    for attempt in range(retries + 1):
+        headers = None
+        try:
+            response = await session.get(url, headers=request_headers)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+        else:
+            if response.status not in ghcnd_fetch.RETRY_STATUS_CODES or attempt == retries:
+                try:
+                    yield response
+                finally:
+                    response.release()
+                return
+            headers = response.headers
+            response.release()
+        await asyncio.sleep(ghcnd_fetch.retry_delay(headers, backoff, attempt))
+
+
+async def _get_text(session, url, semaphore=None):
+    # Fetch a text file, holding a semaphore slot for the whole download
+    async with semaphore or nullcontext():
+        async with _open(session, url) as response:
+            if response.status != 200:
+                raise Exception(f"Failed to fetch data. HTTP Status Code: {response.status}")
+            return await response.text()
+
+
+async def _download_cached(session, url, semaphore=None):
+    """
+    Download or revalidate url into ghcnd_fetch's HTTP cache (the same cache
+    and conditional GET as ghcnd_fetch.download_cached). Compression and the
+    disk write run on the loop's default executor.
+    """
+    cache = ghcnd_fetch.get_http_cache()
+    if cache.offline:
+        return cache.fetch(url, None)
+    loop = asyncio.get_running_loop()
+    request_headers = cache.request_headers(url)
+    try:
+        async with semaphore or nullcontext():
+            async with _open(session, url, request_headers=request_headers) as response:
+                if response.status == 304 and request_headers:
+                    cache.touch(url)
+                elif response.status != 200:
+                    raise Exception(f"Failed to fetch data. HTTP Status Code: {response.status}")
+                else:
+                    body = await response.read()
+                    await loop.run_in_executor(None, cache.store, url, [body], response.headers)
+    except Exception as e:
+        if cache.entry(url) is None:
+            raise
+        print(f"Request for {url} failed ({e}); using cached copy")
+        cache.touch(url)
+    return cache.body_path(url)
+
+
+async def _get_metadata(session, url, parse, semaphore=None):
+    # Parse from the HTTP cache body, reusing the parser's sidecar while the file is unchanged
+    async with _session_or_new(session) as s:
+        await _download_cached(s, url, semaphore)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, ghcnd_fetch.parse_cached_metadata, url, parse)
+
+
+async def get_ghcnd_countries(session=None, semaphore=None):
+    url = f"{ghcnd_fetch.BASE_URL}/ghcnd-countries.txt"
+    return await _get_metadata(session, url, ghcnd_parse.parse_countries_file, semaphore)
+
+
+async def get_ghcnd_inventory(session=None, semaphore=None):
+    url = f"{ghcnd_fetch.BASE_URL}/ghcnd-inventory.txt"
+    return await _get_metadata(session, url, ghcnd_parse.parse_inventory_file, semaphore)
+
+
+async def get_ghcnd_states(session=None, semaphore=None):
+    url = f"{ghcnd_fetch.BASE_URL}/ghcnd-states.txt"
+    return await _get_metadata(session, url, ghcnd_parse.parse_states_file, semaphore)
+
+
+async def get_ghcnd_stations(session=None, semaphore=None):
+    url = f"{ghcnd_fetch.BASE_URL}/ghcnd-stations.csv"
+    async with _session_or_new(session) as s:
+        text = await _get_text(s, url, semaphore)
+    try:
+        return pd.read_csv(
+            StringIO(text), names=ghcnd_fetch.STATION_COLUMNS, on_bad_lines="skip"
+        )
+    except pd.errors.ParserError as e:
+        raise Exception(f"Failed to parse the CSV data. Error: {e}")
+
+
+async def get_ghcnd_data_by_station(station_id, session=None, semaphore=None, **filters):
+    """
+    Download and parse a station's .dly file. The body is parsed in chunks of
+    STREAM_CHUNK_RECORDS records as it arrives, and records rejected by the
+    element/year filters are dropped before they are buffered. Chunks are
+    parsed on the loop's default executor so other downloads keep streaming.
+    """
+    url = f"{ghcnd_fetch.BASE_URL}/all/{station_id}.dly"
+    header_filter = ghcnd_parse.make_dly_header_filter(
+        **{key: filters.pop(key) for key in ghcnd_parse.HEADER_FILTER_KEYS if key in filters}
+    )
+
+    loop = asyncio.get_running_loop()
+    parse = partial(ghcnd_parse.dly_to_dataframe_from_lines, **filters)
+    chunks = []
+    batch = []
+    async with _session_or_new(session) as s:
+        async with semaphore or nullcontext():
+            async with _open(s, url) as response:
+                response.raise_for_status()
+                async for line in response.content:
+                    if len(line) < ghcnd_parse.DLY_RECORD_LENGTH:
+                        continue
+                    if header_filter is not None and not header_filter(line):
+                        continue
+                    batch.append(line)
+                    if len(batch) >= STREAM_CHUNK_RECORDS:
+                        chunks.append(await loop.run_in_executor(None, parse, batch))
+                        batch = []
+    if batch or not chunks:
+        chunks.append(await loop.run_in_executor(None, parse, batch))
+    return ghcnd_parse.concat_dly_dataframes(chunks)
+
+
+async def fetch_stations(station_ids, session=None, max_concurrency=MAX_CONCURRENCY, **filters):
+    """
+    Download and parse many stations on one event loop.
+
+    Yields:
+        tuple: (station_id, DataFrame or None, exception or None), in the
+        order the stations complete
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_one(s, station_id):
+        try:
+            df = await get_ghcnd_data_by_station(station_id, s, semaphore, **dict(filters))
+            return station_id, df, None
+        except Exception as e:
+            return station_id, None, e
+
+    async with _session_or_new(session) as s:
+        tasks = [asyncio.ensure_future(fetch_one(s, station_id)) for station_id in station_ids]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def refresh(station_ids, max_concurrency=MAX_CONCURRENCY, **filters):
+    """
+    Download the four metadata files and every station in station_ids
+    concurrently, with at most max_concurrency requests in flight.
+
+    Returns:
+        dict: {"countries", "inventory", "states", "stations": DataFrame,
+               "station_data": {station_id: DataFrame},
+               "errors": {name or station_id: exception}}
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        metadata_getters = {
+            "countries": get_ghcnd_countries,
+            "inventory": get_ghcnd_inventory,
+            "states": get_ghcnd_states,
+            "stations": get_ghcnd_stations,
+        }
+        metadata_tasks = {
+            name: asyncio.ensure_future(getter(session, semaphore))
+            for name, getter in metadata_getters.items()
+        }
+        station_tasks = {
+            station_id: asyncio.ensure_future(
+                get_ghcnd_data_by_station(station_id, session, semaphore, **dict(filters))
+            )
+            for station_id in station_ids
+        }
+        await asyncio.gather(
+            *metadata_tasks.values(), *station_tasks.values(), return_exceptions=True
+        )
+
+    result = {"station_data": {}, "errors": {}}
+    for name, task in metadata_tasks.items():
+        if task.exception() is not None:
+            result["errors"][name] = task.exception()
+            result[name] = None
+        else:
+            result[name] = task.result()
+    for station_id, task in station_tasks.items():
+        if task.exception() is not None:
+            result["errors"][station_id] = task.exception()
+        else:
+            result["station_data"][station_id] = task.result()
+    return result
+
+
+def refresh_all(station_ids, max_concurrency=MAX_CONCURRENCY, **filters):
+    """Blocking wrapper around refresh() for scripts."""
+    return asyncio.run(refresh(station_ids, max_concurrency=max_concurrency, **filters))
@@ -1,127 +1,266 @@
+import os
+import gzip
+import json
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
 from io import StringIO
 
 
-def parse_countries_file(input_path):
+# Column specs for the GHCND metadata files: (name, start, end, type), with
+# 0-based [start, end) character offsets; end=None runs to the end of the line
+COUNTRIES_COLSPECS = [
+    ("country_code", 0, 2, str),
+    ("country_name", 3, None, str),
+]
+STATES_COLSPECS = [
+    ("state_code", 0, 2, str),
+    ("state_name", 3, None, str),
+]
+INVENTORY_COLSPECS = [
+    ("id", 0, 11, str),
+    ("latitude", 12, 20, float),
+    ("longitude", 21, 30, float),
+    ("element", 31, 35, str),
+    ("first_year", 36, 40, int),
+    ("last_year", 41, 45, int),
+]
+# Same column names as ghcnd_fetch.get_ghcnd_stations (ghcnd-stations.csv)
+STATIONS_COLSPECS = [
+    ("ID", 0, 11, str),
+    ("LATITUDE", 12, 20, float),
+    ("LONGITUDE", 21, 30, float),
+    ("ELEVATION", 31, 37, float),
+    ("STATE", 38, 40, str),
+    ("NAME", 41, 71, str),
+    ("GSN FLAG", 72, 75, str),
+    ("HCN/CRN FLAG", 76, 79, str),
+    ("WMO ID", 80, 85, str),
+]
+
+# Bump when the parsed output changes so stale sidecar caches are ignored
+FIXED_WIDTH_CACHE_VERSION = 1
+
+
+def _read_text(input_path):
+    """Read a file path (gzip-compressed if it ends in .gz), file-like object or iterable of lines into one string."""
+    if isinstance(input_path, (str, os.PathLike)):
+        opener = gzip.open if os.fspath(input_path).endswith(".gz") else open
+        with opener(input_path, "rt", encoding="utf-8") as f:
+            return f.read()
+    if hasattr(input_path, "read"):
+        return input_path.read()
+    return "".join(line if line.endswith("\n") else line + "\n" for line in input_path)
+
+
+def _decode_fixed_floats(chars):
+    """
+    Decode right-aligned decimal numbers (e.g. " -96.7012") from a
+    (n, width) character code array. Returns float64 with NaN for invalid fields.
+    """
+    # Walk the few character positions over contiguous (n,) columns
+    columns = np.ascontiguousarray(chars.T)
+    n = chars.shape[0]
+    mantissa = np.zeros(n, dtype=np.int64)
+    decimals = np.zeros(n, dtype=np.int64)
+    points = np.zeros(n, dtype=np.int64)
+    minuses = np.zeros(n, dtype=np.int64)
+    any_digit = np.zeros(n, dtype=bool)
+    valid = np.ones(n, dtype=bool)
+
+    for column in columns:
+        is_digit = (column >= ord("0")) & (column <= ord("9"))
+        is_point = column == ord(".")
+        is_minus = column == ord("-")
+        mantissa = np.where(is_digit, mantissa * 10 + (column.astype(np.int64) - ord("0")), mantissa)
+        decimals += is_digit & (points > 0)
+        points += is_point
+        minuses += is_minus
+        any_digit |= is_digit
+        valid &= is_digit | is_point | is_minus | (column == ord(" ")) | (column == 0)
+
+    # Both operands are exact, so the division is correctly rounded like float()
+    result = mantissa / 10.0 ** decimals
+    result[minuses > 0] *= -1
+    result[~(valid & any_digit & (points <= 1) & (minuses <= 1))] = np.nan
+    return result
+
+
+def _ascii_text_to_array(text):
+    """
+    Pack ASCII text into a (n_lines, max_line_length) uint8 array, padding short
+    lines with spaces, without splitting it into Python strings.
+    """
+    buffer = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    if len(buffer) == 0 or buffer[-1] != ord("\n"):
+        buffer = np.append(buffer, np.uint8(ord("\n")))
+    ends = np.flatnonzero(buffer == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    width = int(lengths.max())
+
+    # Gather every line as a window of the buffer, then blank out whatever
+    # follows the end of shorter lines
+    padded = np.concatenate((buffer, np.full(width, ord(" "), dtype=np.uint8)))
+    chars = np.lib.stride_tricks.sliding_window_view(padded, width)[starts]
+    chars[np.arange(width) >= lengths[:, None]] = ord(" ")
+    chars[chars == ord("\r")] = ord(" ")
+    return chars
+
+
+def _parse_fixed_width_text(text, colspecs):
+    """
+    Vectorized parse of fixed-width text. Lines are packed into a single
+    (n_lines, width) character code array; numeric columns are decoded with
+    array arithmetic and text columns are stripped once per distinct value.
+    """
+    if text.isascii():
+        chars = _ascii_text_to_array(text)
+        string_type = "S"
+    else:
+        lines = [line for line in text.splitlines() if line and not line.isspace()]
+        chars = np.array(lines or [""])  # fixed-width unicode, padded with NULs
+        chars = chars.view(np.uint32).reshape(len(chars), -1)
+        string_type = "U"
+
+    # Skip empty lines
+    chars = chars[((chars != ord(" ")) & (chars != 0)).any(axis=1)]
+    if len(chars) == 0:
+        return pd.DataFrame(
+            {name: pd.Series(dtype=object if kind is str else kind)
+             for name, _, _, kind in colspecs}
+        )
+    n_lines, width = chars.shape
+
+    columns = {}
+    for name, start, end, kind in colspecs:
+        end = width if end is None else min(end, width)
+        start = min(start, end)
+        if end == start:
+            columns[name] = np.full(n_lines, "" if kind is str else np.nan, dtype=object)
+            continue
+        field = np.ascontiguousarray(chars[:, start:end])
+        if kind is str:
+            uniques, codes = np.unique(
+                field.view(f"{string_type}{end - start}").ravel(), return_inverse=True
+            )
+            if string_type == "S":
+                uniques = [u.decode("ascii") for u in uniques]
+            columns[name] = np.array([str(u).strip() for u in uniques], dtype=object)[codes]
+        else:
+            values = _decode_fixed_floats(field)
+            if np.isnan(values).any():
+                bad_line = int(np.argmax(np.isnan(values))) + 1
+                raise ValueError(f"Invalid {name} value on non-empty line {bad_line}")
+            columns[name] = values.astype(kind)
+    return pd.DataFrame(columns)
+
+
+def parse_fixed_width_file(input_path, colspecs, cache=True, cache_key=None):
+    """
+    Parse a fixed-width GHCND metadata file into a typed DataFrame.
+
+    Args:
+        input_path (str, PathLike, file-like or iterable of lines): Source data
+        colspecs (list): (name, start, end, type) tuples, see INVENTORY_COLSPECS
+        cache (bool): For file paths, store the result in a Parquet sidecar
+            next to the file, keyed by the file's mtime and size, and reuse it
+            on later calls while the source file is unchanged.
+        cache_key (JSON-serializable, optional): Identifies the file's version
+            in place of its mtime and size, e.g. an HTTP cache entry's
+            stored_at and ETag (the cache touches unchanged entries)
+
+    Returns:
+        pd.DataFrame: A DataFrame with one column per column spec
+    """
+    if not (cache and isinstance(input_path, (str, os.PathLike))):
+        return _parse_fixed_width_text(_read_text(input_path), colspecs)
+
+    if cache_key is None:
+        stat = os.stat(input_path)
+        cache_key = [stat.st_mtime_ns, stat.st_size]
+    # Stored in the sidecar's schema metadata
+    key = json.dumps([
+        cache_key,
+        [(name, start, end, kind.__name__) for name, start, end, kind in colspecs],
+        FIXED_WIDTH_CACHE_VERSION,
+    ]).encode("utf-8")
+    sidecar_path = f"{os.fspath(input_path)}.parsed.parquet"
+    try:
+        cached = pq.read_table(sidecar_path)
+        if (cached.schema.metadata or {}).get(b"parse_key") == key:
+            return cached.to_pandas()
+    except Exception:
+        pass  # Missing, stale or unreadable sidecar: parse the source file
+
+    df = _parse_fixed_width_text(_read_text(input_path), colspecs)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"parse_key": key})
+    tmp_path = f"{sidecar_path}.tmp"
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, sidecar_path)
+    except OSError as e:
+        print(f"Could not write parse cache {sidecar_path}: {e}")
+    return df
+
+
+def parse_countries_file(input_path, cache_key=None):
     """
     Parse the GHCND countries file and convert it to a pandas DataFrame.
 
     Args:
         input_path (str or StringIO): Path to the input ghcnd-countries.txt file or a StringIO object
+        cache_key (optional): Version of the file for the parse cache, see parse_fixed_width_file
 
     Returns:
         pd.DataFrame: A DataFrame containing the parsed countries data
     """
-    countries_data = []
-
-    # Handle both file paths and StringIO objects
-    if isinstance(input_path, str):
-        # Read and parse the input file
-        with open(input_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():  # Skip empty lines
-                    code = line[0:2].strip()
-                    name = line[3:].strip()
-                    countries_data.append([code, name])
-    else:
-        # Handle StringIO object
-        for line in input_path:
-            if line.strip():  # Skip empty lines
-                code = line[0:2].strip()
-                name = line[3:].strip()
-                countries_data.append([code, name])
-
-    # Create a pandas DataFrame
-    df = pd.DataFrame(countries_data, columns=["country_code", "country_name"])
-    return df
+    return parse_fixed_width_file(input_path, COUNTRIES_COLSPECS, cache_key=cache_key)
 
 
-def parse_inventory_file(input_path):
+def parse_inventory_file(input_path, cache_key=None):
     """
     Parse the GHCND inventory file and convert it to a pandas DataFrame.
 
     Args:
         input_path (str or StringIO): Path to the input ghcnd-inventory.txt file or a StringIO object
+        cache_key (optional): Version of the file for the parse cache, see parse_fixed_width_file
 
     Returns:
         pd.DataFrame: A DataFrame containing the parsed inventory data
     """
-    inventory_data = []
-
-    # Handle both file paths and StringIO objects
-    if isinstance(input_path, str):
-        # Read and parse the input file
-        with open(input_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():  # Skip empty lines
-                    # Parse fixed-width fields
-                    station_id = line[0:11].strip()
-                    latitude = float(line[12:20].strip())
-                    longitude = float(line[21:30].strip())
-                    element = line[31:35].strip()
-                    first_year = int(line[36:40].strip())
-                    last_year = int(line[41:45].strip())
-
-                    inventory_data.append(
-                        [station_id, latitude, longitude, element, first_year, last_year]
-                    )
-    else:
-        # Handle StringIO object
-        for line in input_path:
-            if line.strip():  # Skip empty lines
-                # Parse fixed-width fields
-                station_id = line[0:11].strip()
-                latitude = float(line[12:20].strip())
-                longitude = float(line[21:30].strip())
-                element = line[31:35].strip()
-                first_year = int(line[36:40].strip())
-                last_year = int(line[41:45].strip())
-
-                inventory_data.append(
-                    [station_id, latitude, longitude, element, first_year, last_year]
-                )
-
-    # Create a pandas DataFrame
-    df = pd.DataFrame(
-        inventory_data,
-        columns=["id", "latitude", "longitude", "element", "first_year", "last_year"],
-    )
-    return df
+    return parse_fixed_width_file(input_path, INVENTORY_COLSPECS, cache_key=cache_key)
 
 
 # Convert states text file to pandas DataFrame
-def parse_states_file(input_path):
+def parse_states_file(input_path, cache_key=None):
     """
     Parse the GHCND states file and convert it to a pandas DataFrame.
 
     Args:
         input_path (str or StringIO): Path to the input ghcnd-states.txt file or a StringIO object
+        cache_key (optional): Version of the file for the parse cache, see parse_fixed_width_file
 
     Returns:
         pd.DataFrame: A DataFrame containing the parsed states data
     """
-    states_data = []
-
-    # Handle both file paths and StringIO objects
-    if isinstance(input_path, str):
-        # Read and parse the input file
-        with open(input_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():  # Skip empty lines
-                    code = line[0:2].strip()
-                    name = line[3:].strip()
-                    states_data.append([code, name])
-    else:
-        # Handle StringIO object
-        for line in input_path:
-            if line.strip():  # Skip empty lines
-                code = line[0:2].strip()
-                name = line[3:].strip()
-                states_data.append([code, name])
-
-    # Create a pandas DataFrame
-    df = pd.DataFrame(states_data, columns=["state_code", "state_name"])
-    return df
+    return parse_fixed_width_file(input_path, STATES_COLSPECS, cache_key=cache_key)
+
+
+def parse_stations_file(input_path):
+    """
+    Parse the GHCND stations file and convert it to a pandas DataFrame.
+
+    Args:
+        input_path (str or StringIO): Path to the input ghcnd-stations.txt file or a StringIO object
+
+    Returns:
+        pd.DataFrame: A DataFrame with the same columns as ghcnd_fetch.get_ghcnd_stations
+    """
+    return parse_fixed_width_file(input_path, STATIONS_COLSPECS)
 
 
 #  Processing for GHCN-Daily data
@@ -191,11 +330,109 @@ def parse_dly_lines(lines):
     return records
 
 
-def dly_to_dataframe_from_lines(lines):
+def make_dly_header_filter(
+    elements=None, start_year=None, end_year=None, since=None, before=None
+):
+    """
+    Build a predicate that accepts or rejects a .dly line from its 21-character
+    header (station, year, month, element) without decoding the day slots.
+
+    Args:
+        elements (iterable of str, optional): Element codes to keep, e.g. ["TMAX", "TMIN"]
+        start_year (int, optional): First year to keep (inclusive)
+        end_year (int, optional): Last year to keep (inclusive)
+        since (dict, optional): {element: (year, month)}; records of that element
+            before that month are skipped (already ingested). The month itself
+            is kept: late-reported days and revised flags land in it after it
+            was first ingested
+        before (tuple, optional): (year, month); records from that month on are skipped
+
+    Returns:
+        callable or None: A function line -> bool, or None when nothing is filtered
+    """
+    if all(arg is None for arg in (elements, start_year, end_year, since, before)):
+        return None
+
+    if elements is not None:
+        elements = [element.ljust(4) for element in elements]
+        # Accept both str and bytes lines (files vs HTTP/gzip streams)
+        elements = set(elements) | {element.encode("ascii") for element in elements}
+
+    # Months are compared as year * 12 + month
+    since_months = {}
+    for element, (year, month) in (since or {}).items():
+        since_months[element.ljust(4)] = year * 12 + month
+        since_months[element.ljust(4).encode("ascii")] = year * 12 + month
+    before_month = before[0] * 12 + before[1] if before is not None else None
+    check_month = bool(since_months) or before_month is not None
+
+    def accept(line):
+        if elements is not None and line[17:21] not in elements:
+            return False
+        if start_year is not None or end_year is not None or check_month:
+            try:
+                year = int(line[11:15])
+                month = year * 12 + int(line[15:17])
+            except ValueError:
+                return False
+            if start_year is not None and year < start_year:
+                return False
+            if end_year is not None and year > end_year:
+                return False
+            if before_month is not None and month >= before_month:
+                return False
+            if month < since_months.get(line[17:21], -1):
+                return False
+        return True
+
+    return accept
+
+
+# Keyword arguments of make_dly_header_filter, accepted by the parse functions
+HEADER_FILTER_KEYS = ("elements", "start_year", "end_year", "since", "before")
+
+
+def dly_to_dataframe_from_lines(
+    lines,
+    engine="numpy",
+    elements=None,
+    start_year=None,
+    end_year=None,
+    drop_qflagged=False,
+    compact=False,
+    since=None,
+    before=None,
+):
     """
     Convert the parsed .dly file (given as lines) into a pandas DataFrame.
     Each row represents a single day's observation.
+
+    engine="numpy" decodes all records at once from a fixed-width byte
+    array; engine="python" uses the original per-line dict parser.
+    Both produce the same columns and dtypes.
+
+    elements, start_year, end_year, since and before (see
+    make_dly_header_filter) are checked against each line's header
+    so that rejected records are never decoded. drop_qflagged removes days
+    whose quality flag is set (failed a NOAA quality check).
+
+    compact=True (numpy engine only) returns COMPACT_COLUMNS instead:
+    categorical station_id/element/flags, a datetime64 DATE column in place
+    of year/month/day, and a nullable Int16 value.
     """
+    header_filter = make_dly_header_filter(elements, start_year, end_year, since, before)
+    if header_filter is not None:
+        lines = (line for line in lines if header_filter(line))
+
+    if engine == "numpy":
+        return dly_array_to_dataframe(
+            dly_lines_to_array(lines), drop_qflagged=drop_qflagged, compact=compact
+        )
+    if engine != "python":
+        raise ValueError(f"Unknown engine: {engine}")
+    if compact:
+        raise ValueError("The compact schema requires engine='numpy'")
+
     records = parse_dly_lines(lines)
     rows = []
     for rec in records:
@@ -215,6 +452,278 @@ def dly_to_dataframe_from_lines(lines):
                 "qflag": day_rec["qflag"],
                 "sflag": day_rec["sflag"],
             }
+            if drop_qflagged and row["qflag"] is not None:
+                continue
             rows.append(row)
     df = pd.DataFrame(rows)
     return df
+
+
+# Vectorized GHCN-Daily parsing
+DLY_RECORD_LENGTH = 269
+DLY_COLUMNS = [
+    "station_id", "year", "month", "day", "element",
+    "value", "mflag", "qflag", "sflag",
+]
+
+# Compact schema: categorical station/element/flags (1-byte codes), a single
+# datetime DATE column and a masked Int16 value, ~16 bytes per observation
+COMPACT_COLUMNS = [
+    "station_id", "element", "DATE", "value", "mflag", "qflag", "sflag",
+]
+
+# Byte offsets of the 31 day slots, each 8 bytes wide starting at index 21
+_DAY_OFFSETS = 21 + 8 * np.arange(31)
+
+# Lookup table mapping a flag byte to the value the python engine produces
+_FLAG_LOOKUP = np.array(
+    [None if chr(c).isspace() else chr(c) for c in range(256)], dtype=object
+)
+
+
+def dly_lines_to_array(lines):
+    """
+    Pack the valid records of a .dly file into a 2-D uint8 array.
+
+    Args:
+        lines (iterable of str or bytes): Lines from a .dly file. Lines shorter
+            than 269 characters are skipped, longer ones are truncated.
+
+    Returns:
+        np.ndarray: Array of shape (n_records, 269) holding the raw bytes.
+    """
+    lines = [line for line in lines if len(line) >= DLY_RECORD_LENGTH]
+    if lines and isinstance(lines[0], str):
+        buffer = "".join([line[:DLY_RECORD_LENGTH] for line in lines])
+        buffer = buffer.encode("latin-1", errors="replace")
+    else:
+        buffer = b"".join([line[:DLY_RECORD_LENGTH] for line in lines])
+
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(-1, DLY_RECORD_LENGTH)
+
+
+def _decode_fixed_ints(digits):
+    """
+    Decode right-aligned ASCII integers along the last axis of a uint8 array.
+    Returns a float64 array with NaN wherever the field is not a valid integer.
+    """
+    is_digit = (digits >= ord("0")) & (digits <= ord("9"))
+    is_space = digits == ord(" ")
+    is_minus = digits == ord("-")
+
+    values = np.zeros(digits.shape[:-1], dtype=np.int64)
+    for k in range(digits.shape[-1]):
+        column = digits[..., k]
+        values = np.where(is_digit[..., k], values * 10 + (column - ord("0")), values)
+
+    valid = is_digit.any(axis=-1) & (is_digit | is_space | is_minus).all(axis=-1)
+    valid &= is_minus.sum(axis=-1) <= 1
+    result = np.where(is_minus.any(axis=-1), -values, values).astype(np.float64)
+    result[~valid] = np.nan
+    return result
+
+
+def _factorize_fixed_strings(columns):
+    """
+    Factorize a (n, width) uint8 array of fixed-width text fields.
+    Returns (codes, categories) where categories is an object array of str.
+    """
+    if len(columns) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=object)
+    raw = np.ascontiguousarray(columns).view(f"S{columns.shape[1]}").ravel()
+    uniques, inverse = np.unique(raw, return_inverse=True)
+    categories = np.array([u.decode("latin-1") for u in uniques], dtype=object)
+    return inverse, categories
+
+
+def _decode_fixed_strings(columns):
+    """Decode a (n, width) uint8 array into an object array of str."""
+    codes, categories = _factorize_fixed_strings(columns)
+    return categories[codes]
+
+
+def _flag_categorical(flags):
+    """Convert an array of flag bytes into a Categorical with NaN for blanks."""
+    present = np.unique(flags)
+    present = present[np.array([not chr(c).isspace() for c in present], dtype=bool)]
+    lookup = np.full(256, -1, dtype=np.int8)
+    lookup[present] = np.arange(len(present))
+    return pd.Categorical.from_codes(
+        lookup[flags], categories=[chr(c) for c in present]
+    )
+
+
+def dly_array_to_dataframe(records, drop_qflagged=False, compact=False):
+    """
+    Convert a (n_records, 269) uint8 array of .dly records into a DataFrame
+    with one row per day, matching dly_to_dataframe_from_lines(engine="python").
+
+    Args:
+        records (np.ndarray): Array produced by dly_lines_to_array.
+        drop_qflagged (bool): Drop days with a non-blank quality flag.
+        compact (bool): Return the compact schema (see COMPACT_COLUMNS).
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the parsed daily observations
+    """
+    if compact:
+        return _dly_array_to_compact_dataframe(records, drop_qflagged)
+
+    n_records = len(records)
+    if n_records == 0:
+        return pd.DataFrame(columns=DLY_COLUMNS)
+
+    # (n_records, 31, 8) view of the day slots
+    slots = records[:, _DAY_OFFSETS[:, None] + np.arange(8)]
+
+    values = _decode_fixed_ints(slots[:, :, :5]).ravel()
+    values[values == -9999] = np.nan
+
+    station_ids = _decode_fixed_strings(records[:, 0:11])
+    elements = _decode_fixed_strings(records[:, 17:21])
+    years = _decode_fixed_ints(records[:, 11:15]).astype(np.int64)
+    months = _decode_fixed_ints(records[:, 15:17]).astype(np.int64)
+
+    columns = {
+        "station_id": np.repeat(station_ids, 31),
+        "year": np.repeat(years, 31),
+        "month": np.repeat(months, 31),
+        "day": np.tile(np.arange(1, 32, dtype=np.int64), n_records),
+        "element": np.repeat(elements, 31),
+        "value": values,
+        "mflag": _FLAG_LOOKUP[slots[:, :, 5].ravel()],
+        "qflag": _FLAG_LOOKUP[slots[:, :, 6].ravel()],
+        "sflag": _FLAG_LOOKUP[slots[:, :, 7].ravel()],
+    }
+    if drop_qflagged:
+        keep = slots[:, :, 6].ravel() == ord(" ")
+        columns = {name: array[keep] for name, array in columns.items()}
+
+    # Concatenating named Series avoids consolidating the object columns
+    # into one block, which costs more than the parsing itself
+    return pd.concat(
+        [
+            pd.Series(array, name=name, dtype=array.dtype, copy=False)
+            for name, array in columns.items()
+        ],
+        axis=1,
+        copy=False,
+    )
+
+
+def _dly_array_to_compact_dataframe(records, drop_qflagged=False):
+    """
+    Build the compact schema from a (n_records, 269) uint8 array.
+    Slots for days that do not exist (e.g. 31 April) are dropped.
+    """
+    n_records = len(records)
+    slots = records[:, _DAY_OFFSETS[:, None] + np.arange(8)]
+
+    years = _decode_fixed_ints(records[:, 11:15]).astype(np.int64)
+    months = _decode_fixed_ints(records[:, 15:17]).astype(np.int64)
+    month_start = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+    days_in_month = (
+        (month_start + 1).astype("datetime64[D]") - month_start.astype("datetime64[D]")
+    ).astype(np.int64)
+    dates = month_start.astype("datetime64[D]")[:, None] + np.arange(31)
+
+    keep = (np.arange(31) < days_in_month[:, None]).ravel()
+    if drop_qflagged:
+        keep &= slots[:, :, 6].ravel() == ord(" ")
+
+    values = _decode_fixed_ints(slots[:, :, :5]).ravel()[keep]
+    missing = np.isnan(values) | (values == -9999)
+    values[missing] = 0
+    in_range = (values >= np.iinfo(np.int16).min) & (values <= np.iinfo(np.int16).max)
+    value_dtype = "Int16" if in_range.all() else "Int32"
+    values = pd.arrays.IntegerArray(
+        values.astype(value_dtype.lower()), mask=missing
+    )
+
+    record_index = np.repeat(np.arange(n_records), 31)[keep]
+    station_codes, station_ids = _factorize_fixed_strings(records[:, 0:11])
+    element_codes, elements = _factorize_fixed_strings(records[:, 17:21])
+
+    columns = {
+        "station_id": pd.Categorical.from_codes(
+            station_codes[record_index], categories=station_ids
+        ),
+        "element": pd.Categorical.from_codes(
+            element_codes[record_index], categories=elements
+        ),
+        "DATE": dates.ravel()[keep].astype("datetime64[ns]"),
+        "value": values,
+        "mflag": _flag_categorical(slots[:, :, 5].ravel()[keep]),
+        "qflag": _flag_categorical(slots[:, :, 6].ravel()[keep]),
+        "sflag": _flag_categorical(slots[:, :, 7].ravel()[keep]),
+    }
+    return pd.DataFrame(columns, columns=COMPACT_COLUMNS)
+
+
+def concat_dly_dataframes(frames):
+    """
+    Concatenate parsed .dly chunks. Unlike a plain pd.concat, categorical
+    columns (compact schema) stay categorical even when the chunks saw
+    different categories.
+    """
+    frames = list(frames)
+    if len(frames) == 1:
+        return frames[0]
+    combined = pd.concat(frames, ignore_index=True)
+    for column in frames[0].columns:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            combined[column] = union_categoricals([frame[column] for frame in frames])
+    return combined
+
+
+def iter_dly_dataframes(
+    lines,
+    chunk_rows=500_000,
+    engine="numpy",
+    elements=None,
+    start_year=None,
+    end_year=None,
+    drop_qflagged=False,
+    compact=False,
+    since=None,
+    before=None,
+):
+    """
+    Parse a .dly line stream incrementally, yielding DataFrame chunks.
+
+    Only one chunk of raw records and one parsed chunk are held at a time, so
+    peak memory stays flat regardless of the length of the station record.
+
+    Args:
+        lines (iterable of str or bytes): Any line iterator, e.g. an open file,
+            gzip.open(...) or requests.Response.iter_lines().
+        chunk_rows (int): Maximum number of daily rows per chunk. Rounded down
+            to a whole number of monthly records (31 rows each).
+        engine (str): Parsing engine passed to dly_to_dataframe_from_lines.
+        elements, start_year, end_year, since, before, drop_qflagged: Record filters, see
+            dly_to_dataframe_from_lines. Header filters are applied before
+            records are buffered.
+        compact (bool): Yield the compact schema (see COMPACT_COLUMNS).
+
+    Yields:
+        pd.DataFrame: Chunks with the same columns and dtypes as
+        dly_to_dataframe_from_lines.
+    """
+    header_filter = make_dly_header_filter(elements, start_year, end_year, since, before)
+    records_per_chunk = max(1, chunk_rows // 31)
+    batch = []
+    for line in lines:
+        if len(line) < DLY_RECORD_LENGTH:
+            continue
+        if header_filter is not None and not header_filter(line):
+            continue
+        batch.append(line)
+        if len(batch) >= records_per_chunk:
+            yield dly_to_dataframe_from_lines(
+                batch, engine=engine, drop_qflagged=drop_qflagged, compact=compact
+            )
+            batch = []
+    if batch:
+        yield dly_to_dataframe_from_lines(
+            batch, engine=engine, drop_qflagged=drop_qflagged, compact=compact
+        )
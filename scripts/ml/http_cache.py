@@ -0,0 +1,244 @@
+import os
+import gzip
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+
+# Default cache location: <repo>/data/http_cache
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "http_cache"
+
+# Eviction limits: total compressed size and time since last use
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+DEFAULT_MAX_AGE_DAYS = 90
+
+# An eviction pass over max_bytes frees space down to this fraction of it, so
+# the next scan only happens after that much more has been written
+EVICT_TO_FRACTION = 0.9
+
+# Bytes copied per read while streaming a response into the cache
+_COPY_CHUNK = 1024 * 1024
+
+
+class OfflineCacheMiss(Exception):
+    """Raised in offline mode when a URL has never been cached."""
+
+
+class HttpCache:
+    """
+    On-disk cache of HTTP response bodies with conditional revalidation.
+
+    Each URL is stored as a gzip-compressed body plus a JSON sidecar holding
+    its ETag and Last-Modified headers. A cached URL is revalidated with
+    If-None-Match / If-Modified-Since, so unchanged files cost one 304
+    round trip instead of a full download. When the network fails the stale
+    copy is served, and in offline mode no request is made at all.
+
+    Entries are evicted least-recently-used first once the cache exceeds
+    max_bytes, and entries unused for more than max_age_days are dropped.
+    The directory is scanned once, on the first store; after that the total
+    size is tracked as entries are written and only rescanned when it goes
+    over max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        max_bytes=DEFAULT_MAX_BYTES,
+        max_age_days=DEFAULT_MAX_AGE_DAYS,
+        offline=False,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.offline = offline
+        self._lock = threading.Lock()
+        # Compressed bytes on disk; None until the first scan in evict()
+        self._total_bytes = None
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.gz", self.cache_dir / f"{key}.json"
+
+    def body_path(self, url):
+        """Path of the gzip-compressed body of url (which may not be cached yet)."""
+        return self._paths(url)[0]
+
+    def entry(self, url):
+        """
+        Return the metadata of the cached copy of url, or None. stored_at
+        changes only when a new body is stored, so (stored_at, size) identifies
+        the cached version; files derived from the body (named
+        <body path>.<suffix>) can be keyed on it and are evicted with it.
+        """
+        return self._load_meta(url)
+
+    def request_headers(self, url):
+        """Conditional request headers (If-None-Match / If-Modified-Since) for url."""
+        meta = self._load_meta(url)
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _load_meta(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not body_path.exists():
+            return None
+        return meta
+
+    def touch(self, url):
+        """Mark url as used (a 304 revalidation or an offline read)."""
+        body_path, _ = self._paths(url)
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+
+    def _store(self, url, response):
+        self.store(url, response.iter_content(chunk_size=_COPY_CHUNK), response.headers)
+
+    def store(self, url, chunks, headers):
+        """
+        Store a downloaded body (an iterable of bytes chunks) and the ETag /
+        Last-Modified of its response headers as the cached copy of url.
+        """
+        # Stream the body into a compressed temp file, then atomically
+        # replace the cached entry so concurrent readers never see a partial file
+        os.makedirs(self.cache_dir, exist_ok=True)
+        body_path, meta_path = self._paths(url)
+        try:
+            replaced_bytes = body_path.stat().st_size
+        except OSError:
+            replaced_bytes = 0
+        fd, tmp_body = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as out:
+                for chunk in chunks:
+                    out.write(chunk)
+                    size += len(chunk)
+            meta = {
+                "url": url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "stored_at": time.time(),
+                "size": size,
+            }
+            fd, tmp_meta = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            stored_bytes = os.path.getsize(tmp_body)
+            os.replace(tmp_body, body_path)
+            os.replace(tmp_meta, meta_path)
+        except BaseException:
+            if os.path.exists(tmp_body):
+                os.remove(tmp_body)
+            raise
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += stored_bytes - replaced_bytes
+            scan = self._total_bytes is None or self._total_bytes > self.max_bytes
+        if scan:
+            self.evict()
+
+    def fetch(self, url, request):
+        """
+        Download or revalidate url and return the path of its cached body.
+
+        Args:
+            url (str): URL to fetch
+            request (callable): request(url, headers) -> streaming requests.Response;
+                must raise for HTTP errors other than 304
+
+        Returns:
+            Path: gzip-compressed body, readable with gzip.open (e.g. from
+            another process)
+        """
+        meta = self._load_meta(url)
+        body_path, _ = self._paths(url)
+
+        if self.offline:
+            if meta is None:
+                raise OfflineCacheMiss(f"Offline mode: {url} is not in the cache")
+            self.touch(url)
+            return body_path
+
+        headers = self.request_headers(url)
+
+        try:
+            response = request(url, headers)
+        except Exception as e:
+            if meta is None:
+                raise
+            print(f"Request for {url} failed ({e}); using cached copy")
+            self.touch(url)
+            return body_path
+
+        with response:
+            if response.status_code == 304 and meta is not None:
+                self.touch(url)
+            else:
+                self._store(url, response)
+        return body_path
+
+    def open(self, url, request):
+        """
+        Return a binary file object over the (decompressed) body of url,
+        downloading or revalidating it first (see fetch).
+
+        Returns:
+            gzip.GzipFile: Readable, line-iterable body; close it when done
+        """
+        return gzip.open(self.fetch(url, request), "rb")
+
+    def read(self, url, request):
+        """Return the full body of url as bytes (see open)."""
+        with self.open(url, request) as f:
+            return f.read()
+
+    def evict(self):
+        """
+        Drop entries unused for max_age_days, then, if the cache is over
+        max_bytes, least recently used ones until under EVICT_TO_FRACTION of it.
+        """
+        with self._lock:
+            try:
+                bodies = [
+                    (path.stat().st_mtime, path.stat().st_size, path)
+                    for path in self.cache_dir.glob("*.gz")
+                ]
+            except OSError:
+                return
+            cutoff = time.time() - self.max_age_days * 86400
+            total = sum(size for _, size, _ in bodies)
+            limit = self.max_bytes * EVICT_TO_FRACTION if total > self.max_bytes else self.max_bytes
+            for mtime, size, path in sorted(bodies):
+                if mtime >= cutoff and total <= limit:
+                    break
+                # The body, its metadata and any files derived from the body
+                for stale in [path, path.with_suffix(".json"), *path.parent.glob(f"{path.name}.*")]:
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        pass
+                total -= size
+            self._total_bytes = total
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            self._total_bytes = None
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
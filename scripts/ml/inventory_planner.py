@@ -0,0 +1,118 @@
+import os
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import pandas as pd
+
+# Defaults mirror time_series.validate_time_series_data: 36 monthly points
+# and a last observation no more than 3 years old
+MIN_YEARS = 3
+MAX_YEARS_SINCE_LAST = 3
+
+PLAN_COLUMNS = ["station_id", "selected", "elements", "first_year", "last_year", "reason"]
+
+
+def index_inventory(inventory):
+    """
+    Index parsed inventory rows by (station, element).
+
+    Args:
+        inventory (pd.DataFrame): Output of ghcnd_parse.parse_inventory_file
+
+    Returns:
+        pd.DataFrame: first_year/last_year indexed by a sorted (id, element) MultiIndex
+    """
+    indexed = inventory.set_index(["id", "element"])[["first_year", "last_year"]]
+    return indexed[~indexed.index.duplicated(keep="last")].sort_index()
+
+
+def plan_station_downloads(
+    station_ids,
+    inventory,
+    elements,
+    min_years=MIN_YEARS,
+    max_years_since_last=MAX_YEARS_SINCE_LAST,
+    require_all=False,
+    current_year=None,
+):
+    """
+    Decide which stations are worth downloading, using the inventory alone.
+
+    An element is usable at a station when the inventory lists it, it covers at
+    least min_years years and its last year is within max_years_since_last of
+    current_year. A station is selected when any (or, with require_all, every)
+    requested element is usable.
+
+    Args:
+        station_ids (iterable): Candidate GHCN-D station IDs
+        inventory (pd.DataFrame): Parsed inventory, raw or from index_inventory
+        elements (list): Element codes the caller needs, e.g. ["TMAX", "TMIN"]
+        min_years (int): Minimum years between first_year and last_year, inclusive
+        max_years_since_last (int): Maximum age of last_year in years
+        require_all (bool): Require every element instead of at least one
+        current_year (int, optional): Defaults to this year
+
+    Returns:
+        pd.DataFrame: One row per station (PLAN_COLUMNS); elements lists the
+        usable elements and reason explains skipped stations
+    """
+    if "id" in inventory.columns:
+        inventory = index_inventory(inventory)
+    if current_year is None:
+        current_year = pd.Timestamp.today().year
+    station_ids = list(dict.fromkeys(station_ids))
+    elements = list(elements)
+
+    # One row per requested (station, element) pair; unlisted pairs are NaN
+    pairs = pd.MultiIndex.from_product([station_ids, elements], names=["id", "element"])
+    coverage = inventory.reindex(pairs)
+    listed = coverage["last_year"].notna()
+    long_enough = (coverage["last_year"] - coverage["first_year"] + 1) >= min_years
+    recent = coverage["last_year"] >= current_year - max_years_since_last
+    usable = (listed & long_enough & recent).to_numpy().reshape(len(station_ids), len(elements))
+    first_year = coverage["first_year"].to_numpy().reshape(len(station_ids), len(elements))
+    last_year = coverage["last_year"].to_numpy().reshape(len(station_ids), len(elements))
+    listed = listed.to_numpy().reshape(len(station_ids), len(elements))
+    long_enough = long_enough.to_numpy().reshape(len(station_ids), len(elements))
+
+    rows = []
+    for i, station_id in enumerate(station_ids):
+        usable_elements = [e for e, ok in zip(elements, usable[i]) if ok]
+        selected = usable[i].all() if require_all else usable[i].any()
+        reasons = []
+        for j, element in enumerate(elements):
+            if usable[i, j]:
+                continue
+            if not listed[i, j]:
+                reasons.append(f"{element} not reported")
+            elif not long_enough[i, j]:
+                reasons.append(f"{element} only {int(last_year[i, j] - first_year[i, j] + 1)} years")
+            else:
+                reasons.append(f"{element} ended {int(last_year[i, j])}")
+        station_first = first_year[i][usable[i]]
+        station_last = last_year[i][usable[i]]
+        rows.append({
+            "station_id": station_id,
+            "selected": bool(selected),
+            "elements": usable_elements if selected else [],
+            "first_year": int(station_first.min()) if len(station_first) else None,
+            "last_year": int(station_last.max()) if len(station_last) else None,
+            "reason": "; ".join(reasons),
+        })
+    plan = pd.DataFrame(rows, columns=PLAN_COLUMNS)
+    return plan.astype({"first_year": "Int64", "last_year": "Int64"})
+
+
+def print_plan(plan):
+    """Print the planned downloads and why the other stations are skipped."""
+    selected = plan[plan["selected"]]
+    skipped = plan[~plan["selected"]]
+    print(f"Planned downloads: {len(selected)} of {len(plan)} stations ({len(skipped)} skipped)")
+    for row in selected.itertuples(index=False):
+        print(f"  fetch {row.station_id}: {', '.join(row.elements)} ({row.first_year}-{row.last_year})")
+    for row in skipped.itertuples(index=False):
+        print(f"  skip  {row.station_id}: {row.reason}")
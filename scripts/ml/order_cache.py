@@ -0,0 +1,64 @@
+import os
+import re
+import json
+import time
+import tempfile
+from pathlib import Path
+
+# Default location: <repo>/data/arima_orders/<key>.json
+DEFAULT_ORDERS_DIR = Path(__file__).resolve().parents[2] / "data" / "arima_orders"
+
+
+def _path(key, orders_dir):
+    # One file per series so concurrent fits never rewrite each other's entries
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "__", key)
+    return Path(orders_dir) / f"{name}.json"
+
+
+def load_orders(key, orders_dir=DEFAULT_ORDERS_DIR):
+    """
+    Return the ARIMA orders last selected for a series, or None.
+
+    Args:
+        key (str): Series identifier, e.g. "USW00003971/TMAX"
+        orders_dir (str or Path): Order cache directory
+
+    Returns:
+        dict: {"order": [p, d, q], "seasonal_order": [P, D, Q, m],
+        "params": the model's other constructor settings (e.g. with_intercept,
+        trend; missing in older entries), "rmse": in-sample RMSE,
+        "updated_at": epoch seconds}
+    """
+    try:
+        with open(_path(key, orders_dir), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("key") != key:
+        return None
+    return entry
+
+
+def save_orders(key, order, seasonal_order, rmse, orders_dir=DEFAULT_ORDERS_DIR, params=None):
+    """
+    Record the orders selected for a series (atomically replaces the previous
+    entry). params holds the model's other JSON-serializable settings.
+    """
+    os.makedirs(orders_dir, exist_ok=True)
+    entry = {
+        "key": key,
+        "order": [int(v) for v in order],
+        "seasonal_order": [int(v) for v in seasonal_order],
+        "params": params or {},
+        "rmse": float(rmse),
+        "updated_at": time.time(),
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=orders_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, _path(key, orders_dir))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
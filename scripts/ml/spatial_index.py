@@ -0,0 +1,190 @@
+import os
+import sys
+import json
+import pickle
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+from shapely.geometry import shape
+from sklearn.neighbors import BallTree
+
+# Default locations: <repo>/data/station_index.pkl and the Texas county boundaries
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+DEFAULT_INDEX_PATH = DATA_DIR / "station_index.pkl"
+DEFAULT_COUNTIES_PATH = DATA_DIR / "counties" / "counties.geojson"
+
+# GeoJSON property holding the county name (same one the app's map uses)
+COUNTY_NAME_PROPERTY = "CNTY_NM"
+
+# Mean Earth radius; BallTree haversine distances are in radians
+EARTH_RADIUS_KM = 6371.0088
+
+# Bump when the pickled layout changes so stale indexes are rebuilt
+INDEX_VERSION = 1
+
+
+def load_county_polygons(counties_path=DEFAULT_COUNTIES_PATH):
+    """
+    Read county polygons from a GeoJSON file.
+
+    Args:
+        counties_path (str or Path): GeoJSON FeatureCollection with a CNTY_NM property
+
+    Returns:
+        tuple: (list of county names, numpy array of shapely geometries)
+    """
+    with open(counties_path, "r") as f:
+        features = json.load(f)["features"]
+    names = [feature["properties"][COUNTY_NAME_PROPERTY] for feature in features]
+    geoms = np.array([shape(feature["geometry"]) for feature in features], dtype=object)
+    return names, geoms
+
+
+class StationIndex:
+    """
+    Spatial index over the GHCN-D station table.
+
+    A haversine BallTree on latitude/longitude answers radius and k-nearest
+    queries; an STRtree over county polygons answers point-in-county queries
+    and assigns every station to its county once, at build time, so county
+    lookups are a dictionary access instead of a scan.
+    """
+
+    def __init__(self, stations, county_names=None, county_geoms=None):
+        self.stations = stations.reset_index(drop=True)
+        lat = self.stations["LATITUDE"].to_numpy(dtype="float64")
+        lon = self.stations["LONGITUDE"].to_numpy(dtype="float64")
+        self.tree = BallTree(np.radians(np.column_stack([lat, lon])), metric="haversine")
+
+        self.county_names = list(county_names or [])
+        self.county_tree = None
+        self._county_rows = {}
+        if self.county_names:
+            self.county_tree = STRtree(county_geoms)
+            # (station row, polygon) pairs for every station inside a county
+            station_rows, polygons = self.county_tree.query(
+                shapely.points(lon, lat), predicate="within"
+            )
+            order = np.lexsort((station_rows, polygons))
+            station_rows, polygons = station_rows[order], polygons[order]
+            starts = np.flatnonzero(np.r_[True, np.diff(polygons) != 0]) if len(polygons) else []
+            for polygon, rows in zip(polygons[starts], np.split(station_rows, starts[1:])):
+                self._county_rows[self.county_names[polygon].upper()] = rows
+
+    def _result(self, rows, distances):
+        result = self.stations.iloc[rows].copy()
+        result["distance_km"] = distances * EARTH_RADIUS_KM
+        return result
+
+    def nearest(self, lat, lon, k=1):
+        """Return the k stations closest to (lat, lon) with a distance_km column."""
+        k = min(k, len(self.stations))
+        distances, rows = self.tree.query(np.radians([[lat, lon]]), k=k)
+        return self._result(rows[0], distances[0])
+
+    def within_radius(self, lat, lon, radius_km):
+        """Return the stations within radius_km of (lat, lon), closest first."""
+        rows, distances = self.tree.query_radius(
+            np.radians([[lat, lon]]),
+            r=radius_km / EARTH_RADIUS_KM,
+            return_distance=True,
+            sort_results=True,
+        )
+        return self._result(rows[0], distances[0])
+
+    def county_of(self, lat, lon):
+        """Return the name of the county containing (lat, lon), or None."""
+        if self.county_tree is None:
+            return None
+        polygons = self.county_tree.query(shapely.Point(lon, lat), predicate="within")
+        return self.county_names[polygons[0]] if len(polygons) else None
+
+    def stations_in_county(self, county_name):
+        """Return the stations inside the named county (case-insensitive)."""
+        if self.county_tree is None:
+            raise ValueError("Station index was built without county polygons")
+        if county_name.upper() not in {name.upper() for name in self.county_names}:
+            raise ValueError(f"Unknown county: {county_name}")
+        rows = self._county_rows.get(county_name.upper(), np.array([], dtype=np.intp))
+        return self.stations.iloc[rows].reset_index(drop=True)
+
+    def save(self, path=DEFAULT_INDEX_PATH, source=None):
+        """Pickle the index; source records what it was built from."""
+        path = Path(path)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {"version": INDEX_VERSION, "source": source, "index": self},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path=DEFAULT_INDEX_PATH, source=None):
+        """Load a pickled index; returns None when missing, stale or from another source."""
+        try:
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if saved.get("version") != INDEX_VERSION or saved.get("source") != source:
+            return None
+        return saved["index"]
+
+
+def _counties_signature(counties_path):
+    try:
+        stat = os.stat(counties_path)
+    except OSError:
+        return None
+    return [str(counties_path), stat.st_mtime_ns, stat.st_size]
+
+
+def load_station_index(
+    index_path=DEFAULT_INDEX_PATH,
+    counties_path=DEFAULT_COUNTIES_PATH,
+    stations=None,
+    rebuild=False,
+):
+    """
+    Load the persisted station index, building and saving it if needed.
+
+    Args:
+        index_path (str or Path): Pickle file for the index
+        counties_path (str or Path): County GeoJSON; the index is rebuilt when it changes
+        stations (pd.DataFrame, optional): Station table; defaults to get_ghcnd_stations()
+        rebuild (bool): Ignore any saved index
+
+    Returns:
+        StationIndex: The loaded or freshly built index
+    """
+    source = _counties_signature(counties_path)
+    if not rebuild and stations is None:
+        index = StationIndex.load(index_path, source)
+        if index is not None:
+            return index
+
+    if stations is None:
+        import ghcnd_fetch
+        stations = ghcnd_fetch.get_ghcnd_stations()
+
+    county_names, county_geoms = None, None
+    if source is not None:
+        county_names, county_geoms = load_county_polygons(counties_path)
+    else:
+        print(f"County boundaries not found at {counties_path}; county queries disabled")
+
+    index = StationIndex(stations, county_names, county_geoms)
+    try:
+        index.save(index_path, source)
+    except OSError as e:
+        print(f"Error saving station index: {e}")
+    return index
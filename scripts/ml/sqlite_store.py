@@ -0,0 +1,190 @@
+import os
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import numpy as np
+import pandas as pd
+
+# Default database location: <repo>/data/observations.sqlite
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[2] / "data" / "observations.sqlite"
+
+# Rows per executemany call during bulk loads
+INSERT_BATCH_ROWS = 50_000
+
+# Dates are stored as days since 1970-01-01 so they map straight to datetime64[D].
+# WITHOUT ROWID makes the primary key the table's clustered index, so a
+# (station, element, date range) query is a single index range scan.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    station_id TEXT NOT NULL,
+    element TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (station_id, element, day)
+) WITHOUT ROWID
+"""
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def create_store(db_path=DEFAULT_DB_PATH):
+    """
+    Create the observation table and switch the database to WAL mode. Run
+    once before loading stations; both settings persist in the file.
+    """
+    conn = sqlite3.connect(db_path, timeout=60)
+    try:
+        # WAL lets readers (the app) run while a fetch writes; several worker
+        # processes may load stations concurrently and wait on the busy timeout
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SCHEMA)
+    finally:
+        conn.close()
+
+
+def connect(db_path=DEFAULT_DB_PATH):
+    """Open the observation store (see create_store)."""
+    return sqlite3.connect(db_path, timeout=60)
+
+
+def store_is_current(db_path=DEFAULT_DB_PATH, dataset_dir=None):
+    """
+    True if the store exists and, when dataset_dir is given, no file of that
+    Parquet dataset was written after it. The dataset is the primary copy of
+    the daily records; the store is rebuilt from it with build_from_dataset.
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return False
+    if dataset_dir is None:
+        return True
+    # Writes land in the WAL file until they are checkpointed into the database
+    written = max(p.stat().st_mtime for p in (db_path, Path(f"{db_path}-wal")) if p.exists())
+    return all(p.stat().st_mtime <= written for p in Path(dataset_dir).glob("element=*/STATION_ID=*/*.parquet"))
+
+
+def _to_days(dates):
+    return (pd.to_datetime(dates).to_numpy(dtype="datetime64[D]") - _EPOCH).astype("int64")
+
+
+def load_station(records, station_id, db_path=DEFAULT_DB_PATH, replace=True):
+    """
+    Bulk-load one station's daily records with batched inserts in a single
+    transaction.
+
+    Args:
+        records (pd.DataFrame): Station records (DATE, value, element)
+        station_id (str): GHCN-D station identifier
+        db_path (str or Path): SQLite database file, set up by create_store
+        replace (bool): Delete the station's existing rows first; otherwise
+            each element's rows from its first new day on are replaced
+            (incremental refreshes), so reloading the same records is a no-op
+    """
+    days = _to_days(records["DATE"]).tolist()
+    values = records["value"].to_numpy(dtype="float64").tolist()
+    elements = records["element"].astype(str).tolist()
+    rows = zip([station_id] * len(days), elements, days, values)
+
+    conn = connect(db_path)
+    try:
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            if replace:
+                conn.execute("DELETE FROM observations WHERE station_id = ?", (station_id,))
+            else:
+                first_days = pd.Series(days, dtype="int64").groupby(elements).min()
+                conn.executemany(
+                    "DELETE FROM observations WHERE station_id = ? AND element = ? AND day >= ?",
+                    [(station_id, element, int(day)) for element, day in first_days.items()],
+                )
+            while True:
+                batch = [row for _, row in zip(range(INSERT_BATCH_ROWS), rows)]
+                if not batch:
+                    break
+                conn.executemany("INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?)", batch)
+    finally:
+        conn.close()
+
+
+def query(station_ids, element, start=None, end=None, db_path=DEFAULT_DB_PATH):
+    """
+    Return the daily observations of one element for one or more stations.
+
+    Args:
+        station_ids (str or list): Station(s) to read
+        element (str): Element code, e.g. "TMAX"
+        start, end (date-like, optional): Inclusive date bounds
+        db_path (str or Path): SQLite database file
+
+    Returns:
+        tuple: (dates as datetime64[D] ndarray, values as float64 ndarray),
+        ordered by station and date
+    """
+    if isinstance(station_ids, str):
+        station_ids = [station_ids]
+    first = -(2 ** 62) if start is None else int(_to_days([start])[0])
+    last = 2 ** 62 if end is None else int(_to_days([end])[0])
+
+    days, values = [], []
+    conn = connect(db_path)
+    try:
+        for station_id in station_ids:
+            rows = conn.execute(
+                "SELECT day, value FROM observations "
+                "WHERE station_id = ? AND element = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (station_id, element, first, last),
+            ).fetchall()
+            if rows:
+                station_days, station_values = zip(*rows)
+                days.append(np.fromiter(station_days, dtype="int64", count=len(rows)))
+                values.append(np.fromiter(station_values, dtype="float64", count=len(rows)))
+    finally:
+        conn.close()
+
+    if not days:
+        return np.array([], dtype="datetime64[D]"), np.array([], dtype="float64")
+    return np.concatenate(days).astype("datetime64[D]"), np.concatenate(values)
+
+
+def query_frame(station_ids, element, start=None, end=None, db_path=DEFAULT_DB_PATH):
+    """query() as a DataFrame with DATE (datetime64[ns]) and value columns."""
+    dates, values = query(station_ids, element, start, end, db_path)
+    return pd.DataFrame({"DATE": dates.astype("datetime64[ns]"), "value": values})
+
+
+def build_from_dataset(dataset_dir, db_path=DEFAULT_DB_PATH):
+    """Load every station of a Parquet station dataset into the store."""
+    import station_dataset
+
+    create_store(db_path)
+    station_ids = sorted(
+        {p.name.split("=", 1)[1] for p in Path(dataset_dir).glob("element=*/STATION_ID=*")}
+    )
+    for station_id in station_ids:
+        records = station_dataset.read_station_dataset(
+            dataset_dir, station_ids=[station_id], columns=["DATE", "value", "element"]
+        )
+        load_station(records, station_id, db_path)
+    print(f"Loaded {len(station_ids)} stations from {dataset_dir} into {db_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite observation store from the Parquet station dataset.")
+    parser.add_argument(
+        "--dataset-dir",
+        default=str(DEFAULT_DB_PATH.parent / "dataset"),
+        help="Parquet station dataset root",
+    )
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="SQLite database file")
+    args = parser.parse_args()
+    build_from_dataset(args.dataset_dir, args.db)
+
+
+if __name__ == "__main__":
+    main()
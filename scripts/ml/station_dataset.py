@@ -0,0 +1,197 @@
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from csv_loader import read_station_csv
+
+# Default dataset location: <repo>/data/dataset
+DEFAULT_DATASET_DIR = Path(__file__).resolve().parents[2] / "data" / "dataset"
+
+# Files are laid out as <dataset>/element=<E>/STATION_ID=<ID>/part-<n>.parquet
+PARTITION_SCHEMA = pa.schema([("element", pa.string()), ("STATION_ID", pa.string())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+# Columns stored inside each file; element and STATION_ID come from the path
+FILE_SCHEMA = pa.schema([("DATE", pa.date32()), ("value", pa.float64())])
+
+
+def partition_dir(element, station_id, dataset_dir=DEFAULT_DATASET_DIR):
+    return Path(dataset_dir) / f"element={element}" / f"STATION_ID={station_id}"
+
+
+def dataset_exists(dataset_dir=DEFAULT_DATASET_DIR):
+    """True if the dataset holds at least one element partition."""
+    return any(Path(dataset_dir).glob("element=*"))
+
+
+def write_station_dataset(records, station_id, dataset_dir=DEFAULT_DATASET_DIR, append=False):
+    """
+    Write one station's daily records as Parquet, one partition per element.
+
+    Args:
+        records (pd.DataFrame): Station records (DATE, value, element, STATION_ID)
+        station_id (str): GHCN-D station identifier
+        dataset_dir (str or Path): Dataset root
+        append (bool): Add a new part file next to the existing ones instead of
+            replacing the station's partitions (used for incremental refreshes).
+            Existing rows from the first appended date on are dropped, so
+            appending the same records twice leaves no duplicates
+    """
+    for element, group in records.groupby("element", observed=True, sort=False):
+        directory = partition_dir(element, station_id, dataset_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        existing = sorted(directory.glob("part-*.parquet"))
+
+        group = group.sort_values("DATE")
+        table = pa.table(
+            {
+                "DATE": pa.array(pd.to_datetime(group["DATE"]).dt.date, type=pa.date32()),
+                "value": pa.array(group["value"].to_numpy(dtype="float64"), type=pa.float64()),
+            },
+            schema=FILE_SCHEMA,
+        )
+        # A replacement takes over part-0 atomically and only then drops the
+        # other old parts, so a crash never leaves the station without data
+        path = directory / (f"part-{_next_part(existing)}.parquet" if append else "part-0.parquet")
+        _write_file(table, path)
+        if not append:
+            for old_path in existing:
+                if old_path != path:
+                    old_path.unlink()
+        else:
+            # The new part is written first: a crash before this point leaves
+            # overlapping rows, which the next append of the same days removes
+            first = table["DATE"][0]
+            for old_path in existing:
+                _truncate_file(old_path, first)
+
+
+def _next_part(paths):
+    numbers = [int(p.stem.split("-", 1)[1]) for p in paths if p.stem.split("-", 1)[1].isdigit()]
+    return max(numbers, default=-1) + 1
+
+
+def _truncate_file(path, first):
+    """Drop the rows of a part file dated on or after first."""
+    # ParquetFile reads just the file; read_table would add the hive path columns
+    table = pq.ParquetFile(path).read()
+    keep = pc.less(table["DATE"], first)
+    kept = pc.sum(keep).as_py() or 0
+    if kept == len(table):
+        return
+    if kept == 0:
+        path.unlink()
+    else:
+        _write_file(table.filter(keep), path)
+
+
+def _write_file(table, path):
+    # The "." prefix keeps the temp file out of dataset discovery, so readers
+    # never open a partial file
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        pq.write_table(table, tmp_path, write_statistics=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def read_station_dataset(
+    dataset_dir=DEFAULT_DATASET_DIR,
+    station_ids=None,
+    elements=None,
+    columns=None,
+    start=None,
+    end=None,
+):
+    """
+    Read daily records from the dataset.
+
+    Only the requested element/station partitions are opened, only the
+    requested columns are decoded, and start/end are checked against the
+    Parquet row-group statistics, so unneeded data is never read. Files are
+    memory-mapped.
+
+    Args:
+        dataset_dir (str or Path): Dataset root
+        station_ids (list, optional): Stations to read (default: all)
+        elements (list, optional): Elements to read (default: all)
+        columns (list, optional): Subset of DATE, value, element, STATION_ID
+        start, end (date-like, optional): Inclusive DATE bounds
+
+    Returns:
+        pd.DataFrame: DATE as datetime64[ns], value as float64, and element /
+        STATION_ID as categoricals
+    """
+    filters = []
+    if elements is not None:
+        filters.append(("element", "in", list(elements)))
+    if station_ids is not None:
+        filters.append(("STATION_ID", "in", list(station_ids)))
+    if start is not None:
+        filters.append(("DATE", ">=", pd.Timestamp(start).date()))
+    if end is not None:
+        filters.append(("DATE", "<=", pd.Timestamp(end).date()))
+
+    table = pq.read_table(
+        dataset_dir,
+        columns=columns,
+        filters=filters or None,
+        partitioning=PARTITIONING,
+        memory_map=True,
+    )
+    df = table.to_pandas(date_as_object=False, self_destruct=True)
+    if "DATE" in df.columns:
+        df["DATE"] = df["DATE"].astype("datetime64[ns]")
+    for column in ("element", "STATION_ID"):
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def convert_csv_store(stations_dir, dataset_dir=DEFAULT_DATASET_DIR):
+    """Write every data/stations/<ID>_data.csv file into the dataset."""
+    paths = sorted(Path(stations_dir).glob("*_data.csv"))
+    for path in paths:
+        station_id = path.name[: -len("_data.csv")]
+        records = read_station_csv(path, columns=["DATE", "value", "element"])
+        write_station_dataset(records, station_id, dataset_dir)
+    print(f"Converted {len(paths)} station files from {stations_dir} to {dataset_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert per-station CSV files to the Parquet station dataset and build its aggregates."
+    )
+    parser.add_argument(
+        "--stations-dir",
+        default=str(DEFAULT_DATASET_DIR.parent / "stations"),
+        help="Directory of <ID>_data.csv files",
+    )
+    parser.add_argument("--dataset-dir", default=str(DEFAULT_DATASET_DIR), help="Dataset root")
+    parser.add_argument(
+        "--aggregates-dir",
+        default=str(DEFAULT_DATASET_DIR.parent / "aggregates"),
+        help="Aggregate store root",
+    )
+    args = parser.parse_args()
+    convert_csv_store(args.stations_dir, args.dataset_dir)
+
+    import aggregate_store
+    aggregate_store.build_from_dataset(args.dataset_dir, args.aggregates_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import os
+import sys
+import gzip
+import time
+import queue
+import threading
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import ghcnd_parse
+import station_store
+
+# Pipeline stages, in order; timings are reported per stage
+STAGES = ["download", "parse", "clean", "write"]
+
+# Seconds between checks for new downloads while parse jobs are running
+_POLL_INTERVAL = 0.05
+
+
+def process_station(station_id, dly_path, filters, stations_dir, dataset_dir, aggregates_dir, db_path, append, dry_run):
+    """
+    Parse, clean and store one downloaded station. Runs in a worker process.
+
+    Args:
+        station_id (str): GHCN-D station identifier
+        dly_path (str or Path): gzip-compressed .dly file (an HTTP cache body)
+        filters (dict): Record filters for ghcnd_parse.dly_to_dataframe_from_lines
+        stations_dir (str or Path): Station store directory
+        dataset_dir (str or Path): Parquet dataset root (daily records)
+        aggregates_dir (str or Path): Aggregate store root (monthly/yearly/climatology)
+        db_path (str or Path): SQLite observation store, or None to skip it
+        append (bool): Append to the station files instead of replacing them
+        dry_run (bool): Skip writing
+
+    Returns:
+        tuple: ({"rows": record count, "last_months": {element: (year, month)}},
+        {stage: seconds}); the records themselves stay in the worker
+    """
+    timings = {}
+    start = time.perf_counter()
+    with gzip.open(dly_path, "rb") as f:
+        lines = f.read().splitlines()
+    parsed = ghcnd_parse.dly_to_dataframe_from_lines(lines, **filters)
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    records = station_store.to_station_records(parsed, station_id)
+    timings["clean"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if not dry_run and not records.empty:
+        if append:
+            station_store.append_station(records, station_id, stations_dir, dataset_dir, aggregates_dir, db_path)
+        else:
+            station_store.write_station(records, station_id, stations_dir, dataset_dir, aggregates_dir, db_path)
+    timings["write"] = time.perf_counter() - start
+    summary = {"rows": len(records), "last_months": station_store.last_ingested_months(records)}
+    return summary, timings
+
+
+def run_station_pipeline(
+    station_ids,
+    download,
+    stations_dir=station_store.DEFAULT_STATIONS_DIR,
+    dataset_dir=station_store.DEFAULT_DATASET_DIR,
+    aggregates_dir=station_store.DEFAULT_AGGREGATES_DIR,
+    db_path=None,
+    station_filters=None,
+    append_ids=(),
+    dry_run=False,
+    workers=None,
+    download_workers=8,
+    queue_size=None,
+    **filters,
+):
+    """
+    Download stations on a thread pool while a process pool parses, cleans
+    and writes them.
+
+    The two stages are connected by a bounded queue: download threads block
+    once queue_size downloaded stations are waiting, and at most queue_size
+    stations are parsed at a time, so neither the network nor the CPUs run
+    far ahead of the other. A failure in any stage is reported for that
+    station only.
+
+    Args:
+        station_ids (iterable of str): Stations to process
+        download (callable): download(station_id) -> path of a gzip .dly file
+        stations_dir (str or Path): Station store directory
+        dataset_dir (str or Path): Parquet dataset root
+        aggregates_dir (str or Path): Aggregate store root
+        db_path (str or Path, optional): SQLite observation store to bulk-load
+        station_filters (dict, optional): {station_id: {filter: value}} merged over filters
+        append_ids (collection): Stations to append to instead of rewrite
+        dry_run (bool): Parse and clean but do not write
+        workers (int, optional): Parse/clean/write processes; defaults to the CPU count
+        download_workers (int): Concurrent downloads
+        queue_size (int, optional): Bound of the download queue; defaults to 2 * workers
+        **filters: Record filters passed to the .dly parser
+
+    Yields:
+        tuple: (station_id, summary dict or None, exception or None,
+        {stage: seconds}), in the order the stations complete
+    """
+    workers = workers or os.cpu_count() or 1
+    queue_size = queue_size or 2 * workers
+    station_filters = station_filters or {}
+    append_ids = set(append_ids)
+    downloaded = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(item):
+        # Block while the queue is full, but give up once the consumer has stopped
+        while not stop.is_set():
+            try:
+                downloaded.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def download_one(station_id):
+        if stop.is_set():
+            return
+        start = time.perf_counter()
+        try:
+            path, error = download(station_id), None
+        except Exception as e:
+            path, error = None, e
+        put((station_id, path, error, time.perf_counter() - start))
+
+    def download_all():
+        with ThreadPoolExecutor(max_workers=download_workers) as pool:
+            for station_id in station_ids:
+                if stop.is_set():
+                    break
+                pool.submit(download_one, station_id)
+        put(None)
+
+    producer = threading.Thread(target=download_all, daemon=True)
+    producer.start()
+
+    pending = {}
+    finished = False
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while not finished or pending:
+                # Hand downloaded stations to the process pool, up to queue_size at a time
+                while not finished and len(pending) < queue_size:
+                    try:
+                        item = downloaded.get(timeout=_POLL_INTERVAL if pending else None)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        finished = True
+                        break
+                    station_id, path, error, seconds = item
+                    if error is not None:
+                        yield station_id, None, error, {"download": seconds}
+                        continue
+                    station_filter = {**filters, **station_filters.get(station_id, {})}
+                    future = pool.submit(
+                        process_station,
+                        station_id,
+                        path,
+                        station_filter,
+                        stations_dir,
+                        dataset_dir,
+                        aggregates_dir,
+                        db_path,
+                        station_id in append_ids,
+                        dry_run,
+                    )
+                    pending[future] = (station_id, seconds)
+
+                if not pending:
+                    continue
+                done, _ = wait(pending, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    station_id, seconds = pending.pop(future)
+                    try:
+                        summary, timings = future.result()
+                    except Exception as e:
+                        yield station_id, None, e, {"download": seconds}
+                        continue
+                    yield station_id, summary, None, {"download": seconds, **timings}
+    finally:
+        stop.set()
+        producer.join()
@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+from pathlib import Path
+
+# Add the parent directory to the Python path
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir))
+
+import pandas as pd
+import station_dataset
+import aggregate_store
+import sqlite_store
+from csv_loader import read_station_csv
+from station_dataset import DEFAULT_DATASET_DIR
+from aggregate_store import DEFAULT_AGGREGATES_DIR
+
+# Default store location: <repo>/data/stations
+DEFAULT_STATIONS_DIR = Path(__file__).resolve().parents[2] / "data" / "stations"
+
+# Elements reported in tenths in .dly files but stored in whole units (degrees C)
+TENTHS_ELEMENTS = ["TMAX", "TMIN"]
+
+# Columns of the daily station records, stored in the Parquet dataset
+# (data/dataset); older stores kept them in data/stations/<ID>_data.csv
+STATION_COLUMNS = ["DATE", "value", "element", "STATION_ID"]
+
+INGEST_STATE_FILE = "ingest_state.json"
+
+# Stations completed by the current (or last interrupted) fetch run
+RUN_MANIFEST_FILE = "fetch_manifest.jsonl"
+
+
+def station_file(station_id, stations_dir=DEFAULT_STATIONS_DIR):
+    return Path(stations_dir) / f"{station_id}_data.csv"
+
+
+def to_station_records(parsed, station_id):
+    """
+    Convert parsed .dly data (default or compact schema) into the daily
+    station file layout: DATE, value, element, STATION_ID with missing days
+    dropped and temperatures converted from tenths to degrees C.
+    """
+    data = parsed
+    if "DATE" not in data.columns:
+        dates = pd.to_datetime(data[["year", "month", "day"]], errors="coerce")
+    else:
+        dates = data["DATE"]
+    records = pd.DataFrame(
+        {
+            "DATE": dates,
+            "value": pd.to_numeric(data["value"], errors="coerce").astype("float64"),
+            "element": data["element"].astype(str),
+        }
+    )
+    records = records.dropna(subset=["DATE", "value"])
+    tenths = records["element"].isin(TENTHS_ELEMENTS)
+    records.loc[tenths, "value"] = records.loc[tenths, "value"] / 10
+    records["STATION_ID"] = station_id
+    return records.sort_values(["element", "DATE"]).reset_index(drop=True)
+
+
+def last_ingested_months(records):
+    """Return {element: (year, month)} of the latest month present per element."""
+    if records.empty:
+        return {}
+    latest = records.groupby("element", observed=True)["DATE"].max()
+    return {element: (date.year, date.month) for element, date in latest.items()}
+
+
+def load_ingest_state(stations_dir=DEFAULT_STATIONS_DIR):
+    """Load {station_id: {element: [year, month]}} of the last ingested months."""
+    try:
+        with open(Path(stations_dir) / INGEST_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_ingest_state(state, stations_dir=DEFAULT_STATIONS_DIR):
+    path = Path(stations_dir) / INGEST_STATE_FILE
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def start_run_manifest(run, stations_dir=DEFAULT_STATIONS_DIR):
+    """Start a new run manifest whose first line describes the run."""
+    path = Path(stations_dir) / RUN_MANIFEST_FILE
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"run": run}) + "\n")
+
+
+def load_run_manifest(run, stations_dir=DEFAULT_STATIONS_DIR):
+    """
+    Return the station IDs completed by an earlier run with the same
+    parameters, or None when there is no manifest for this run.
+    """
+    try:
+        with open(Path(stations_dir) / RUN_MANIFEST_FILE, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    if not lines or json.loads(lines[0]).get("run") != run:
+        return None
+    completed = set()
+    for line in lines[1:]:
+        try:
+            completed.add(json.loads(line)["station_id"])
+        except (ValueError, KeyError):
+            # A line cut short by a crash; that station is simply redone
+            continue
+    return completed
+
+
+def mark_station_done(station_id, rows, stations_dir=DEFAULT_STATIONS_DIR):
+    """Append a completed station to the run manifest, flushed to disk."""
+    with open(Path(stations_dir) / RUN_MANIFEST_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"station_id": station_id, "rows": rows}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def station_since(state, station_id, stations_dir=DEFAULT_STATIONS_DIR, dataset_dir=DEFAULT_DATASET_DIR):
+    """
+    Return the {element: (year, month)} watermark for a station. Stations that
+    are in the store but not yet in the state file are bootstrapped from the
+    last dates in the dataset (or in a legacy daily CSV file).
+    """
+    if station_id in state:
+        return {element: tuple(month) for element, month in state[station_id].items()}
+    if station_dataset.dataset_exists(dataset_dir):
+        existing = station_dataset.read_station_dataset(
+            dataset_dir, station_ids=[station_id], columns=["DATE", "element"]
+        )
+        if not existing.empty:
+            return last_ingested_months(existing)
+    path = station_file(station_id, stations_dir)
+    if not path.exists():
+        return None
+    existing = read_station_csv(path, columns=["DATE", "element"])
+    return last_ingested_months(existing)
+
+
+def current_month():
+    """(year, month) of the month in progress; it is never ingested incrementally."""
+    today = pd.Timestamp.today()
+    return today.year, today.month
+
+
+def write_station(
+    records,
+    station_id,
+    stations_dir=DEFAULT_STATIONS_DIR,
+    dataset_dir=DEFAULT_DATASET_DIR,
+    aggregates_dir=DEFAULT_AGGREGATES_DIR,
+    db_path=None,
+):
+    """
+    Write a station's full daily records and aggregate tables, replacing any
+    existing ones, and bulk-load the records into the SQLite store at db_path.
+    """
+    station_dataset.write_station_dataset(records, station_id, dataset_dir)
+    aggregate_store.write_station_aggregates(records, station_id, aggregates_dir)
+    if db_path is not None:
+        sqlite_store.load_station(records, station_id, db_path)
+
+
+def append_station(
+    records,
+    station_id,
+    stations_dir=DEFAULT_STATIONS_DIR,
+    dataset_dir=DEFAULT_DATASET_DIR,
+    aggregates_dir=DEFAULT_AGGREGATES_DIR,
+    db_path=None,
+):
+    """
+    Append new daily records to a station's dataset partitions and recompute
+    only the monthly aggregates of the (element, month) pairs they touch.
+
+    Every store replaces each element's data from its first new day on, so
+    repeating an append (e.g. a resumed run redoing a station whose write
+    finished but was never recorded) does not duplicate records.
+    """
+    if records.empty:
+        return
+    station_dataset.write_station_dataset(records, station_id, dataset_dir, append=True)
+    aggregate_store.write_station_aggregates(records, station_id, aggregates_dir, append=True)
+    if db_path is not None:
+        sqlite_store.load_station(records, station_id, db_path, replace=False)
@@ -1,5 +1,12 @@
 import os
 import sys
+import copy
+import json
+import time
+import threading
+import warnings
+import multiprocessing as mp
+from multiprocessing import connection as mp_connection
 from pathlib import Path
 
 # Add the parent directory to the Python path
@@ -10,8 +17,58 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import ghcnd_fetch as fetch
+import pmdarima
 from pmdarima import auto_arima
 from sklearn.metrics import mean_squared_error
+from forecast_cache import ForecastCache, DEFAULT_CACHE_DIR, series_fingerprint
+import order_cache
+
+# auto_arima settings used by predict_time_series; part of the forecast cache key
+ARIMA_CONFIG = {
+    "seasonal": True,
+    "m": 12,
+    "stepwise": True,
+    "suppress_warnings": True,
+    "error_action": "ignore",
+    "trace": False,
+}
+
+# Fitted models are cached on disk here (set to an empty string to disable the cache)
+FORECAST_CACHE_DIR = os.environ.get("NEURALCLIMATE_FORECAST_CACHE", str(DEFAULT_CACHE_DIR))
+
+# A cached model fitted on an earlier version of a series is updated with
+# the new months (instead of refitted) if at most this many months were added
+UPDATE_MAX_MONTHS = 24
+
+# ...and if its forecast errors on those months are at most this many forecast
+# standard deviations (root mean square); otherwise the model has drifted and
+# is searched again
+DRIFT_THRESHOLD = 2.5
+
+# A series' previous ARIMA orders are refitted without any search if the
+# in-sample RMSE stays within this factor of the RMSE they had before;
+# otherwise the search is restricted to their +1 neighborhood
+ORDER_RMSE_TOLERANCE = 1.1
+
+# Selected orders are stored per series here (set to an empty string to disable)
+ORDERS_DIR = os.environ.get("NEURALCLIMATE_ARIMA_ORDERS", str(order_cache.DEFAULT_ORDERS_DIR))
+
+# Half-width of a 95% normal interval in standard deviations
+_Z_95 = 1.959963984540054
+
+_forecast_cache = None
+_forecast_cache_lock = threading.Lock()
+
+
+def get_forecast_cache():
+    """Return the shared ForecastCache used by predict_time_series, or None if disabled."""
+    global _forecast_cache
+    if not FORECAST_CACHE_DIR:
+        return None
+    with _forecast_cache_lock:
+        if _forecast_cache is None:
+            _forecast_cache = ForecastCache(FORECAST_CACHE_DIR)
+        return _forecast_cache
 
 
 def clean_data(data):
@@ -23,7 +80,8 @@ def clean_data(data):
     data : pandas.DataFrame
         Raw data with either:
         - 'year', 'month', 'day', and 'value' columns, or
-        - 'DATE' column and 'value' column, or
+        - 'DATE' column and 'value' column (including the compact schema
+          from ghcnd_parse with categorical and nullable integer columns), or
         - datetime index and 'value' column
         
     Returns:
@@ -55,7 +113,8 @@ def clean_data(data):
             raise ValueError("Data must contain a 'value' column")
         
         # Convert value column to float and drop any invalid values
-        data['value'] = pd.to_numeric(data['value'], errors='coerce')
+        # (nullable Int16 values from the compact parse schema become float64)
+        data['value'] = pd.to_numeric(data['value'], errors='coerce').astype('float64')
         data = data.dropna(subset=["value"])
         
         # Keep only the value column
@@ -76,6 +135,65 @@ def clean_data(data):
         print(f"Error in clean_data: {str(e)}")
         return None
 
+def clean_data_multi(data, keys=("STATION_ID", "element")):
+    """
+    Clean many series at once: clean_data for every group of a long frame.
+    
+    All groups are resampled to month-end means in a single grouped
+    aggregation, and the gaps of every group are filled on one stacked
+    array. Each group's monthly range starts and ends with an observed
+    month, so a forward fill over the stacked groups never crosses a group
+    boundary and the result equals clean_data applied group by group.
+    
+    Parameters:
+    -----------
+    data : pandas.DataFrame
+        Long frame with the key columns, DATE and value (e.g. daily station
+        records, or the compact schema from ghcnd_parse)
+    keys : sequence of str
+        Columns identifying a series (default: STATION_ID, element)
+        
+    Returns:
+    --------
+    pandas.DataFrame
+        Tidy frame with the key columns, DATE (month end) and value, sorted
+        by keys and DATE
+    """
+    keys = list(keys)
+    columns = keys + ["DATE", "value"]
+    data = data[columns].copy()
+    if not pd.api.types.is_datetime64_any_dtype(data["DATE"]):
+        data["DATE"] = pd.to_datetime(data["DATE"], errors="coerce")
+    data["value"] = pd.to_numeric(data["value"], errors="coerce").astype("float64")
+    data = data.dropna(subset=["DATE", "value"])
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Month-end means of every group in one pass, keyed by integer month ordinals
+    month = data["DATE"].dt.year.to_numpy() * 12 + data["DATE"].dt.month.to_numpy() - 1
+    monthly = data.groupby(keys + [month], observed=True, sort=True)["value"].mean()
+    group_keys = monthly.index.droplevel(-1)
+    months = monthly.index.get_level_values(-1).to_numpy()
+    starts = np.flatnonzero(np.r_[True, group_keys[1:] != group_keys[:-1]])
+    ends = np.r_[starts[1:], len(monthly)] - 1
+
+    # Complete month range of every group, then place the observed months into it
+    lengths = months[ends] - months[starts] + 1
+    offsets = np.r_[0, np.cumsum(lengths)[:-1]]
+    group_of = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(monthly)]))
+    positions = offsets[group_of] + months - months[starts][group_of]
+    values = np.full(lengths.sum(), np.nan)
+    values[positions] = monthly.to_numpy()
+    filled = pd.Series(values).ffill().to_numpy()
+
+    full_group = np.repeat(np.arange(len(starts)), lengths)
+    full_month = np.repeat(months[starts], lengths) + np.arange(lengths.sum()) - np.repeat(offsets, lengths)
+    result = group_keys[starts].to_frame(index=False).iloc[full_group].reset_index(drop=True)
+    years, month_index = np.divmod(full_month, 12)
+    result["DATE"] = pd.to_datetime({"year": years, "month": month_index + 1, "day": 1}) + pd.offsets.MonthEnd(0)
+    result["value"] = filled
+    return result[columns]
+
 # Keep these functions for backward compatibility but mark them as deprecated
 def clean_data_for_visualization(data):
     """Deprecated: Use clean_data instead"""
@@ -146,16 +264,196 @@ def validate_time_series_data(element_data, station_id, element, min_points=36,
 
     return True
 
-def predict_time_series(cleaned_data, n_periods=12):
+def _in_sample_rmse(model, series):
+    in_sample_predictions = model.predict_in_sample()
+    return np.sqrt(mean_squared_error(series, in_sample_predictions))
+
+def _neighborhood(previous, search):
+    # Start the stepwise search at the previous orders and let each term grow
+    # by at most one (within the configured maximum); differencing is reused,
+    # which also skips the unit root tests
+    (p, d, q), (P, D, Q, _) = previous["order"], previous["seasonal_order"]
+    bounds = {}
+    for name, value in (("p", p), ("q", q), ("P", P), ("Q", Q)):
+        bounds[f"start_{name}"] = value
+        bounds[f"max_{name}"] = max(value, min(value + 1, search.get(f"max_{name}", value + 1)))
+    return {**bounds, "d": d, "D": D}
+
+def fit_arima(series, series_key=None, **search_kwargs):
+    """
+    Fit an ARIMA model, reusing the orders selected for the same series before.
+    
+    Without stored orders this is a cold auto_arima search. With stored
+    orders the model is first refitted with them and the other settings
+    auto_arima chose (intercept, trend, ...) directly, and kept if its
+    in-sample RMSE is within ORDER_RMSE_TOLERANCE of the stored one;
+    otherwise the stepwise search is warm-started at the stored orders and
+    restricted to their neighborhood. The selected orders are saved, and the
+    search mode and time are printed.
+    
+    Parameters:
+    -----------
+    series : pandas.Series
+        Series to fit
+    series_key : str, optional
+        Identifies the series in the order cache, e.g. "USW00003971/TMAX";
+        without it every fit is a cold search
+    **search_kwargs
+        auto_arima settings overriding ARIMA_CONFIG
+        
+    Returns:
+    --------
+    tuple
+        (fitted model, in-sample RMSE)
+    """
+    search = {**ARIMA_CONFIG, **search_kwargs}
+    use_orders = bool(series_key) and bool(ORDERS_DIR)
+    previous = order_cache.load_orders(series_key, ORDERS_DIR) if use_orders else None
+    start = time.perf_counter()
+    model, mode = None, "cold"
+
+    if previous is not None:
+        try:
+            candidate = pmdarima.ARIMA(
+                **previous.get("params", {}),
+                order=tuple(previous["order"]),
+                seasonal_order=tuple(previous["seasonal_order"]),
+                suppress_warnings=True,
+            ).fit(series)
+            rmse = _in_sample_rmse(candidate, series)
+            if rmse <= ORDER_RMSE_TOLERANCE * previous["rmse"]:
+                model, mode = candidate, "reused"
+        except Exception:
+            pass
+        if model is None:
+            model, mode = auto_arima(series, **{**search, **_neighborhood(previous, search)}), "warm"
+    if model is None:
+        model = auto_arima(series, **search)
+    if mode != "reused":
+        rmse = _in_sample_rmse(model, series)
+
+    elapsed = time.perf_counter() - start
+    print(f"ARIMA order search for {series_key or 'series'} ({mode}): {elapsed:.2f}s, "
+          f"order {model.order}{model.seasonal_order}")
+    if use_orders:
+        order_cache.save_orders(
+            series_key, model.order, model.seasonal_order, rmse, ORDERS_DIR, _model_params(model)
+        )
+    return model, rmse
+
+def _model_params(model):
+    # Constructor settings to rebuild the model with, besides its orders;
+    # start_params is a fit starting point, not part of the model choice
+    params = {}
+    for name, value in model.get_params().items():
+        if name in ("order", "seasonal_order", "start_params", "suppress_warnings"):
+            continue
+        try:
+            json.dumps(value)
+        except TypeError:
+            continue
+        params[name] = value
+    return params
+
+def update_arima(model, new_values, drift_threshold=DRIFT_THRESHOLD):
+    """
+    Extend a fitted ARIMA model with observations that followed its data.
+    
+    The model's forecast for the new observations is checked first: each
+    error is divided by the forecast's standard deviation at that horizon,
+    and if the root mean square of these scores exceeds drift_threshold the
+    model is not updated. Otherwise a copy is updated with pmdarima's
+    update(), which runs a few optimizer iterations from the current
+    parameters (milliseconds instead of a full auto_arima search).
+    
+    Parameters:
+    -----------
+    model : pmdarima.arima.ARIMA
+        Fitted model; it is not modified
+    new_values : array-like
+        Observations for the months directly after the model's data
+    drift_threshold : float, optional
+        Largest tolerated RMS forecast error, in standard deviations
+        
+    Returns:
+    --------
+    tuple
+        (updated model or None if it drifted, drift score)
+    """
+    new_values = np.asarray(new_values, dtype="float64")
+    predicted, interval = model.predict(n_periods=len(new_values), return_conf_int=True, alpha=0.05)
+    std = (interval[:, 1] - interval[:, 0]) / (2 * _Z_95)
+    score = np.sqrt(np.mean(((new_values - np.asarray(predicted)) / std) ** 2))
+    if score > drift_threshold:
+        return None, score
+    model = copy.deepcopy(model)
+    model.update(new_values)
+    return model, score
+
+def _update_from_prefix(cache, series, config):
+    # Look for a cached model fitted on this series minus its last k months
+    for k in range(1, min(UPDATE_MAX_MONTHS, len(series) - 1) + 1):
+        base = cache.get(series_fingerprint(series.iloc[:-k], config))
+        if base is None:
+            continue
+        model, score = update_arima(base["model"], series.iloc[-k:])
+        if model is None:
+            print(f"Cached model drifted on {k} new months (score {score:.2f}); refitting")
+            return None
+        print(f"Updated cached model with {k} new months")
+        return model, base["rmse"]
+    return None
+
+def _forecast(series, n_months, use_cache=True, series_key=None):
+    """
+    Forecast n_months ahead from a monthly series, reusing a cached fit when
+    possible. Returns (forecast ndarray, in-sample RMSE).
+    """
+    # Reuse the fitted model for this exact series and configuration if cached
+    cache = get_forecast_cache() if use_cache else None
+    entry = None
+    if cache is not None:
+        config = {**ARIMA_CONFIG, "pmdarima": pmdarima.__version__}
+        key = series_fingerprint(series, config)
+        entry = cache.get(key)
+        if entry is None:
+            # New months on a series seen before: update its model instead of refitting
+            updated = _update_from_prefix(cache, series, config)
+            if updated is not None:
+                entry = cache.put(key, *updated)
+    if entry is None:
+        # Fit the ARIMA model with error handling
+        model, rmse = fit_arima(series, series_key)
+        entry = cache.put(key, model, rmse) if cache is not None else {"model": model, "rmse": rmse, "forecasts": {}}
+
+    # Generate forecast (each horizon is computed once per fitted model)
+    forecast = entry["forecasts"].get(n_months)
+    if forecast is None:
+        forecast = np.asarray(entry["model"].predict(n_periods=n_months))
+        entry["forecasts"][n_months] = forecast
+    return forecast.copy(), entry["rmse"]
+
+def predict_time_series(cleaned_data, n_periods=12, use_cache=True, series_key=None):
     """
     Generate predictions using ARIMA model.
     
+    The fitted model is cached under a fingerprint of the series and
+    ARIMA_CONFIG, so an unchanged series is not refitted: repeated calls
+    return the stored forecast and other horizons reuse the fitted model.
+    When a cached series has gained up to UPDATE_MAX_MONTHS new months, its
+    model is updated with them (see update_arima) unless it has drifted.
+    
     Parameters:
     -----------
     cleaned_data : pandas.DataFrame
         Cleaned time series data with datetime index
     n_periods : int, optional
         Number of periods to forecast (default: 12 months)
+    use_cache : bool, optional
+        Look up and store the fitted model in the forecast cache (default: True)
+    series_key : str, optional
+        Station/element identifier, e.g. "USW00003971/TMAX"; lets a refit start
+        from the ARIMA orders selected for this series before (see fit_arima)
         
     Returns:
     --------
@@ -173,20 +471,7 @@ def predict_time_series(cleaned_data, n_periods=12):
             
         # Convert years to months for prediction
         n_months = n_periods * 12
-            
-        # Fit the ARIMA model with error handling
-        model = auto_arima(
-            cleaned_data['value'],  # Only use the value column
-            seasonal=True,
-            m=12,
-            stepwise=True,
-            suppress_warnings=True,
-            error_action="ignore",
-            trace=False
-        )
-        
-        # Generate forecast
-        forecast = model.predict(n_periods=n_months)
+        forecast, rmse = _forecast(cleaned_data['value'], n_months, use_cache, series_key)  # Only use the value column
         
         # Create forecast index
         last_date = cleaned_data.index[-1]
@@ -199,10 +484,7 @@ def predict_time_series(cleaned_data, n_periods=12):
         # Create forecast series
         forecast_series = pd.Series(forecast, index=forecast_index)
         
-        # Calculate and print model metrics
-        in_sample_predictions = model.predict_in_sample()
-        mse = mean_squared_error(cleaned_data['value'], in_sample_predictions)
-        rmse = np.sqrt(mse)
+        # Print model metrics (computed when the model was fitted)
         print(f"Model RMSE: {rmse:.2f}")
         
         return forecast_series
@@ -211,3 +493,365 @@ def predict_time_series(cleaned_data, n_periods=12):
         print(f"Error in predict_time_series: {str(e)}")
         return None
 
+def validate_series_bulk(monthly, min_points=36, max_years_since_last=3, max_gap_ratio=None, max_gap_months=None):
+    """
+    Validation report for every (station, element) series of a monthly table.
+    
+    Computes the statistics behind validate_time_series_data for all series
+    with one grouped pass instead of cleaning and checking each series. The
+    cleaned (gap-filled) series spans every month from the first to the last
+    observation, and filling gaps adds no new distinct values, so the
+    checks give the same verdicts. Gap checks are optional extras.
+    
+    Parameters:
+    -----------
+    monthly : pandas.DataFrame
+        Long table with STATION_ID, element, DATE (month end) and value
+        columns, e.g. the monthly aggregates with 'mean' renamed to 'value'
+    min_points : int
+        Minimum number of monthly points (default: 36)
+    max_years_since_last : int
+        Maximum years between the last observation and today (default: 3)
+    max_gap_ratio : float, optional
+        Maximum share of missing months within the series' span
+    max_gap_months : int, optional
+        Maximum run of consecutive missing months
+        
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per (STATION_ID, element) with points (months spanned),
+        observed (months with data), first_date, last_date, distinct,
+        gap_ratio, longest_gap, valid, reason (first failed check in
+        validate_time_series_data order, None if valid) and reasons (all
+        failed checks joined by '; ')
+    """
+    columns = ["STATION_ID", "element", "points", "observed", "first_date", "last_date", "distinct",
+               "gap_ratio", "longest_gap", "valid", "reason", "reasons"]
+    data = monthly.dropna(subset=["value"])
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+    data = data.sort_values(["STATION_ID", "element", "DATE"])
+    grouped = data.groupby(["STATION_ID", "element"], observed=True, sort=True)
+    summary = grouped.agg(
+        first_date=("DATE", "min"),
+        last_date=("DATE", "max"),
+        observed=("DATE", "nunique"),
+        distinct=("value", "nunique"),
+    )
+    first, last = summary["first_date"].dt, summary["last_date"].dt
+    summary["points"] = (last.year * 12 + last.month) - (first.year * 12 + first.month) + 1
+    summary["gap_ratio"] = 1 - summary["observed"] / summary["points"]
+
+    # Longest run of missing months: largest step between consecutive observed months
+    months = data["DATE"].dt.year.to_numpy() * 12 + data["DATE"].dt.month.to_numpy()
+    steps = np.diff(months, prepend=months[0]) - 1
+    steps[grouped.cumcount().to_numpy() == 0] = 0
+    summary["longest_gap"] = pd.Series(np.maximum(steps, 0), index=data.index).groupby(
+        [data["STATION_ID"], data["element"]], observed=True, sort=True
+    ).max().to_numpy()
+
+    cutoff = pd.Timestamp.today() - pd.DateOffset(years=max_years_since_last)
+    # Same order of checks as validate_time_series_data, then the gap checks
+    checks = [
+        (summary["points"] < min_points, f"fewer than {min_points} points"),
+        (summary["last_date"] < cutoff, "not recent enough"),
+        (summary["distinct"] <= 1, "constant"),
+    ]
+    if max_gap_ratio is not None:
+        checks.append((summary["gap_ratio"] > max_gap_ratio, f"more than {max_gap_ratio:.0%} of months missing"))
+    if max_gap_months is not None:
+        checks.append((summary["longest_gap"] > max_gap_months, f"gap longer than {max_gap_months} months"))
+    failed = np.column_stack([mask.to_numpy() for mask, _ in checks])
+    labels = np.array([label for _, label in checks], dtype=object)
+    summary["valid"] = ~failed.any(axis=1)
+    summary["reason"] = np.where(summary["valid"], None, labels[failed.argmax(axis=1)])
+    summary["reasons"] = ["; ".join(labels[row]) or None for row in failed]
+    return summary.reset_index()[columns]
+
+def prefilter_series(monthly, min_points=36, max_years_since_last=3):
+    """
+    Apply the checks of validate_time_series_data to many series at once
+    (see validate_series_bulk).
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per (STATION_ID, element) with points, last_date, distinct and
+        reason (None for series that pass)
+    """
+    report = validate_series_bulk(monthly, min_points, max_years_since_last)
+    return report[["STATION_ID", "element", "points", "last_date", "distinct", "reason"]]
+
+def _forecast_worker(conn, series, n_months, use_cache, series_key):
+    # Runs in a child process; the result (or error) is sent back over conn
+    try:
+        forecast, rmse = _forecast(series, n_months, use_cache, series_key)
+        conn.send(("ok", forecast, rmse))
+    except Exception as e:
+        conn.send(("failed", str(e), None))
+    finally:
+        conn.close()
+
+def forecast_batch(monthly, n_periods=12, workers=None, timeout=600, min_points=36,
+                   max_years_since_last=3, use_cache=True, progress=None):
+    """
+    Forecast many (station, element) series in parallel.
+    
+    Series that fail prefilter_series are skipped without fitting. The rest
+    are cleaned like clean_data (month-end frequency, gaps filled forward
+    then backward) and fitted in separate processes, at most `workers` at a
+    time. A fit that runs longer than `timeout` seconds is terminated and
+    reported, without affecting the other series.
+    
+    Parameters:
+    -----------
+    monthly : pandas.DataFrame
+        Long table with STATION_ID, element, DATE (month end) and value columns,
+        e.g. the monthly aggregates with 'mean' renamed to 'value'
+    n_periods : int, optional
+        Number of years to forecast (default: 12)
+    workers : int, optional
+        Concurrent fits (default: CPU count)
+    timeout : float, optional
+        Seconds allowed per series (default: 600)
+    min_points, max_years_since_last : int
+        Prefilter thresholds (see validate_time_series_data)
+    use_cache : bool, optional
+        Use the forecast cache in the workers (default: True)
+    progress : callable, optional
+        Called with each status row as the series finish
+        
+    Returns:
+    --------
+    tuple of pandas.DataFrame
+        (forecasts with STATION_ID, element, DATE and value columns,
+        status with STATION_ID, element, status, reason, rmse and seconds)
+    """
+    workers = workers or os.cpu_count() or 1
+    n_months = n_periods * 12
+    checks = prefilter_series(monthly, min_points, max_years_since_last)
+
+    status = []
+    for row in checks[checks["reason"].notna()].itertuples(index=False):
+        status.append((row.STATION_ID, row.element, "skipped", row.reason, np.nan, 0.0))
+        if progress is not None:
+            progress(status[-1])
+    valid = set(
+        checks.loc[checks["reason"].isna(), ["STATION_ID", "element"]].itertuples(index=False, name=None)
+    )
+
+    tasks = []
+    data = monthly[monthly.set_index(["STATION_ID", "element"]).index.isin(list(valid))]
+    for key, group in clean_data_multi(data).groupby(["STATION_ID", "element"], observed=True, sort=True):
+        series = group.set_index("DATE")["value"]
+        series.index = pd.DatetimeIndex(series.index, freq="ME")
+        tasks.append((key, series))
+    tasks.reverse()
+
+    # fork shares the already imported modules with the children
+    context = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    running = {}
+    forecasts = []
+
+    def finish(key, outcome, reason, rmse, started):
+        row = (key[0], key[1], outcome, reason, rmse, time.perf_counter() - started)
+        status.append(row)
+        if progress is not None:
+            progress(row)
+
+    while tasks or running:
+        while tasks and len(running) < workers:
+            key, series = tasks.pop()
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_forecast_worker,
+                args=(sender, series, n_months, use_cache, f"{key[0]}/{key[1]}"),
+                daemon=True,
+            )
+            process.start()
+            sender.close()
+            running[receiver] = (key, series.index[-1], process, time.perf_counter())
+
+        for receiver in mp_connection.wait(list(running), timeout=1.0):
+            key, last_date, process, started = running.pop(receiver)
+            try:
+                outcome, result, rmse = receiver.recv()
+            except EOFError:
+                outcome, result, rmse = "failed", f"worker exited with code {process.exitcode}", None
+            receiver.close()
+            process.join()
+            if outcome == "ok":
+                index = pd.date_range(start=last_date + pd.DateOffset(months=1), periods=n_months, freq="ME")
+                forecasts.append(pd.DataFrame({"STATION_ID": key[0], "element": key[1], "DATE": index, "value": result}))
+                finish(key, "ok", None, rmse, started)
+            else:
+                finish(key, "failed", result, np.nan, started)
+
+        now = time.perf_counter()
+        for receiver, (key, _, process, started) in list(running.items()):
+            if now - started > timeout:
+                process.terminate()
+                process.join()
+                receiver.close()
+                del running[receiver]
+                finish(key, "timeout", f"exceeded {timeout}s", np.nan, started)
+
+    forecast_columns = ["STATION_ID", "element", "DATE", "value"]
+    forecast_table = pd.concat(forecasts, ignore_index=True) if forecasts else pd.DataFrame(columns=forecast_columns)
+    status_table = pd.DataFrame(status, columns=["STATION_ID", "element", "status", "reason", "rmse", "seconds"])
+    return forecast_table, status_table
+
+# Baseline engines: seasonal climatology plus a linear or damped trend, and
+# seasonal naive. All of them are fitted over a matrix of series at once.
+BASELINE_METHODS = ["climatology_trend", "damped_trend", "seasonal_naive"]
+
+# Per-month damping of the trend for the damped_trend baseline
+DAMPING = 0.98
+
+def fit_baselines(values, method="climatology_trend", m=12):
+    """
+    Fit a baseline forecaster to many monthly series in one pass.
+    
+    Season s of column t is t % m, counted from the first column, so all
+    series must start in the same calendar month and be contiguous (NaN for
+    missing months). climatology_trend and damped_trend are the per-season
+    means plus a least-squares linear trend of the remaining anomalies;
+    seasonal_naive repeats the last observed value of each season.
+    
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        (n_series, n_months) matrix, or a single series as a 1-D array
+    method : str
+        One of BASELINE_METHODS
+    m : int
+        Season length (default: 12 months)
+        
+    Returns:
+    --------
+    dict
+        Fitted parameters for predict_baselines
+    """
+    if method not in BASELINE_METHODS:
+        raise ValueError(f"Unknown baseline method: {method}")
+    values = np.atleast_2d(np.asarray(values, dtype="float64"))
+    n_months = values.shape[1]
+    if n_months < m:
+        raise ValueError(f"Need at least {m} months to fit a seasonal baseline")
+    # Pad to whole seasonal cycles so the matrix folds into (series, cycle, season)
+    cycles = -(-n_months // m)
+    padded = np.full((values.shape[0], cycles * m), np.nan)
+    padded[:, :n_months] = values
+    folded = padded.reshape(values.shape[0], cycles, m)
+    valid = ~np.isnan(folded)
+
+    if method == "seasonal_naive":
+        # Last valid cycle of each season
+        last_cycle = cycles - 1 - np.argmax(valid[:, ::-1, :], axis=1)
+        last = np.take_along_axis(folded, last_cycle[:, None, :], axis=1)[:, 0, :]
+        return {"method": method, "m": m, "n_months": n_months, "last": last}
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        # Seasons without any observation stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        seasonal = np.nanmean(folded, axis=1)
+        anomalies = padded - np.tile(seasonal, cycles)
+        t = np.arange(cycles * m, dtype="float64")
+        mask = ~np.isnan(anomalies)
+        count = mask.sum(axis=1)
+        t_mean = np.where(mask, t, 0).sum(axis=1) / count
+        a_mean = np.where(mask, anomalies, 0).sum(axis=1) / count
+        dt = np.where(mask, t - t_mean[:, None], 0)
+        slope = (dt * np.where(mask, anomalies - a_mean[:, None], 0)).sum(axis=1) / (dt ** 2).sum(axis=1)
+    slope = np.nan_to_num(slope)
+    intercept = a_mean - slope * t_mean
+    return {
+        "method": method,
+        "m": m,
+        "n_months": n_months,
+        "seasonal": seasonal,
+        "intercept": intercept,
+        "slope": slope,
+    }
+
+def predict_baselines(params, n_periods):
+    """
+    Forecast n_periods months past the fitted data for every series.
+    
+    Returns:
+    --------
+    numpy.ndarray
+        (n_series, n_periods) forecasts
+    """
+    m, n_months = params["m"], params["n_months"]
+    t = np.arange(n_months, n_months + n_periods)
+    season = t % m
+    if params["method"] == "seasonal_naive":
+        return params["last"][:, season]
+    seasonal = params["seasonal"][:, season]
+    if params["method"] == "damped_trend":
+        # Trend continues from the last fitted month, shrinking by DAMPING each month
+        h = np.arange(1, n_periods + 1)
+        damped = np.cumsum(DAMPING ** h)
+        level = params["intercept"] + params["slope"] * (n_months - 1)
+        return seasonal + level[:, None] + params["slope"][:, None] * damped
+    return seasonal + params["intercept"][:, None] + params["slope"][:, None] * t
+
+class BaselineForecaster:
+    """
+    Single-series wrapper of fit_baselines/predict_baselines with the
+    fit(y) / predict(n_periods) interface of the pmdarima models, so it can
+    be cross-validated, pickled and loaded like the trained models.
+    """
+
+    def __init__(self, method="climatology_trend", m=12):
+        self.method = method
+        self.m = m
+        self.params_ = None
+
+    def fit(self, y):
+        self.params_ = fit_baselines(np.asarray(y, dtype="float64"), self.method, self.m)
+        return self
+
+    def predict(self, n_periods=12):
+        return predict_baselines(self.params_, n_periods)[0]
+
+def baseline_batch(monthly, n_periods=12, method="climatology_trend", min_points=36, max_years_since_last=3):
+    """
+    Baseline forecasts for every (station, element) series of a long table.
+    
+    Series failing prefilter_series are left out. The rest are pivoted onto
+    one month-end grid (gaps filled like clean_data within each series) and
+    fitted together; every series is forecast from the end of the shared grid.
+    
+    Parameters:
+    -----------
+    monthly : pandas.DataFrame
+        Long table with STATION_ID, element, DATE (month end) and value columns
+    n_periods : int
+        Number of years to forecast
+    method : str
+        One of BASELINE_METHODS
+    min_points, max_years_since_last : int
+        Prefilter thresholds (see validate_time_series_data)
+        
+    Returns:
+    --------
+    pandas.DataFrame
+        Forecast table with STATION_ID, element, DATE and value columns
+    """
+    data = monthly.dropna(subset=["value"]).astype({"STATION_ID": str, "element": str})
+    checks = prefilter_series(data, min_points, max_years_since_last)
+    valid = checks.loc[checks["reason"].isna()].set_index(["STATION_ID", "element"]).index
+    data = data[data.set_index(["STATION_ID", "element"]).index.isin(valid)]
+    if data.empty:
+        return pd.DataFrame(columns=["STATION_ID", "element", "DATE", "value"])
+    # Gaps are filled inside each series only, so leading/trailing months stay missing
+    filled = clean_data_multi(data).pivot(index="DATE", columns=["STATION_ID", "element"], values="value").asfreq("ME")
+    n_months = n_periods * 12
+    forecasts = predict_baselines(fit_baselines(filled.to_numpy().T, method), n_months)
+    dates = pd.date_range(start=filled.index[-1] + pd.DateOffset(months=1), periods=n_months, freq="ME")
+    table = pd.DataFrame(forecasts.T, index=dates, columns=filled.columns)
+    table = table.rename_axis("DATE").stack(["STATION_ID", "element"], future_stack=True).rename("value")
+    return table.reset_index()[["STATION_ID", "element", "DATE", "value"]]
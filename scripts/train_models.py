@@ -1,5 +1,8 @@
 import os
 import sys
+import json
+import time
+import argparse
 from pathlib import Path
 
 # Add the parent directory to the Python path
@@ -9,18 +12,27 @@ sys.path.append(str(current_dir.parent))
 # Define data directory paths
 DATA_DIR = current_dir.parent / "data"
 STATIONS_DIR = DATA_DIR / "stations"
+DATASET_DIR = DATA_DIR / "dataset"
+AGGREGATES_DIR = DATA_DIR / "aggregates"
 MODELS_DIR = current_dir.parent / "models"
 
 # Enable dry-run mode
 DRY_RUN = False
 
+# Model engines compared for each element; the best by test RMSE is saved
+ENGINES = ["prophet", "sarima", "baseline"]
+
 import pandas as pd
 import numpy as np
-from pmdarima import auto_arima
 from prophet import Prophet
 import pickle
 from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.base import clone
 from sklearn.model_selection import TimeSeriesSplit
+from ml import station_dataset
+from ml import aggregate_store
+from ml.csv_loader import read_station_csv
+from ml.time_series import update_arima, fit_arima, BaselineForecaster, BASELINE_METHODS
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -119,32 +131,79 @@ def get_available_elements(data):
     main_elements = ['TMAX', 'TMIN']
     return [elem for elem in elements if elem in main_elements]
 
-def build_and_save_model(element, data):
+def load_county_data():
+    """
+    Load Dallas County TMAX/TMIN records. The precomputed monthly aggregates
+    are used when available (one row per month instead of per day), then the
+    Parquet dataset, then the combined CSV.
+    """
+    metadata_file = DATA_DIR / "dallas_stations_metadata.csv"
+    if aggregate_store.aggregates_exist(aggregates_dir=AGGREGATES_DIR):
+        station_ids = list(pd.read_csv(metadata_file, usecols=["ID"])["ID"])
+        monthly = [
+            aggregate_store.monthly_series(station_ids, element, AGGREGATES_DIR).reset_index().assign(element=element)
+            for element in ["TMAX", "TMIN"]
+        ]
+        return pd.concat(monthly, ignore_index=True)
+    if station_dataset.dataset_exists(DATASET_DIR):
+        # Read only the county's stations, the TMAX/TMIN partitions and three columns
+        return station_dataset.read_station_dataset(
+            DATASET_DIR,
+            station_ids=list(pd.read_csv(metadata_file, usecols=["ID"])["ID"]),
+            elements=["TMAX", "TMIN"],
+            columns=["DATE", "value", "element"],
+        )
+    return read_station_csv(
+        DATA_DIR / "dallas_stations_data.csv", columns=["DATE", "value", "element"], elements=["TMAX", "TMIN"]
+    )
+
+def prepare_model_data(element, data):
+    """Monthly modeling table (ds, y, month, year, lag1, lag12) for one element, or None."""
+    # Filter data for the specific element
+    element_data = data[data['element'] == element].copy()
+    if element_data.empty:
+        print(f"No data available for element {element}")
+        return None
+        
+    print(f"Found {len(element_data)} records for {element}")
+        
+    # Convert DATE to datetime and set as index
+    element_data['DATE'] = pd.to_datetime(element_data['DATE'])
+    element_data = element_data.set_index('DATE')
+    
+    # Keep only the value column for resampling
+    element_data = element_data[['value']]
+    
+    # Resample to monthly frequency and forward fill missing values
+    element_data = element_data.resample('M').mean()
+    element_data = element_data.fillna(method='ffill')
+    
+    # Clean the data
+    element_data = element_data.dropna()
+    print(f"After cleaning: {len(element_data)} records")
+
+    # Prepare data for modeling
+    prophet_data = element_data.reset_index()
+    prophet_data = prophet_data.rename(columns={'DATE': 'ds', 'value': 'y'})
+    
+    # Add additional features
+    prophet_data['month'] = prophet_data['ds'].dt.month
+    prophet_data['year'] = prophet_data['ds'].dt.year
+    prophet_data['lag1'] = prophet_data['y'].shift(1)
+    prophet_data['lag12'] = prophet_data['y'].shift(12)
+    
+    # Drop rows with NaN values after adding lags
+    prophet_data = prophet_data.dropna()
+    print(f"Final dataset size: {len(prophet_data)} records")
+    return prophet_data
+
+def build_and_save_model(element, data, engines=ENGINES):
     """Build and save models for a specific element using county data."""
     try:
         print(f"\n[DRY RUN] Building model for element: {element}")
-        # Filter data for the specific element
-        element_data = data[data['element'] == element].copy()
-        if element_data.empty:
-            print(f"No data available for element {element}")
+        prophet_data = prepare_model_data(element, data)
+        if prophet_data is None:
             return None
-            
-        print(f"Found {len(element_data)} records for {element}")
-        
-        # Convert DATE to datetime and set as index
-        element_data['DATE'] = pd.to_datetime(element_data['DATE'])
-        element_data = element_data.set_index('DATE')
-        
-        # Keep only the value column for resampling
-        element_data = element_data[['value']]
-        
-        # Resample to monthly frequency and forward fill missing values
-        element_data = element_data.resample('M').mean()
-        element_data = element_data.fillna(method='ffill')
-        
-        # Clean the data
-        element_data = element_data.dropna()
-        print(f"After cleaning: {len(element_data)} records")
 
         if not DRY_RUN:
             # Create model directory if it doesn't exist
@@ -152,20 +211,6 @@ def build_and_save_model(element, data):
             os.makedirs(model_dir, exist_ok=True)
         else:
             print("[DRY RUN] Would create models directory")
-
-        # Prepare data for modeling
-        prophet_data = element_data.reset_index()
-        prophet_data = prophet_data.rename(columns={'DATE': 'ds', 'value': 'y'})
-        
-        # Add additional features
-        prophet_data['month'] = prophet_data['ds'].dt.month
-        prophet_data['year'] = prophet_data['ds'].dt.year
-        prophet_data['lag1'] = prophet_data['y'].shift(1)
-        prophet_data['lag12'] = prophet_data['y'].shift(12)
-        
-        # Drop rows with NaN values after adding lags
-        prophet_data = prophet_data.dropna()
-        print(f"Final dataset size: {len(prophet_data)} records")
         
         # Split data into train and test sets
         train_size = int(len(prophet_data) * 0.8)
@@ -183,58 +228,89 @@ def build_and_save_model(element, data):
             model_names = []
             all_metrics = []
             cv_metrics = []
+            fit_seconds = []
+            
+            if "prophet" in engines:
+                # Model 1: Optimized Prophet with regressors
+                print(f"\nTraining Prophet model for {element}...")
+                model1 = Prophet(
+                    yearly_seasonality=True,
+                    weekly_seasonality=False,
+                    daily_seasonality=False,
+                    seasonality_mode='multiplicative',
+                    changepoint_prior_scale=0.05,
+                    seasonality_prior_scale=10.0
+                )
+                model1.add_regressor('lag1')
+                model1.add_regressor('lag12')
+                start = time.perf_counter()
+                model1.fit(train_data)
+                fit_seconds.append(time.perf_counter() - start)
+                future1 = model1.make_future_dataframe(periods=len(test_data))
+                future1['lag1'] = pd.concat([train_data['lag1'], test_data['lag1']]).reset_index(drop=True)
+                future1['lag12'] = pd.concat([train_data['lag12'], test_data['lag12']]).reset_index(drop=True)
+                forecast1 = model1.predict(future1)
+                rmse1, nrmse1, mape1, r2_1 = calculate_metrics(test_data['y'].values, forecast1['yhat'][-len(test_data):].values)
+                cv_rmse1, cv_nrmse1, cv_mape1, cv_r2_1 = cross_validate_model(model1, prophet_data)
+                models.append(model1)
+                model_names.append("Prophet")
+                all_metrics.append((rmse1, nrmse1, mape1, r2_1))
+                cv_metrics.append((cv_rmse1, cv_nrmse1, cv_mape1, cv_r2_1))
+            
+            if "sarima" in engines:
+                # Model 2: Optimized SARIMA
+                print(f"\nTraining SARIMA model for {element}...")
+                # Starts from the orders selected in the previous run (see fit_arima)
+                start = time.perf_counter()
+                model2, _ = fit_arima(
+                    # Positional index: statsmodels cannot forecast from the gappy index left by dropna
+                    train_data['y'].reset_index(drop=True),
+                    f"county/{element}",
+                    seasonal=True,
+                    m=12,
+                    start_p=1,
+                    start_q=1,
+                    max_p=3,
+                    max_q=3,
+                    max_P=2,
+                    max_Q=2,
+                    max_d=1,
+                    max_D=1,
+                    stepwise=True,
+                    suppress_warnings=True,
+                    error_action="ignore",
+                    trace=False,
+                    information_criterion='bic'
+                )
+                fit_seconds.append(time.perf_counter() - start)
+                predictions2 = model2.predict(n_periods=len(test_data))
+                rmse2, nrmse2, mape2, r2_2 = calculate_metrics(test_data['y'].values, predictions2)
+                # ARIMA.fit refits in place: score an unfitted clone so the saved model stays fitted on train_data
+                cv_rmse2, cv_nrmse2, cv_mape2, cv_r2_2 = cross_validate_model(clone(model2), prophet_data)
+                models.append(model2)
+                model_names.append("SARIMA")
+                all_metrics.append((rmse2, nrmse2, mape2, r2_2))
+                cv_metrics.append((cv_rmse2, cv_nrmse2, cv_mape2, cv_r2_2))
             
-            # Model 1: Optimized Prophet with regressors
-            print(f"\nTraining Prophet model for {element}...")
-            model1 = Prophet(
-                yearly_seasonality=True,
-                weekly_seasonality=False,
-                daily_seasonality=False,
-                seasonality_mode='multiplicative',
-                changepoint_prior_scale=0.05,
-                seasonality_prior_scale=10.0
-            )
-            model1.add_regressor('lag1')
-            model1.add_regressor('lag12')
-            model1.fit(train_data)
-            future1 = model1.make_future_dataframe(periods=len(test_data))
-            future1['lag1'] = pd.concat([train_data['lag1'], test_data['lag1']]).reset_index(drop=True)
-            future1['lag12'] = pd.concat([train_data['lag12'], test_data['lag12']]).reset_index(drop=True)
-            forecast1 = model1.predict(future1)
-            rmse1, nrmse1, mape1, r2_1 = calculate_metrics(test_data['y'].values, forecast1['yhat'][-len(test_data):].values)
-            cv_rmse1, cv_nrmse1, cv_mape1, cv_r2_1 = cross_validate_model(model1, prophet_data)
-            models.append(model1)
-            model_names.append("Prophet")
-            all_metrics.append((rmse1, nrmse1, mape1, r2_1))
-            cv_metrics.append((cv_rmse1, cv_nrmse1, cv_mape1, cv_r2_1))
+            if "baseline" in engines:
+                # Baselines: one vectorized fit each, scored the same way
+                for method in BASELINE_METHODS:
+                    print(f"\nFitting {method} baseline for {element}...")
+                    start = time.perf_counter()
+                    baseline = BaselineForecaster(method).fit(train_data['y'])
+                    fit_seconds.append(time.perf_counter() - start)
+                    predictions = baseline.predict(n_periods=len(test_data))
+                    metrics = calculate_metrics(test_data['y'].values, predictions)
+                    # A fresh instance per fold keeps the saved baseline fitted on train_data
+                    cv = cross_validate_model(BaselineForecaster(method), prophet_data)
+                    models.append(baseline)
+                    model_names.append(f"Baseline ({method})")
+                    all_metrics.append(metrics)
+                    cv_metrics.append(cv)
             
-            # Model 2: Optimized SARIMA
-            print(f"\nTraining SARIMA model for {element}...")
-            model2 = auto_arima(
-                train_data['y'],
-                seasonal=True,
-                m=12,
-                start_p=1,
-                start_q=1,
-                max_p=3,
-                max_q=3,
-                max_P=2,
-                max_Q=2,
-                max_d=1,
-                max_D=1,
-                stepwise=True,
-                suppress_warnings=True,
-                error_action="ignore",
-                trace=False,
-                information_criterion='bic'
-            )
-            predictions2 = model2.predict(n_periods=len(test_data))
-            rmse2, nrmse2, mape2, r2_2 = calculate_metrics(test_data['y'].values, predictions2)
-            cv_rmse2, cv_nrmse2, cv_mape2, cv_r2_2 = cross_validate_model(model2, prophet_data)
-            models.append(model2)
-            model_names.append("SARIMA")
-            all_metrics.append((rmse2, nrmse2, mape2, r2_2))
-            cv_metrics.append((cv_rmse2, cv_nrmse2, cv_mape2, cv_r2_2))
+            if not models:
+                print(f"No engines selected for {element}")
+                return None
             
             # Find best model based on RMSE
             rmse_scores = np.array([m[0] for m in all_metrics])
@@ -250,7 +326,8 @@ def build_and_save_model(element, data):
                 'CV_RMSE': [m[0] for m in cv_metrics],
                 'CV_NRMSE (%)': [m[1] for m in cv_metrics],
                 'CV_MAPE': [m[2] for m in cv_metrics],
-                'CV_R-squared': [m[3] for m in cv_metrics]
+                'CV_R-squared': [m[3] for m in cv_metrics],
+                'Fit time (s)': fit_seconds
             })
             
             metrics_file = os.path.join(model_dir, f"{element}_metrics.csv")
@@ -276,6 +353,8 @@ def build_and_save_model(element, data):
             model_path = os.path.join(model_dir, f"{element}_best_model.pkl")
             with open(model_path, 'wb') as f:
                 pickle.dump(best_model, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Record what the model has seen so --update can feed it only newer months
+            save_model_state(element, model_names[best_model_idx], train_data['ds'].iloc[-1], model_dir)
         else:
             print("[DRY RUN] Would train and save models")
             
@@ -285,11 +364,69 @@ def build_and_save_model(element, data):
         print(f"Error building model for element {element}: {str(e)}")
         return None
 
-def main():
+def save_model_state(element, model_name, last_date, model_dir):
+    """Write models/<element>_model_state.json next to the saved model."""
+    state = {"model": model_name, "last_date": pd.Timestamp(last_date).strftime("%Y-%m-%d")}
+    with open(os.path.join(model_dir, f"{element}_model_state.json"), "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+def update_model(element, data, engines=ENGINES):
+    """
+    Bring the saved model up to date with the months observed since it was
+    trained, without a new model search. A full build_and_save_model is run
+    instead when there is no saved state, the saved model is Prophet (which
+    has no incremental update), or the new months show drift.
+    """
+    try:
+        print(f"\nUpdating model for element: {element}")
+        model_dir = os.path.join("models")
+        model_path = os.path.join(model_dir, f"{element}_best_model.pkl")
+        state_path = os.path.join(model_dir, f"{element}_model_state.json")
+        if not os.path.exists(model_path) or not os.path.exists(state_path):
+            print(f"No saved model state for {element}; running a full build")
+            return build_and_save_model(element, data, engines)
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state["model"] != "SARIMA":
+            print(f"Saved {element} model is {state['model']}, which cannot be updated; running a full build")
+            return build_and_save_model(element, data, engines)
+
+        prophet_data = prepare_model_data(element, data)
+        if prophet_data is None:
+            return None
+        new_data = prophet_data[prophet_data['ds'] > pd.Timestamp(state["last_date"])]
+        if new_data.empty:
+            print(f"{element} model is up to date (last month {state['last_date']})")
+            return None
+
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        start = time.perf_counter()
+        updated, score = update_arima(model, new_data['y'])
+        if updated is None:
+            print(f"{element} model drifted on {len(new_data)} new months (score {score:.2f}); running a full build")
+            return build_and_save_model(element, data, engines)
+        print(f"Updated {element} SARIMA model with {len(new_data)} new months in {time.perf_counter() - start:.3f}s (score {score:.2f})")
+
+        if not DRY_RUN:
+            tmp_path = f"{model_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(updated, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, model_path)
+            save_model_state(element, "SARIMA", new_data['ds'].iloc[-1], model_dir)
+        else:
+            print("[DRY RUN] Would save the updated model")
+        return None
+
+    except Exception as e:
+        print(f"Error updating model for element {element}: {str(e)}")
+        return None
+
+def main(update=False, engines=ENGINES):
     print("Loading Dallas County data...")
     try:
         # Load the county data
-        county_data = pd.read_csv(DATA_DIR / "dallas_stations_data.csv")
+        county_data = load_county_data()
         if county_data is None or county_data.empty:
             print("Failed to load county data")
             return
@@ -306,8 +443,11 @@ def main():
         
         # Process both TMIN and TMAX
         for element in available_elements:
-            print(f"\nBuilding models for {element}...")
-            build_and_save_model(element, county_data)
+            if update:
+                update_model(element, county_data, engines)
+            else:
+                print(f"\nBuilding models for {element}...")
+                build_and_save_model(element, county_data, engines)
             
         print("\nModel training complete!")
         
@@ -315,4 +455,18 @@ def main():
         print(f"Error in main process: {str(e)}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the county TMAX/TMIN forecasting models.")
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Feed the saved SARIMA models only the months since their last training instead of retraining",
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=ENGINES,
+        default=ENGINES,
+        help="Model engines to train and compare (default: all)",
+    )
+    args = parser.parse_args()
+    main(update=args.update, engines=args.engines) 
\ No newline at end of file
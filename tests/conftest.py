@@ -0,0 +1,111 @@
+import sys
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# The ml modules import each other by their flat names, as in the scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts" / "ml"))
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+class StandInServer:
+    """
+    Local GHCN-D stand-in on a real socket: serves tests/fixtures/<name> at
+    /<name> and /all/<name>, plus any bodies added to files, with an ETag
+    honored by If-None-Match. Paths fail first with the statuses queued in
+    failures; requests and the peak number in flight are recorded.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.files = {}
+        self.failures = defaultdict(list)
+        self.requests = defaultdict(int)
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                name = self.path.rsplit("/", 1)[-1]
+                with stand_in._lock:
+                    stand_in.requests[name] += 1
+                    stand_in.in_flight += 1
+                    stand_in.peak = max(stand_in.peak, stand_in.in_flight)
+                    failure = stand_in.failures[name].pop(0) if stand_in.failures[name] else None
+                try:
+                    time.sleep(stand_in.delay)
+                    if failure is not None:
+                        self._send(failure, b"")
+                    elif name in stand_in.files:
+                        self._send_body(stand_in.files[name])
+                    elif (FIXTURES / name).is_file():
+                        self._send_body((FIXTURES / name).read_bytes())
+                    else:
+                        self._send(404, b"")
+                finally:
+                    with stand_in._lock:
+                        stand_in.in_flight -= 1
+
+            def _send_body(self, body):
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, b"", etag)
+                else:
+                    self._send(200, body, etag)
+
+            def _send(self, status, body, etag=None):
+                self.send_response(status)
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def http_cache_dir(monkeypatch, tmp_path):
+    """Point ghcnd_fetch's shared HTTP cache at an empty directory."""
+    import ghcnd_fetch
+
+    cache_dir = tmp_path / "http_cache"
+    monkeypatch.setattr(ghcnd_fetch, "HTTP_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(ghcnd_fetch, "_http_cache", None)
+    return cache_dir
+
+
+@pytest.fixture
+def ghcnd_server(monkeypatch, http_cache_dir):
+    """A running StandInServer with ghcnd_fetch pointed at it and at an empty HTTP cache."""
+    import ghcnd_fetch
+
+    with StandInServer() as server:
+        monkeypatch.setattr(ghcnd_fetch, "BASE_URL", server.url)
+        yield server
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import aggregate_store
+from csv_loader import read_station_csv
+
+STATIONS_DIR = Path(__file__).resolve().parents[1] / "data" / "stations"
+STATION_ID = "US1TXDA0003"
+
+
+@pytest.fixture
+def records():
+    return read_station_csv(STATIONS_DIR / f"{STATION_ID}_data.csv", columns=["DATE", "value", "element"])
+
+
+@pytest.mark.parametrize("shape", ["DATE column", "DATE index"])
+def test_yearly_means_from_daily_match_the_store(records, tmp_path, shape):
+    element = records["element"].astype(str).iloc[0]
+    daily = records[records["element"] == element]
+    if shape == "DATE index":
+        # The app's station frames (load_station_data)
+        daily = daily.set_index("DATE")[["value", "element"]]
+
+    aggregate_store.write_station_aggregates(records, STATION_ID, tmp_path)
+    expected = aggregate_store.yearly_means([STATION_ID], element, tmp_path)
+
+    yearly = aggregate_store.yearly_means_from_daily(daily)
+    pd.testing.assert_series_equal(yearly, expected, check_names=False, check_index_type=False)
@@ -0,0 +1,223 @@
+import gzip
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import requests
+
+import ghcnd_fetch
+import ghcnd_parse
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+STATION_IDS = ["USW00003971", "USC00410000"]
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Returns the queued responses (or raises the queued exceptions) in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(ghcnd_fetch.time, "sleep", slept.append)
+    return slept
+
+
+def test_retries_server_errors_with_backoff(sleeps):
+    failures = [FakeResponse(503), FakeResponse(500)]
+    session = FakeSession(*failures, FakeResponse(200))
+    response = ghcnd_fetch.request_with_retry("http://example/a.dly", backoff=0.5, session=session)
+    assert response.status_code == 200
+    assert sleeps == [0.5, 1.0]
+    assert all(failure.closed for failure in failures)
+
+
+def test_retry_after_seconds_is_honored(sleeps):
+    session = FakeSession(FakeResponse(429, {"Retry-After": "7"}), FakeResponse(200))
+    ghcnd_fetch.request_with_retry("http://example/a.dly", backoff=0.5, session=session)
+    assert sleeps == [7.0]
+
+
+def test_retry_after_is_capped(sleeps):
+    session = FakeSession(FakeResponse(429, {"Retry-After": "86400"}), FakeResponse(200))
+    ghcnd_fetch.request_with_retry("http://example/a.dly", session=session)
+    assert sleeps == [ghcnd_fetch.MAX_RETRY_AFTER]
+
+
+def test_retry_after_http_date_in_the_past_retries_at_once(sleeps):
+    headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    session = FakeSession(FakeResponse(503, headers), FakeResponse(200))
+    ghcnd_fetch.request_with_retry("http://example/a.dly", session=session)
+    assert sleeps == [0.0]
+
+
+def test_gives_up_after_max_retries(sleeps):
+    session = FakeSession(*[FakeResponse(503) for _ in range(3)])
+    with pytest.raises(requests.HTTPError):
+        ghcnd_fetch.request_with_retry("http://example/a.dly", retries=2, backoff=1, session=session)
+    assert len(session.urls) == 3
+    assert sleeps == [1, 2]
+
+
+def test_connection_errors_are_retried_then_raised(sleeps):
+    session = FakeSession(*[requests.ConnectionError("refused") for _ in range(2)])
+    with pytest.raises(requests.ConnectionError):
+        ghcnd_fetch.request_with_retry("http://example/a.dly", retries=1, backoff=1, session=session)
+    assert sleeps == [1]
+
+
+def test_client_errors_are_not_retried(sleeps):
+    session = FakeSession(FakeResponse(404))
+    with pytest.raises(requests.HTTPError):
+        ghcnd_fetch.request_with_retry("http://example/a.dly", session=session)
+    assert len(session.urls) == 1
+    assert sleeps == []
+
+
+def test_rate_limiter_spaces_requests_per_host(monkeypatch, sleeps):
+    monkeypatch.setattr(ghcnd_fetch.time, "monotonic", lambda: 100.0)
+    limiter = ghcnd_fetch.RateLimiter(requests_per_second=4)
+    for _ in range(3):
+        limiter.wait("http://a.example/x")
+    limiter.wait("http://b.example/x")
+    # The first request to each host goes out at once
+    assert sleeps == [0.25, 0.5]
+
+
+def test_rate_limiter_waits_between_retries(sleeps):
+    waited = []
+
+    class Limiter:
+        def wait(self, url):
+            waited.append(url)
+
+    session = FakeSession(FakeResponse(502), FakeResponse(200))
+    ghcnd_fetch.request_with_retry("http://example/a.dly", rate_limiter=Limiter(), session=session)
+    assert waited == ["http://example/a.dly"] * 2
+
+
+def test_get_session_is_shared():
+    assert ghcnd_fetch.get_session() is ghcnd_fetch.get_session()
+
+
+def read_fixture(station_id, **filters):
+    with open(FIXTURES / f"{station_id}.dly", "rb") as f:
+        return ghcnd_parse.dly_to_dataframe_from_lines(f.read().splitlines(), **filters)
+
+
+def test_fetch_stations_matches_the_parser(ghcnd_server):
+    filters = {"elements": ["TMAX", "TMIN"], "drop_qflagged": True}
+    results = list(ghcnd_fetch.fetch_stations(STATION_IDS, max_workers=2, backoff=0, **filters))
+    assert sorted(station_id for station_id, _, _ in results) == sorted(STATION_IDS)
+    for station_id, df, error in results:
+        assert error is None
+        pd.testing.assert_frame_equal(df, read_fixture(station_id, **filters))
+
+
+def test_fetch_stations_bounds_requests_in_flight(ghcnd_server):
+    ghcnd_server.delay = 0.05
+    station_ids = STATION_IDS * 5
+    results = list(ghcnd_fetch.fetch_stations(station_ids, max_workers=3, backoff=0))
+    assert len(results) == len(station_ids)
+    assert all(error is None for _, _, error in results)
+    assert 1 < ghcnd_server.peak <= 3
+
+
+def test_fetch_stations_yields_in_completion_order(ghcnd_server):
+    # The first station is slow to answer, so the second completes first
+    ghcnd_server.failures[f"{STATION_IDS[0]}.dly"] = [503]
+    results = list(ghcnd_fetch.fetch_stations(STATION_IDS, max_workers=2, backoff=0.2))
+    assert [station_id for station_id, _, _ in results] == [STATION_IDS[1], STATION_IDS[0]]
+
+
+def test_fetch_stations_reports_a_404_per_station(ghcnd_server):
+    station_ids = [STATION_IDS[0], "USW00000000", STATION_IDS[1]]
+    results = {station_id: (df, error) for station_id, df, error in
+               ghcnd_fetch.fetch_stations(station_ids, max_workers=2, backoff=0)}
+    df, error = results["USW00000000"]
+    assert df is None
+    assert isinstance(error, requests.HTTPError)
+    assert error.response.status_code == 404
+    assert all(results[station_id][1] is None for station_id in STATION_IDS)
+
+
+def test_fetch_stations_retries_a_503(ghcnd_server):
+    name = f"{STATION_IDS[0]}.dly"
+    ghcnd_server.failures[name] = [503, 503]
+    [(station_id, df, error)] = ghcnd_fetch.fetch_stations(STATION_IDS[:1], backoff=0)
+    assert error is None
+    assert ghcnd_server.requests[name] == 3
+    pd.testing.assert_frame_equal(df, read_fixture(station_id))
+
+
+def test_download_station_fills_the_http_cache(ghcnd_server):
+    path = ghcnd_fetch.download_station(STATION_IDS[0])
+    assert Path(path).parent == Path(ghcnd_fetch.HTTP_CACHE_DIR)
+    with gzip.open(path, "rb") as f:
+        assert f.read() == (FIXTURES / f"{STATION_IDS[0]}.dly").read_bytes()
+
+    # Offline mode serves the cached copy without another request
+    ghcnd_fetch.set_offline(True)
+    with ghcnd_fetch.open_cached(f"{ghcnd_fetch.BASE_URL}/all/{STATION_IDS[0]}.dly") as f:
+        assert f.read() == (FIXTURES / f"{STATION_IDS[0]}.dly").read_bytes()
+    assert ghcnd_server.requests[f"{STATION_IDS[0]}.dly"] == 1
+
+
+INVENTORY = "".join(f"USW{i:08d}  32.8500  -96.8500 TMAX 1940 2024\n" for i in range(200))
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    # Count the fixed-width parses that actually run (sidecar misses)
+    calls = []
+    original = ghcnd_parse._parse_fixed_width_text
+
+    def parse(text, colspecs):
+        calls.append(len(text))
+        return original(text, colspecs)
+
+    monkeypatch.setattr(ghcnd_parse, "_parse_fixed_width_text", parse)
+    return calls
+
+
+def test_inventory_is_parsed_once_while_unchanged(ghcnd_server, parses):
+    ghcnd_server.files["ghcnd-inventory.txt"] = INVENTORY.encode()
+    first = ghcnd_fetch.get_ghcnd_inventory()
+    second = ghcnd_fetch.get_ghcnd_inventory()
+
+    # The second call is a 304 revalidation answered from the sidecar
+    assert ghcnd_server.requests["ghcnd-inventory.txt"] == 2
+    assert len(parses) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    # A changed file is parsed again
+    ghcnd_server.files["ghcnd-inventory.txt"] = (INVENTORY + "USW99999999  33.0000  -97.0000 TMIN 1950 2024\n").encode()
+    third = ghcnd_fetch.get_ghcnd_inventory()
+    assert len(parses) == 2
+    assert len(third) == len(first) + 1
+    pd.testing.assert_frame_equal(first, ghcnd_parse.parse_inventory_file(INVENTORY.splitlines()))
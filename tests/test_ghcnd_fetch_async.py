@@ -0,0 +1,197 @@
+import asyncio
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from aiohttp import web
+
+import ghcnd_fetch
+import ghcnd_fetch_async
+import ghcnd_parse
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+STATION_IDS = ["USW00003971", "USC00410000"]
+
+METADATA = {
+    "ghcnd-countries.txt": "US United States\nCA Canada\n",
+    "ghcnd-states.txt": "TX TEXAS\nOK OKLAHOMA\n",
+    "ghcnd-inventory.txt": (
+        "USW00003971  32.8500  -96.8500 TMAX 1940 2024\n"
+        "USC00410000  32.9000  -96.9000 SNOW 1950 2023\n"
+    ),
+    "ghcnd-stations.csv": (
+        "USW00003971,32.85,-96.85,134.0,TX,DALLAS LOVE FLD,,,72258\n"
+        "USC00410000,32.90,-96.90,150.0,TX,SOMEWHERE,,,\n"
+    ),
+}
+
+
+class StandIn:
+    """
+    Local GHCN-D stand-in: serves the fixture .dly files and METADATA, fails
+    a path with the statuses queued in failures first, and records the peak
+    number of requests in flight.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.failures = defaultdict(list)
+        self.requests = defaultdict(int)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handle(self, request):
+        name = request.match_info["name"]
+        self.requests[name] += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures[name]:
+                status, headers = self.failures[name].pop(0)
+                return web.Response(status=status, headers=headers)
+            if name in METADATA:
+                return web.Response(text=METADATA[name])
+            path = FIXTURES / name
+            if not path.exists():
+                return web.Response(status=404)
+            return web.Response(body=path.read_bytes())
+        finally:
+            self.in_flight -= 1
+
+    async def serve(self, coroutine_function):
+        app = web.Application()
+        app.router.add_get("/{name}", self.handle)
+        app.router.add_get("/all/{name}", self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await coroutine_function(f"http://127.0.0.1:{port}")
+        finally:
+            await runner.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def empty_http_cache(http_cache_dir):
+    # Metadata files are downloaded through ghcnd_fetch's HTTP cache
+    return http_cache_dir
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    # Retry without waiting, but record the delays the client asked for
+    recorded = []
+    original = ghcnd_fetch.retry_delay
+
+    def retry_delay(headers, backoff, attempt):
+        recorded.append(original(headers, backoff, attempt))
+        return 0
+
+    monkeypatch.setattr(ghcnd_fetch, "retry_delay", retry_delay)
+    return recorded
+
+
+def run(server, coroutine_function, monkeypatch):
+    async def with_base_url(base_url):
+        monkeypatch.setattr(ghcnd_fetch, "BASE_URL", base_url)
+        return await coroutine_function()
+
+    return asyncio.run(server.serve(with_base_url))
+
+
+def read_fixture(station_id, **filters):
+    with open(FIXTURES / f"{station_id}.dly", "rb") as f:
+        return ghcnd_parse.dly_to_dataframe_from_lines(f.read().splitlines(), **filters)
+
+
+def test_station_matches_the_blocking_parser(monkeypatch):
+    df = run(StandIn(), lambda: ghcnd_fetch_async.get_ghcnd_data_by_station(STATION_IDS[0]), monkeypatch)
+    pd.testing.assert_frame_equal(df, read_fixture(STATION_IDS[0]))
+
+
+def test_streamed_chunks_keep_compact_categoricals(monkeypatch):
+    # One record per chunk, so the chunks see different element categories
+    monkeypatch.setattr(ghcnd_fetch_async, "STREAM_CHUNK_RECORDS", 1)
+    filters = {"compact": True, "elements": ["TMAX", "PRCP"], "drop_qflagged": True}
+    df = run(
+        StandIn(),
+        lambda: ghcnd_fetch_async.get_ghcnd_data_by_station(STATION_IDS[0], **dict(filters)),
+        monkeypatch,
+    )
+    expected = read_fixture(STATION_IDS[0], **filters)
+    assert isinstance(df["element"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["station_id"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        df.astype({"element": str, "qflag": str}), expected.astype({"element": str, "qflag": str})
+    )
+
+
+def test_retries_429_and_5xx_honoring_retry_after(monkeypatch, delays):
+    server = StandIn()
+    name = f"{STATION_IDS[0]}.dly"
+    server.failures[name] = [(429, {"Retry-After": "3"}), (503, {})]
+    df = run(server, lambda: ghcnd_fetch_async.get_ghcnd_data_by_station(STATION_IDS[0]), monkeypatch)
+    assert server.requests[name] == 3
+    assert delays == [3.0, ghcnd_fetch_async.BACKOFF * 2]
+    assert len(df) == len(read_fixture(STATION_IDS[0]))
+
+
+def test_gives_up_after_max_retries(monkeypatch, delays):
+    server = StandIn()
+    name = f"{STATION_IDS[0]}.dly"
+    server.failures[name] = [(500, {})] * (ghcnd_fetch_async.RETRIES + 1)
+    with pytest.raises(Exception):
+        run(server, lambda: ghcnd_fetch_async.get_ghcnd_data_by_station(STATION_IDS[0]), monkeypatch)
+    assert server.requests[name] == ghcnd_fetch_async.RETRIES + 1
+
+
+def test_fetch_stations_respects_the_concurrency_cap(monkeypatch):
+    server = StandIn(delay=0.05)
+    station_ids = STATION_IDS * 6 + ["USW00000000"]
+
+    async def fetch_all():
+        return [item async for item in ghcnd_fetch_async.fetch_stations(station_ids, max_concurrency=3)]
+
+    results = run(server, fetch_all, monkeypatch)
+    assert server.peak == 3
+    assert len(results) == len(station_ids)
+    errors = {station_id for station_id, df, error in results if error is not None}
+    assert errors == {"USW00000000"}
+
+
+def test_refresh_downloads_metadata_and_stations(monkeypatch, delays):
+    server = StandIn(delay=0.01)
+    server.failures["ghcnd-states.txt"] = [(502, {})]
+    result = run(
+        server,
+        lambda: ghcnd_fetch_async.refresh(STATION_IDS + ["USW00000000"], max_concurrency=2),
+        monkeypatch,
+    )
+    assert server.peak <= 2
+    assert list(result["countries"]["country_code"]) == ["US", "CA"]
+    assert list(result["states"]["state_code"]) == ["TX", "OK"]
+    assert list(result["inventory"]["id"]) == STATION_IDS
+    assert list(result["stations"]["ID"]) == STATION_IDS
+    assert sorted(result["station_data"]) == sorted(STATION_IDS)
+    assert list(result["errors"]) == ["USW00000000"]
+
+
+def test_inventory_is_parsed_once_while_unchanged(ghcnd_server, monkeypatch):
+    # The threaded stand-in from conftest, which answers If-None-Match with a 304
+    ghcnd_server.files["ghcnd-inventory.txt"] = METADATA["ghcnd-inventory.txt"].encode()
+    parses = []
+    original = ghcnd_parse._parse_fixed_width_text
+    monkeypatch.setattr(
+        ghcnd_parse, "_parse_fixed_width_text", lambda text, colspecs: parses.append(text) or original(text, colspecs)
+    )
+
+    first = asyncio.run(ghcnd_fetch_async.get_ghcnd_inventory())
+    second = asyncio.run(ghcnd_fetch_async.get_ghcnd_inventory())
+    assert ghcnd_server.requests["ghcnd-inventory.txt"] == 2
+    assert len(parses) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert list(first["id"]) == STATION_IDS